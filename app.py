@@ -5,31 +5,33 @@ True black · No gradients · Clean flat design · Created by Zack Hennigan
 
 import streamlit as st
 import streamlit.components.v1 as components
-import requests
-import re
+import time
 from datetime import datetime, timezone, timedelta
 
+from edgefinder.alerts import AlertEngine
+from edgefinder.cache import ResponseCache
+from edgefinder.config import ALERT_RULES_PATH, CROSSWALK_PATH, DEPTH_STAKE, FEED_PORT, HISTORY_DIR, KALSHI_SERIES, MARKET_LABELS, METRICS_PORT, RESPONSE_CACHE_PATH, SCAN_DEADLINE
+from edgefinder.depth import apply_fills, cached_orderbook, price_depth
+from edgefinder.edges import EdgeStore, rescan_edges
+from edgefinder.feed import serve_feed
+from edgefinder.history import SnapshotHistory
+from edgefinder.metrics import METRICS, serve_metrics
+from edgefinder.names import PlayerCrosswalk, format_player_name, player_key
+from edgefinder.refresher import Refresher
+from edgefinder.render import FRONTEND_DIR, table_payload
+from edgefinder.scanner import scan as run_scan
+from edgefinder.stream import KalshiPriceStream, kalshi_ws_headers
+
 st.set_page_config(page_title="EdgeFinder Golf", page_icon="⛳", layout="wide", initial_sidebar_state="collapsed")
 
 DG_API_KEY = st.secrets.get("DG_API_KEY", "")
-KALSHI_BASE = "https://api.elections.kalshi.com/trade-api/v2"
-DG_BASE = "https://feeds.datagolf.com"
-
-KALSHI_SERIES = {"win": "KXPGATOUR", "top_5": "KXPGATOP5", "top_10": "KXPGATOP10", "top_20": "KXPGATOP20", "make_cut": "KXPGAMAKECUT"}
-KNOWN_EVENTS = {
-    "ATPBP": "Pebble Beach", "MAST": "Masters", "PGAC": "PGA Championship",
-    "USOP": "US Open", "OPEN": "The Open", "PLAY": "Players",
-    "GENE": "Genesis", "GENI": "Genesis", "GNES": "Genesis", "GNIN": "Genesis", "GNINV": "Genesis",
-    "PHOE": "WM Phoenix", "FARM": "Farmers", "MEMO": "Memorial", "TRAV": "Travelers",
-    "SENT": "Sentry", "SONY": "Sony Open", "WELL": "Wells Fargo", "RBC": "RBC Heritage",
-    "AMEX": "AmEx", "AMER": "AmEx", "ARNO": "Arnold Palmer", "HOND": "Honda",
-    "VALE": "Valero", "BYRO": "Byron Nelson", "CHAR": "Charles Schwab",
-    "JOHN": "John Deere", "ROCK": "Rocket Mortgage", "SCOT": "Scottish Open",
-    "WYNDH": "Wyndham", "ZURC": "Zurich", "CIGN": "Cigna", "RSM": "RSM Classic",
-    "HERO": "Hero", "TOUR": "Tour Championship", "FEDEX": "FedEx",
-}
-MARKET_LABELS = {"win": "Win", "top_5": "Top 5", "top_10": "Top 10", "top_20": "Top 20", "make_cut": "Make Cut"}
-DG_FIELDS = {"win": "win", "top_5": "top_5", "top_10": "top_10", "top_20": "top_20", "make_cut": "make_cut"}
+KALSHI_API_KEY_ID = st.secrets.get("KALSHI_API_KEY_ID", "")
+KALSHI_PRIVATE_KEY = st.secrets.get("KALSHI_PRIVATE_KEY", "")
+
+# Streaming prices: how often a session checks the shared price book for new quotes
+STREAM_POLL_SECONDS = 2
+# Background refresh: how often a session checks for a newer published scan
+REFRESH_POLL_SECONDS = 5
 
 EST = timezone(timedelta(hours=-5))
 def now_est():
@@ -85,344 +87,56 @@ label { font-family: 'IBM Plex Mono', monospace !important; font-size: 11px !imp
 """, unsafe_allow_html=True)
 
 
-# ============================================================
-# HELPERS
-# ============================================================
-
-def get_event_code(market):
-    et = market.get("event_ticker", "")
-    parts = et.split("-")
-    return parts[1].upper() if len(parts) >= 2 else ""
-
-def get_tournament_label(market, fallback="Unknown"):
-    et = market.get("event_ticker", "")
-    parts = et.split("-")
-    if len(parts) >= 2:
-        code = re.sub(r'\d+$', '', parts[1]).upper()
-        for key, name in KNOWN_EVENTS.items():
-            if key in code: return name
-    return fallback
-
-def identify_current_event_code(markets_by_type, dg_event_name):
-    event_code_counts, event_code_to_label = {}, {}
-    for m_type, markets in markets_by_type.items():
-        for m in markets:
-            code = get_event_code(m)
-            if code:
-                event_code_counts[code] = event_code_counts.get(code, 0) + 1
-                if code not in event_code_to_label: event_code_to_label[code] = get_tournament_label(m)
-    if not event_code_counts: return None
-    dg_lower = dg_event_name.lower()
-    for code, label in event_code_to_label.items():
-        if any(word in dg_lower for word in label.lower().split() if len(word) > 3): return code
-    major_codes = {c for c, l in event_code_to_label.items() if l in ["Masters", "PGA Championship", "US Open", "The Open"]}
-    non_major = {c: n for c, n in event_code_counts.items() if c not in major_codes}
-    return max(non_major, key=non_major.get) if non_major else max(event_code_counts, key=event_code_counts.get)
-
-def normalize_name(name):
-    if not name: return ""
-    name = name.strip()
-    if "," in name:
-        parts = name.split(",", 1); name = f"{parts[1].strip()} {parts[0].strip()}"
-    return re.sub(r"\s+(jr|sr|ii|iii|iv)$", "", re.sub(r"\s+", " ", re.sub(r"[.\-']", "", name.lower())))
-
-def format_player_name(name):
-    if not name: return ""
-    if "," in name:
-        parts = name.split(",", 1); return f"{parts[1].strip()} {parts[0].strip()}"
-    return name
-
-def get_kalshi_player_name(market):
-    name = market.get("yes_sub_title", "")
-    if name and len(name.strip().split()) >= 2:
-        return re.sub(r"\s+(finish|wins?|top|make|miss).*$", "", name, flags=re.IGNORECASE).strip()
-    return None
-
 # ============================================================
 # API
 # ============================================================
 
-@st.cache_data(ttl=300)
-def fetch_dg_live():
-    params = {"tour": "pga", "dead_heat": "no", "odds_format": "percent", "file_format": "json", "key": DG_API_KEY}
-    try:
-        r = requests.get(f"{DG_BASE}/preds/in-play", params=params, timeout=15)
-        if r.status_code == 200:
-            data = r.json()
-            if isinstance(data, dict):
-                event_name = data.get("event_name", data.get("info", {}).get("event_name", "Live Tournament"))
-                for key in ["data", "players", "baseline_history_fit", "baseline"]:
-                    if key in data and isinstance(data[key], list) and len(data[key]) > 0:
-                        return {"event_name": event_name, "players": data[key], "source": "LIVE"}
-            elif isinstance(data, list) and len(data) > 0:
-                return {"event_name": "Live Tournament", "players": data, "source": "LIVE"}
-    except: pass
-    return None
-
-@st.cache_data(ttl=300)
-def fetch_dg_pretournament():
-    params = {"tour": "pga", "odds_format": "percent", "file_format": "json", "key": DG_API_KEY}
-    r = requests.get(f"{DG_BASE}/preds/pre-tournament", params=params, timeout=15)
-    r.raise_for_status()
-    data = r.json()
-    return {"event_name": data.get("event_name", "Unknown Event"), "players": data.get("baseline_history_fit", []) or data.get("baseline", []), "source": "PRE-TOURNAMENT"}
-
-@st.cache_data(ttl=120)
-def fetch_kalshi_markets(series_ticker):
-    all_markets, cursor = [], None
-    for _ in range(20):
-        params = {"series_ticker": series_ticker, "status": "open", "limit": 200}
-        if cursor: params["cursor"] = cursor
-        r = requests.get(f"{KALSHI_BASE}/markets", params=params, timeout=15)
-        if r.status_code != 200: break
-        data = r.json(); markets = data.get("markets", [])
-        if not markets: break
-        all_markets.extend(markets); cursor = data.get("cursor")
-        if not cursor: break
-    return all_markets
-
-def calculate_all_edges(dg_data, kalshi_by_type):
-    players = dg_data.get("players", [])
-    dg_lookup, dg_fuzzy = {}, {}
-    for p in players:
-        norm = normalize_name(p.get("player_name", ""))
-        if norm:
-            dg_lookup[norm] = p
-            parts = norm.split()
-            if len(parts) >= 2: dg_fuzzy[f"{parts[0][0]}_{parts[-1]}"] = p
-    current_event_code = identify_current_event_code(kalshi_by_type, dg_data.get("event_name", ""))
-    dg_event_name = dg_data.get("event_name", "Unknown")
-    # Create a short fallback label from the DG event name (e.g. "The Genesis Invitational" -> "Genesis")
-    fallback_label = dg_event_name
-    for word in ["The ", "the ", "Invitational", "Tournament", "Championship", "Classic", "Open"]:
-        fallback_label = fallback_label.replace(word, "")
-    fallback_label = fallback_label.strip()
-    if not fallback_label:
-        fallback_label = dg_event_name
-
-    edges, matched, skipped = [], 0, 0
-    for m_type, markets in kalshi_by_type.items():
-        for m in markets:
-            if current_event_code:
-                if get_event_code(m) and get_event_code(m) != current_event_code: skipped += 1; continue
-            k_name = get_kalshi_player_name(m)
-            if not k_name: continue
-            k_norm = normalize_name(k_name)
-            yes_ask, no_ask = m.get("yes_ask"), m.get("no_ask")
-            dg = dg_lookup.get(k_norm)
-            if not dg:
-                parts = k_norm.split()
-                if len(parts) >= 2: dg = dg_fuzzy.get(f"{parts[0][0]}_{parts[-1]}")
-            if not dg: continue
-            matched += 1
-            dg_prob = dg.get(DG_FIELDS.get(m_type))
-            if dg_prob is None: continue
-            dg_yes = dg_prob * 100 if dg_prob <= 1 else float(dg_prob); dg_no = 100 - dg_yes
-            tournament = get_tournament_label(m, fallback=fallback_label)
-            display_name = format_player_name(dg.get("player_name", k_name))
-            if yes_ask and yes_ask > 0:
-                edges.append({"player": display_name, "market": MARKET_LABELS.get(m_type), "side": "YES", "event": tournament,
-                    "dg_prob": dg_yes, "dg_yes": dg_yes, "dg_no": dg_no, "cost": yes_ask,
-                    "edge": dg_yes - yes_ask, "profit": 100 - yes_ask, "rr": (100 - yes_ask) / yes_ask})
-            if no_ask and 0 < no_ask < 100:
-                edges.append({"player": display_name, "market": MARKET_LABELS.get(m_type), "side": "NO", "event": tournament,
-                    "dg_prob": dg_no, "dg_yes": dg_yes, "dg_no": dg_no, "cost": no_ask,
-                    "edge": dg_no - no_ask, "profit": 100 - no_ask, "rr": (100 - no_ask) / no_ask})
-    return edges, matched, len(players), skipped
-
-
-def build_results_html(filtered, event_name, field_size, matched, min_edge, yes_count, no_count, avg_edge, source, skipped_other):
-    rows = ""
-    for e in filtered:
-        evt_cls = "badge-masters" if e["event"] == "Masters" else "badge-current"
-        evt_html = f'<span class="badge {evt_cls}">{e["event"]}</span>'
-
-        if e["side"] == "YES":
-            side_html = '<span class="badge badge-yes">YES</span>'
-            model_html = f'<span class="text-bright">{e["dg_prob"]:.1f}%</span>'
-        else:
-            side_html = '<span class="badge badge-no">NO</span>'
-            model_html = f'<span class="text-dim">{e["dg_yes"]:.1f}% &rarr;</span> <span class="text-bright">{e["dg_no"]:.1f}%</span>'
-
-        edge_cls = "edge-hot" if e["edge"] >= 7 else "edge-warm" if e["edge"] >= 5 else "edge-mild"
-        rr_cls = "rr-hot" if e["rr"] >= 2 else "rr-warm" if e["rr"] >= 1 else "rr-cool"
-
-        rows += f"""<tr>
-<td>{evt_html}</td>
-<td class="player-cell">{e["player"]}</td>
-<td class="text-secondary">{e["market"]}</td>
-<td>{side_html}</td>
-<td>{model_html}</td>
-<td><span class="{edge_cls}">+{e["edge"]:.1f}%</span></td>
-<td class="text-bright" style="font-weight:500;">{e["cost"]}&cent;</td>
-<td><span class="{rr_cls}">{e["rr"]:.1f}x</span></td>
-</tr>"""
-
-    table_body = rows if filtered else f'<tr><td colspan="8" class="empty-state">No edges above {min_edge}% — try lowering the threshold</td></tr>'
-
-    source_badge = '<span class="source-badge source-live"><span class="live-dot"></span>LIVE MODEL</span>' if source == "LIVE" else '<span class="source-badge source-pre">PRE-TOURNAMENT</span>'
-    skipped_note = f" &middot; {skipped_other} future markets filtered" if skipped_other > 0 else ""
-
-    return f"""<!DOCTYPE html><html><head><style>
-@import url('https://fonts.googleapis.com/css2?family=DM+Sans:wght@400;500;600;700&family=IBM+Plex+Mono:wght@300;400;500;600&display=swap');
-* {{ box-sizing:border-box; margin:0; padding:0; }}
-body {{ background:#0F0F0F; color:#b0b0b0; font-family:'IBM Plex Mono',monospace; font-size:13px; -webkit-font-smoothing:antialiased; }}
-
-.event-banner {{
-    background: #0a0a0a;
-    border: 1px solid #1a1a1a;
-    border-radius: 12px;
-    padding: 20px 24px;
-    margin-bottom: 16px;
-    display: flex;
-    justify-content: space-between;
-    align-items: center;
-    flex-wrap: wrap;
-    gap: 16px;
-}}
-.event-label {{ font-size:9px; color:#404040; letter-spacing:0.14em; font-weight:600; text-transform:uppercase; }}
-.event-name {{ font-family:'DM Sans',sans-serif; font-size:22px; font-weight:700; color:#e8e8e8; margin-top:6px; letter-spacing:-0.3px; }}
-.event-stat {{ text-align:center; }}
-.event-stat-value {{ font-size:20px; font-weight:600; color:#e8e8e8; font-family:'DM Sans',sans-serif; }}
-
-.source-badge {{ display:inline-flex; align-items:center; gap:6px; padding:4px 12px; border-radius:6px; font-size:10px; font-weight:600; letter-spacing:0.08em; }}
-.source-live {{ background:#f8717112; color:#f87171; border:1px solid #f8717130; }}
-.source-pre {{ background:#4ade800d; color:#4ade80; border:1px solid #4ade8022; }}
-.live-dot {{ width:6px; height:6px; background:#f87171; border-radius:50%; animation:livePulse 1.5s ease-in-out infinite; }}
-@keyframes livePulse {{ 0%,100%{{opacity:1}} 50%{{opacity:0.4}} }}
-
-.stat-row {{ display:grid; grid-template-columns:repeat(4,1fr); gap:12px; margin-bottom:16px; }}
-.stat-card {{
-    background: #0a0a0a;
-    border: 1px solid #1a1a1a;
-    border-radius: 10px;
-    padding: 16px 18px;
-}}
-.stat-label {{ font-size:9px; color:#404040; letter-spacing:0.12em; font-weight:600; margin-bottom:8px; text-transform:uppercase; }}
-.stat-value {{ font-family:'DM Sans',sans-serif; font-size:28px; font-weight:700; }}
-.stat-green {{ color:#4ade80; }}
-.stat-blue {{ color:#60a5fa; }}
-.stat-amber {{ color:#fbbf24; }}
-.stat-purple {{ color:#a78bfa; }}
-
-.table-wrap {{
-    background: #0a0a0a;
-    border: 1px solid #1a1a1a;
-    border-radius: 12px;
-    overflow: hidden;
-}}
-table {{ width:100%; border-collapse:collapse; }}
-thead th {{
-    background: #050505;
-    color: #404040;
-    font-size: 9px;
-    letter-spacing: 0.12em;
-    font-weight: 600;
-    padding: 14px 16px;
-    text-align: left;
-    border-bottom: 1px solid #1a1a1a;
-    white-space: nowrap;
-    text-transform: uppercase;
-}}
-tbody td {{
-    padding: 12px 16px;
-    border-bottom: 1px solid #0f0f0f;
-    white-space: nowrap;
-}}
-tbody tr:nth-child(even) {{ background: #050505; }}
-tbody tr:hover {{ background: #111111; }}
-
-.player-cell {{ font-family:'DM Sans',sans-serif; font-weight:600; color:#e0e0e0; font-size:13px; }}
-.text-bright {{ color:#d0d0d0; }}
-.text-dim {{ color:#505050; }}
-.text-secondary {{ color:#707070; }}
-.empty-state {{ padding:48px !important; text-align:center; color:#404040; font-style:italic; }}
-
-.badge {{ display:inline-block; padding:3px 10px; border-radius:5px; font-size:10px; font-weight:600; letter-spacing:0.03em; }}
-.badge-yes {{ background:#60a5fa10; color:#60a5fa; border:1px solid #60a5fa25; }}
-.badge-no {{ background:#fbbf2410; color:#fbbf24; border:1px solid #fbbf2425; }}
-.badge-current {{ background:#4ade8008; color:#4ade80; border:1px solid #4ade801a; }}
-.badge-masters {{ background:#a78bfa0d; color:#a78bfa; border:1px solid #a78bfa25; }}
-.badge-other {{ background:#70707010; color:#707070; border:1px solid #70707025; }}
-
-.edge-hot {{ color:#4ade80; font-weight:700; }}
-.edge-warm {{ color:#86efac; font-weight:700; }}
-.edge-mild {{ color:#a7f3d0; font-weight:600; }}
-.rr-hot {{ color:#4ade80; font-weight:700; }}
-.rr-warm {{ color:#86efac; font-weight:600; }}
-.rr-cool {{ color:#606060; font-weight:500; }}
-
-.footer {{
-    margin-top: 20px;
-    padding-top: 16px;
-    border-top: 1px solid #1a1a1a;
-    display: flex;
-    justify-content: space-between;
-    flex-wrap: wrap;
-    gap: 12px;
-    font-size: 11px;
-    color: #303030;
-}}
-.footer-credit {{
-    font-family: 'DM Sans', sans-serif;
-    font-size: 12px;
-    color: #353535;
-    text-align: center;
-    margin-top: 24px;
-    padding: 16px 0;
-    border-top: 1px solid #1a1a1a;
-    letter-spacing: 0.02em;
-}}
-</style></head><body>
-
-<div class="event-banner">
-  <div>
-    <div style="display:flex;align-items:center;gap:10px;margin-bottom:2px;">
-        <span class="event-label">Current Event</span>
-        {source_badge}
-    </div>
-    <div class="event-name">{event_name}</div>
-  </div>
-  <div style="display:flex;gap:28px;">
-    <div class="event-stat"><div class="event-label">Field</div><div class="event-stat-value">{field_size}</div></div>
-    <div class="event-stat"><div class="event-label">Matched</div><div class="event-stat-value">{matched}</div></div>
-  </div>
-</div>
-
-<div class="stat-row">
-  <div class="stat-card"><div class="stat-label">Edges Found</div><div class="stat-value stat-green">{len(filtered)}</div></div>
-  <div class="stat-card"><div class="stat-label">Buy Yes</div><div class="stat-value stat-blue">{yes_count}</div></div>
-  <div class="stat-card"><div class="stat-label">Buy No</div><div class="stat-value stat-amber">{no_count}</div></div>
-  <div class="stat-card"><div class="stat-label">Avg Edge</div><div class="stat-value stat-purple">{avg_edge:.1f}%</div></div>
-</div>
-
-<div class="table-wrap">
-  <div style="overflow-x:auto;">
-    <table>
-      <thead><tr>
-        <th>Event</th><th>Player</th><th>Market</th><th>Side</th><th>DG Model</th><th>Edge</th><th>Cost</th><th>R/R</th>
-      </tr></thead>
-      <tbody>{table_body}</tbody>
-    </table>
-  </div>
-</div>
-
-<div class="footer">
-    <span>Edge = DG probability &minus; Kalshi ask &middot; Live orderbook prices</span>
-    <span>{matched} matched &middot; {field_size} players{skipped_note}</span>
-</div>
-
-<div class="footer-credit">
-    Created by Zack Hennigan
-</div>
-
-</body></html>"""
-
+# Results table: stylesheet and renderer are static files the browser loads once; reruns send only row data
+edge_table = components.declare_component("edge_table", path=FRONTEND_DIR)
+
+@st.cache_resource
+def get_price_stream():
+    return KalshiPriceStream(headers=lambda url: kalshi_ws_headers(KALSHI_API_KEY_ID, KALSHI_PRIVATE_KEY, url))
+
+@st.cache_resource
+def get_crosswalk():
+    return PlayerCrosswalk(CROSSWALK_PATH)
+
+@st.cache_resource
+def get_response_cache():
+    return ResponseCache(RESPONSE_CACHE_PATH)
+
+@st.cache_resource
+def get_metrics_server():
+    # One /metrics endpoint per server process, shared by every session
+    return serve_metrics(METRICS_PORT) if METRICS_PORT else None
+
+@st.cache_resource
+def get_history():
+    return SnapshotHistory(HISTORY_DIR)
+
+@st.cache_resource
+def get_refresher():
+    # One scan loop per server process, whatever the number of sessions; the SQLite cache shares it across processes too
+    crosswalk, cache, history = get_crosswalk(), get_response_cache(), get_history()
+    # Alert rules are checked once per refresh, against the rows that moved, never per session
+    listeners = []
+    if ALERT_RULES_PATH:
+        engine, webhook = AlertEngine.load(ALERT_RULES_PATH)
+        listeners.append(engine.listener(webhook))
+    return Refresher(lambda prev: run_scan(DG_API_KEY, crosswalk=crosswalk, cache=cache, history=history, prev=prev), listeners=listeners).start()
+
+@st.cache_resource
+def get_feed_server():
+    # One /edges endpoint per server process for bots, answered from the shared refresher's snapshot
+    return serve_feed(get_refresher(), FEED_PORT) if FEED_PORT else None
 
 # ============================================================
 # MAIN
 # ============================================================
 
+get_metrics_server()
+
 st.markdown("""
 <div style="margin-bottom:20px;">
     <div class="edge-header">
@@ -435,6 +149,58 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+def stream_tickers(pub):
+    # Real Kalshi tickers of the matched markets; rows keyed by a synthetic m_type:event:title key have nothing to stream
+    matched = pub["snapshot"]["matched"]
+    return frozenset(m["ticker"] for markets in pub["kalshi_by_type"].values() for m in markets if m.get("ticker") in matched)
+
+def stream_view(pub, stream):
+    # Built once per (publication, stream version) through refresher.derive and shared by every streaming session.
+    # Quotes received while the scan was fetching and pricing are newer than its REST asks, so the cutoff is the fetch.
+    # Streamed views are not appended to the history: it keeps one frame per refresh, written by the refresher's scan
+    streamed = stream.apply(pub["kalshi_by_type"], since=pub["fetched_mono"])
+    snapshot, _ = rescan_edges(pub["snapshot"], pub["dg_data"], streamed, get_crosswalk())
+    edges = tuple(snapshot["edges"])
+    return {"snapshot": snapshot, "edges": edges, "store": EdgeStore(edges), "last_updated": now_est()}
+
+def show_view(view, key):
+    st.session_state.update({
+        "snapshot": view["snapshot"], "edges": view["edges"], "edge_store": view["store"], "view_key": key,
+        "matched": len(view["snapshot"]["matched"]), "field_size": view["snapshot"]["field_size"],
+        "skipped_other": len(view["snapshot"]["skipped"]), "last_updated": view["last_updated"],
+    })
+
+def load_published(pub, notify=False):
+    # The published view is shared by every session: keep references, never mutate it
+    st.session_state.update({
+        "published": pub, "snapshot": pub["snapshot"], "edges": pub["edges"], "edge_store": pub["store"],
+        "matched": pub["matched"], "field_size": pub["field_size"], "skipped_other": pub["skipped_other"],
+        "last_updated": datetime.fromtimestamp(pub["published_at"], EST), "unmatched": pub["unmatched"],
+        "event_name": pub["event_name"], "source": pub["source"], "view_key": None, "stream_version": None,
+    })
+    if not notify: return
+    if pub["source"] == "LIVE":
+        st.toast("🔴 Live model active!", icon="🔴")
+    missing = [m for m in pub["incomplete"] if m in KALSHI_SERIES]
+    if missing:
+        partial = [m for m in missing if m in pub["kalshi_by_type"]]
+        st.toast(f"Kalshi incomplete: {', '.join(MARKET_LABELS[m] + (' (partial)' if m in partial else '') for m in missing)}", icon="⚠️")
+    if "live" in pub["errors"]:
+        st.toast(f"Live model unavailable: {pub['errors']['live']}", icon="⚠️")
+    delta = pub["delta"]
+    if not delta["full"]:
+        st.toast(f"{len(delta['appeared'])} new · {len(delta['disappeared'])} gone · {len(delta['moved'])} moved since the previous refresh")
+
+@st.fragment(run_every=REFRESH_POLL_SECONDS)
+def refresh_watcher(refresher):
+    if refresher.latest is not st.session_state.get("published"): st.rerun()
+    st.caption(f"Auto-refresh: {refresher.status}" + (f" · last attempt failed ({refresher.error})" if refresher.error else ""))
+
+@st.fragment(run_every=STREAM_POLL_SECONDS)
+def stream_watcher(stream):
+    if stream.version != st.session_state.get("stream_version"): st.rerun()
+    st.caption(f"Stream: {stream.status}")
+
 if not DG_API_KEY:
     st.error("⚠️ Add DG_API_KEY to Streamlit secrets.")
     st.stop()
@@ -442,6 +208,7 @@ if not DG_API_KEY:
 col_btn, col_status = st.columns([1, 3])
 with col_btn:
     scan = st.button("⛳ Scan Markets", use_container_width=True)
+    live_prices = st.toggle("Stream prices", help="Keep Kalshi asks current over WebSocket between scans")
 
 c1, c2, c3, c4 = st.columns(4)
 with c1: min_edge = st.selectbox("Min Edge %", [3, 5, 7, 10], index=1)
@@ -449,59 +216,36 @@ with c2: side_filter = st.selectbox("Side", ["All", "YES", "NO"])
 with c3: market_filter = st.selectbox("Market", ["All", "Win", "Top 5", "Top 10", "Top 20", "Make Cut"])
 with c4: sort_by = st.selectbox("Sort By", ["Edge", "R/R", "Profit"])
 
+refresher = get_refresher()
+get_feed_server()
+
 if scan or "edges" in st.session_state:
     if scan:
-        # Clear cached data to ensure fresh pull (important when tournaments change week to week)
-        fetch_dg_live.clear()
-        fetch_dg_pretournament.clear()
-        fetch_kalshi_markets.clear()
-
-        # Always fetch pre-tournament first — this is the source of truth for the CURRENT event
-        with st.spinner("Fetching current tournament data..."):
-            try:
-                pretournament_data = fetch_dg_pretournament()
-            except Exception as e:
-                st.error(f"Data Golf error: {e}")
-                st.stop()
-
-        current_event = pretournament_data.get("event_name", "")
-
-        # Now try live — but only use it if it matches the current event
-        dg_data = None
-        with st.spinner("Checking for live model..."):
-            live_data = fetch_dg_live()
-
-        if live_data:
-            live_event = live_data.get("event_name", "")
-            # Check if live data is for the same event as pre-tournament
-            # Compare by checking if key words overlap
-            current_words = set(w.lower() for w in current_event.split() if len(w) > 3)
-            live_words = set(w.lower() for w in live_event.split() if len(w) > 3)
-            if current_words & live_words:
-                dg_data = live_data
-                st.toast("🔴 Live model active!", icon="🔴")
-            else:
-                # Live data is from a different (old) tournament — ignore it
-                dg_data = pretournament_data
-        else:
-            dg_data = pretournament_data
-
-        kalshi_by_type = {}
-        for m_type, ticker in KALSHI_SERIES.items():
-            with st.spinner(f"Scanning Kalshi {m_type.replace('_', ' ')} markets..."):
-                markets = fetch_kalshi_markets(ticker)
-                if markets: kalshi_by_type[m_type] = markets
-
-        edges, matched, field_size, skipped_other = calculate_all_edges(dg_data, kalshi_by_type)
-        st.session_state.update({
-            "edges": edges, "matched": matched, "field_size": field_size,
-            "skipped_other": skipped_other,
-            "event_name": dg_data.get("event_name", "Unknown"),
-            "source": dg_data.get("source", "PRE-TOURNAMENT"),
-            "last_updated": now_est(),
-        })
-
-    edges = st.session_state["edges"]
+        # The background refresher does the fetching; a click only picks up its latest snapshot
+        pub = refresher.latest
+        if pub is None:
+            # Nothing published yet (the first scan failed, or is still running): retry now instead of at the next cadence
+            refresher.refresh_now()
+            with st.spinner("Fetching Data Golf and Kalshi markets..."):
+                pub = refresher.wait(timeout=SCAN_DEADLINE + 5)
+        if pub is None:
+            st.error(f"Data Golf error: {refresher.error}" if refresher.error else "The first scan is still running, try again in a moment.")
+            st.stop()
+        load_published(pub, notify=True)
+    elif refresher.latest is not st.session_state.get("published"):
+        load_published(refresher.latest)
+    with col_btn: refresh_watcher(refresher)
+
+    if live_prices:
+        # Overlay streamed quotes newer than the last REST fetch; the delta rescan touches only the markets that moved
+        stream = get_price_stream()
+        stream.watch(refresher.derive(st.session_state["published"], ("stream_tickers",), stream_tickers))
+        version = stream.version
+        if version != st.session_state.get("stream_version"):
+            st.session_state["stream_version"] = version
+            show_view(refresher.derive(st.session_state["published"], ("stream", version), lambda pub: stream_view(pub, stream)), ("stream", version))
+        with col_btn: stream_watcher(stream)
+
     matched = st.session_state["matched"]
     field_size = st.session_state["field_size"]
     skipped_other = st.session_state.get("skipped_other", 0)
@@ -522,14 +266,69 @@ if scan or "edges" in st.session_state:
         </div>
         """, unsafe_allow_html=True)
 
-    filtered = [e for e in edges if e["edge"] >= min_edge]
-    if side_filter != "All": filtered = [e for e in filtered if e["side"] == side_filter]
-    if market_filter != "All": filtered = [e for e in filtered if e["market"] == market_filter]
-    filtered.sort(key=lambda x: x[{"Edge": "edge", "R/R": "rr", "Profit": "profit"}[sort_by]], reverse=True)
-
-    yes_count = sum(1 for e in filtered if e["side"] == "YES")
-    no_count = sum(1 for e in filtered if e["side"] == "NO")
-    avg_edge = sum(e["edge"] for e in filtered) / len(filtered) if filtered else 0
-
-    html = build_results_html(filtered, event_name, field_size, matched, min_edge, yes_count, no_count, avg_edge, source, skipped_other)
-    components.html(html, height=380 + max(len(filtered), 1) * 46, scrolling=False)
+    store = st.session_state["edge_store"]
+
+    def build_table(_):
+        filtered = store.query(min_edge, side_filter, market_filter, sort_by)
+        yes_count, no_count, avg_edge = store.stats(min_edge, side_filter, market_filter)
+        return table_payload(filtered, event_name, field_size, matched, min_edge, yes_count, no_count, avg_edge, source, skipped_other)
+
+    # One payload per (view, filters) for all sessions; rebuilt only when the snapshot or a filter actually changed
+    table_key = ("table", st.session_state["view_key"], min_edge, side_filter, market_filter, sort_by)
+    edge_table(**refresher.derive(st.session_state["published"], table_key, build_table), key="edge_table", default=None)
+
+    unmatched = st.session_state.get("unmatched", {})
+    if unmatched:
+        with st.expander(f"{len(unmatched)} Kalshi names unmatched or fuzzy-matched to Data Golf"):
+            st.markdown("\n".join(f"- **{title}** — {reason}" for title, reason in sorted(unmatched.items())))
+            # A confirmed name is an alias in every event; the refresh it triggers rescans every market with it
+            crosswalk, match_event = get_crosswalk(), st.session_state["snapshot"]["match_event"]
+            players = {format_player_name(p.get("player_name", "")): player_key(p) for p in st.session_state["published"]["dg_data"].get("players", [])}
+            names = sorted(players)
+            c_title, c_player, c_confirm = st.columns([2, 2, 1])
+            with c_title: title = st.selectbox("Kalshi name", sorted(unmatched), key="confirm_title")
+            picked = crosswalk.events.get(match_event, {}).get(title)
+            with c_player:
+                player = st.selectbox("Data Golf player", names, index=next((i for i, n in enumerate(names) if players[n] == picked), None), key="confirm_player")
+            with c_confirm:
+                if st.button("Confirm match", disabled=player is None, use_container_width=True):
+                    crosswalk.confirm(title, players[player]); crosswalk.save()
+                    refresher.refresh_now()
+                    st.toast(f"{title} → {player} confirmed; rescanning")
+
+    # Depth check: order books only for the best top-of-book edges, through the shared short-TTL cache
+    with st.expander("Order book depth"):
+        stake = st.number_input("Stake per position ($)", min_value=1.0, value=DEPTH_STAKE, step=10.0)
+        if st.button("Price best edges against the book"):
+            snapshot = st.session_state["snapshot"]
+            priced = price_depth(snapshot, stake, min_edge=min_edge, fetch=cached_orderbook(get_response_cache()))
+            rows = [e for e in apply_fills(snapshot, priced["fills"]) if e["fill"] is not None]
+            st.session_state["depth"] = (rows, priced["books"], priced["errors"])
+        if "depth" in st.session_state:
+            rows, books, errors = st.session_state["depth"]
+            st.caption(f"{books} order books · {len(errors)} failed")
+            st.dataframe([{"player": e["player"], "market": e["market"], "side": e["side"], "ask": e["cost"], "edge": round(e["edge"], 1),
+                           "fill": round(e["fill"], 1), "fill edge": round(e["fill_edge"], 1), "filled": e["filled"],
+                           "max size": e["max_size"], "max EV $": round(e["max_ev"], 2)}
+                          for e in sorted(rows, key=lambda e: e["fill_edge"], reverse=True)], width="stretch", hide_index=True)
+
+    # Edge history: every scan's quotes, read back from the memory-mapped history files
+    with st.expander("Edge history"):
+        snapshot = st.session_state["snapshot"]
+        players = {e["player"]: snapshot["market_player"][k] for k, rows in snapshot["rows"].items() for e in rows}
+        if players:
+            pick = st.selectbox("Player", sorted(players), key="history_player")
+            hist = get_history().query(start=time.time() - 7 * 86400, player=players[pick])
+            if hist.empty:
+                st.caption("No history for this player yet")
+            else:
+                hist["series"] = hist["market"].map(MARKET_LABELS).astype(str) + " " + hist["side"].astype(str)
+                st.line_chart(hist.pivot_table(index="ts", columns="series", values="edge", aggfunc="last").ffill())
+
+    with st.expander("Diagnostics"):
+        _, _, timers = METRICS.snapshot()
+        st.dataframe([{"stage": dict(labels)["stage"], "labels": " ".join(f"{k}={v}" for k, v in labels if k != "stage"), "count": n,
+                       "avg ms": round(total / n * 1000, 1), "max ms": round(peak * 1000, 1)}
+                      for labels, (n, total, peak) in sorted(timers.items())],
+                     width="stretch", hide_index=True)
+        st.code(METRICS.prometheus(), language="text")
@@ -0,0 +1,187 @@
+"""Scan-path benchmarks from 150 to 50,000 markets, checked against a stored baseline.
+
+    python -m benchmarks.bench                      # run, compare with baseline.json, exit 1 on a regression
+    python -m benchmarks.bench --update-baseline    # record this machine's numbers as the new baseline
+    python -m benchmarks.bench --sizes 150,1500 --stages calculate_all_edges
+    python -m benchmarks.bench --render             # results HTML vs edge_table payload: bytes and time per size
+
+Throughput is markets (or names) per second for the best of several rounds. Each stage is timed
+next to a fixed reference workload and compared relative to it, so a busy or slower machine
+shifts both and only code changes move the ratio. A stage regresses when its throughput falls
+more than --tolerance below baseline.
+"""
+
+import gc
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+from functools import partial
+from unittest import mock
+
+from benchmarks import fixtures
+from edgefinder import api, registry
+from edgefinder.client import HttpClient
+from edgefinder.edges import EdgeStore, calculate_all_edges, filter_edges, rescan_edges
+from edgefinder.events import identify_current_event_code
+from edgefinder.names import PlayerCrosswalk, normalize_name
+from edgefinder.registry import EventRegistry
+from edgefinder.render import build_results_html, table_payload
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+# Stages faster than this per call are re-timed with longer rounds and more of them before they count:
+# a few milliseconds of work is easily swamped by a scheduler hiccup or a cold cache
+FAST_STAGE_S = 0.005
+FAST_ROUNDS, FAST_MIN_ROUND = 3, 0.3
+SIZES = [150, 1500, 15000, 50000]
+FILTERS = [(5, "All", "All", "Edge"), (3, "YES", "All", "R/R"), (7, "All", "Top 10", "Profit"), (10, "NO", "Win", "Edge")]
+
+
+def best_time(fn, rounds=5, min_round=0.1):
+    """Best per-call seconds over rounds of at least min_round each, with the GC paused as timeit does."""
+    n, best = 1, float("inf")
+    gc.collect(); gc.disable()
+    try:
+        while True:
+            start = time.perf_counter()
+            for _ in range(n): fn()
+            if time.perf_counter() - start >= min_round or n >= 1 << 20: break
+            n *= 2
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(n): fn()
+            best = min(best, (time.perf_counter() - start) / n)
+    finally:
+        gc.enable()
+    return best
+
+def reference():
+    """A fixed mix of dict, string and numpy work; timed next to every stage so machine drift cancels out."""
+    import numpy as np
+    d = {f"k{i}": i for i in range(2000)}
+    " ".join(sorted(k.upper() for k in d))
+    np.sort(np.arange(20000, 0, -1) * 1.5)
+
+def stages(size):
+    """(stage, units per call, zero-argument callable) for one slate of about `size` markets."""
+    dg_data, kalshi_by_type = fixtures.slate(size)
+    # An in-memory event registry, already refreshed: the steady state of every scan after the first
+    registry._registry = EventRegistry(path=None).update(fixtures.kalshi_events(kalshi_by_type), fixtures.schedule())
+    markets = sum(map(len, kalshi_by_type.values()))
+    titles = [m["yes_sub_title"] for ms in kalshi_by_type.values() for m in ms] + [p["player_name"] for p in dg_data["players"]]
+    edges, _, _, _ = calculate_all_edges(dg_data, kalshi_by_type, PlayerCrosswalk())
+    snapshot, _ = rescan_edges(None, dg_data, kalshi_by_type, PlayerCrosswalk())
+    store = EdgeStore(edges)
+    shown = filter_edges(edges, 5)
+    yes, no, avg = store.stats(5)
+    render_args = (shown, dg_data["event_name"], len(dg_data["players"]), len(snapshot["matched"]), 5, yes, no, avg, "PRE-TOURNAMENT", 0)
+    session = fixtures.FixtureSession(dg_data, kalshi_by_type)
+    kalshi = partial(api.fetch_kalshi_markets, max_pages=1000)
+
+    def fetch():
+        with mock.patch.object(api, "_client", HttpClient(session, limits={}, retries=0)):
+            return api.fetch_all("bench", fetchers={"kalshi": kalshi})
+
+    return markets, [
+        ("normalize_name", len(titles), lambda: [normalize_name(t) for t in titles]),
+        ("identify_current_event_code", markets, lambda: identify_current_event_code(kalshi_by_type, dg_data["event_name"])),
+        ("fetch_all", markets, fetch),
+        ("calculate_all_edges", markets, lambda: calculate_all_edges(dg_data, kalshi_by_type, PlayerCrosswalk())),
+        ("rescan_unchanged", markets, lambda: rescan_edges(snapshot, dg_data, kalshi_by_type, PlayerCrosswalk())),
+        ("filter_edges", len(edges) * len(FILTERS), lambda: [filter_edges(edges, *f) for f in FILTERS]),
+        ("edge_store_build", len(edges), lambda: EdgeStore(edges)),
+        ("edge_store_query", len(edges) * len(FILTERS), lambda: [(store.query(*f), store.stats(*f[:3])) for f in FILTERS]),
+        ("build_results_html", len(shown), lambda: build_results_html(*render_args)),
+        ("table_payload", len(shown), lambda: json.dumps(table_payload(*render_args))),
+    ]
+
+def render_report(sizes, rounds=5):
+    """Bytes sent and seconds spent per rerun: the old results document against the edge_table component's JSON payload."""
+    print(f"{'size':>6} {'rows':>6}  {'html KB':>9} {'html ms':>8}  {'payload KB':>10} {'payload ms':>10}  {'bytes':>6} {'time':>6}")
+    report = {}
+    for size in sizes:
+        _, cases = stages(size)
+        fns = {name: (units, fn) for name, units, fn in cases if name in ("build_results_html", "table_payload")}
+        (rows, html), (_, payload) = fns["build_results_html"], fns["table_payload"]
+        html_b, payload_b = len(html().encode()), len(payload().encode())
+        html_s, payload_s = best_time(html, rounds), best_time(payload, rounds)
+        report[size] = {"rows": rows, "html_bytes": html_b, "html_s": html_s, "payload_bytes": payload_b, "payload_s": payload_s}
+        print(f"{size:>6} {rows:>6}  {html_b / 1024:9.1f} {html_s * 1000:8.3f}  {payload_b / 1024:10.1f} {payload_s * 1000:10.3f}"
+              f"  {payload_b / html_b:6.2f} {payload_s / html_s:6.2f}", flush=True)
+    return report
+
+def run(sizes, only=None, rounds=5):
+    results = {}
+    for size in sizes:
+        markets, cases = stages(size)
+        for name, units, fn in cases:
+            if only and name not in only: continue
+            # The reference is timed on both sides of the stage and its best kept, so one slow moment can't skew the ratio
+            ref = best_time(reference, rounds)
+            seconds = best_time(fn, rounds)
+            if seconds < FAST_STAGE_S: seconds = min(seconds, best_time(fn, rounds * FAST_ROUNDS, FAST_MIN_ROUND))
+            ref = min(ref, best_time(reference, rounds))
+            results[f"{name}@{size}"] = {"markets": markets, "units": units, "seconds": seconds, "per_s": units / seconds if seconds else 0.0, "ref_s": ref}
+            print(f"{name:>28} @ {size:>6}  {seconds * 1000:10.3f} ms  {units / seconds:14,.0f} /s", flush=True)
+    return results
+
+def compare(results, baseline, tolerance):
+    """Names of every stage whose throughput fell more than tolerance below its baseline."""
+    regressions = []
+    for key, r in results.items():
+        base = baseline.get("results", {}).get(key)
+        if not base: continue
+        # Scaled by how fast the reference ran each time, so a busy or throttled machine isn't a regression
+        ratio = r["per_s"] / base["per_s"] * r["ref_s"] / base.get("ref_s", r["ref_s"])
+        flag = "REGRESSION" if ratio < 1 - tolerance else ""
+        print(f"{key:>38}  {ratio:6.2f}x baseline {flag}")
+        if flag: regressions.append(key)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmarks.bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="comma-separated target market counts")
+    parser.add_argument("--stages", help="comma-separated stage names (default: all)")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed throughput drop vs baseline (0.25 = 25%%)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--render", action="store_true", help="only compare results HTML with the edge_table payload")
+    args = parser.parse_args(argv)
+
+    if args.render:
+        render_report([int(s) for s in args.sizes.split(",")], args.rounds)
+        return 0
+
+    results = run([int(s) for s in args.sizes.split(",")], set(args.stages.split(",")) if args.stages else None, args.rounds)
+    if args.update_baseline:
+        baseline = {"machine": f"{platform.python_implementation()} {platform.python_version()} {platform.machine()}",
+                    "recorded": time.strftime("%Y-%m-%d"), "results": results}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f: old = json.load(f)
+            baseline["results"] = {**old.get("results", {}), **results}
+        with open(args.baseline, "w") as f: json.dump(baseline, f, indent=1, sort_keys=True); f.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("no baseline yet: run with --update-baseline", file=sys.stderr)
+        return 0
+    with open(args.baseline) as f: baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        # Noise rarely strikes the same stage twice: re-time the flagged ones and keep their best run
+        print(f"re-timing {len(regressions)} flagged stage(s)")
+        for size in sorted({int(k.split("@")[1]) for k in regressions}):
+            again = run([size], {k.split("@")[0] for k in regressions if k.endswith(f"@{size}")}, args.rounds)
+            for key, r in again.items():
+                if r["per_s"] * r["ref_s"] > results[key]["per_s"] * results[key]["ref_s"]: results[key] = r
+        regressions = compare({k: results[k] for k in regressions}, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} stage(s) regressed more than {args.tolerance:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
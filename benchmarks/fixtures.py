@@ -0,0 +1,164 @@
+"""Synthetic Data Golf and Kalshi payloads shaped like the live feeds, at any scale.
+
+Everything is seeded, so the same arguments always give the same slate. Names come in the
+variants the matcher has to cope with: DG's "Last, First" with suffixes and accents against
+Kalshi's "First Last" with the accents dropped, the suffix moved or missing.
+"""
+
+import json
+import random
+from datetime import date, timedelta
+
+from edgefinder.config import KALSHI_SERIES
+
+FIRST = ["Scottie", "Rory", "Jon", "Xander", "Collin", "Viktor", "Patrick", "Matt", "Tommy", "Ludvig", "Wyndham", "Sahith",
+         "Max", "Tony", "Cameron", "Justin", "Hideki", "Sungjae", "Tom", "Sam", "Nicolai", "Rasmus", "Joaquín", "Séamus"]
+LAST = ["Scheffler", "McIlroy", "Rahm", "Schauffele", "Morikawa", "Hovland", "Cantlay", "Fitzpatrick", "Fleetwood", "Åberg",
+        "Clark", "Theegala", "Homa", "Finau", "Young", "Thomas", "Matsuyama", "Im", "Kim", "Burns", "Højgaard", "Niemann",
+        "Power", "Bhatia", "Pérez", "Davis", "Lowry", "Straka"]
+SUFFIXES = ["Jr.", "III", "II", "Sr."]
+# Event codes the ticker parser knows; the first is the "current" event unless told otherwise
+EVENTS = [("GNINV", "The Genesis Invitational"), ("MAST", "Masters Tournament"), ("PGAC", "PGA Championship"),
+          ("USOP", "U.S. Open"), ("OPEN", "The Open Championship"), ("MEMO", "the Memorial Tournament"),
+          ("TRAV", "Travelers Championship"), ("RBC", "RBC Heritage"), ("ARNO", "Arnold Palmer Invitational")]
+DG_FIELDS = ["win", "top_5", "top_10", "top_20", "make_cut"]
+
+
+def fold(s):
+    import unicodedata
+    return "".join(c for c in unicodedata.normalize("NFKD", s) if not unicodedata.combining(c))
+
+def field(size, seed=0, suffix_rate=0.05):
+    """DG players: (dg_name, kalshi_title, dg_id) with unique names and the usual name variants."""
+    rng = random.Random(seed)
+    players, seen = [], set()
+    while len(players) < size:
+        first, last = rng.choice(FIRST), rng.choice(LAST)
+        n = len(players) // (len(FIRST) * len(LAST))
+        if n: last = f"{last}{'x' * n}"  # past the name pool: keep names unique
+        if (first, last) in seen: continue
+        seen.add((first, last))
+        suffix = rng.choice(SUFFIXES) if rng.random() < suffix_rate else ""
+        dg_name = f"{last}, {first}" + (f" {suffix}" if suffix else "")
+        # Kalshi drops accents about half the time and usually drops the suffix
+        title = f"{first} {last}"
+        if rng.random() < 0.5: title = fold(title)
+        if suffix and rng.random() < 0.3: title += f" {suffix}"
+        players.append((dg_name, title, 10000 + len(players)))
+    return players
+
+def dg_players(players, seed=0):
+    rng = random.Random(seed)
+    out = []
+    for dg_name, _, dg_id in players:
+        w = rng.uniform(0.001, 0.15)
+        probs = [w, min(1, w * 4), min(1, w * 7), min(1, w * 11), min(0.99, 0.5 + w * 3)]
+        out.append({"player_name": dg_name, "dg_id": dg_id, "country": "USA", **{f: round(p, 5) for f, p in zip(DG_FIELDS, probs)}})
+    return out
+
+def pretournament(players, event_name="The Genesis Invitational", seed=0):
+    """Body of /preds/pre-tournament; probabilities are fractions, which the engine accepts alongside percents."""
+    return {"event_name": event_name, "last_updated": "2026-02-12 10:00:00 UTC", "models_available": ["baseline", "baseline_history_fit"],
+            "baseline_history_fit": dg_players(players, seed), "baseline": dg_players(players, seed + 1)}
+
+def in_play(players, event_name="The Genesis Invitational", seed=0):
+    """Body of /preds/in-play."""
+    rows = dg_players(players, seed + 2)
+    for i, p in enumerate(rows): p.update(current_pos=f"T{i // 3 + 1}", current_score=-(len(rows) - i) // 10, thru=12, round=2)
+    return {"info": {"event_name": event_name, "current_round": 2, "last_update": "2026-02-13 18:30:00 UTC"}, "data": rows}
+
+def kalshi_markets(players, events=1, series=None, seed=0, year=26):
+    """{m_type: [market dicts]} like fetch_kalshi_markets returns: every player in every series for each event."""
+    rng = random.Random(seed)
+    series = series or list(KALSHI_SERIES)
+    out = {}
+    for m_type in series:
+        markets = out[m_type] = []
+        for code, _ in EVENTS[:events]:
+            event_ticker = f"{KALSHI_SERIES[m_type]}-{code}{year}"
+            for i, (_, title, _) in enumerate(players):
+                yes = rng.randint(1, 95)
+                markets.append({"ticker": f"{event_ticker}-P{i}", "event_ticker": event_ticker, "yes_sub_title": title,
+                                "title": f"Will {title} finish {m_type}?", "status": "open",
+                                "yes_bid": max(0, yes - 2), "yes_ask": yes, "no_bid": max(0, 98 - yes), "no_ask": min(99, 100 - yes + rng.randint(1, 4)),
+                                "last_price": yes, "volume": rng.randint(0, 50000), "open_interest": rng.randint(0, 20000)})
+    return out
+
+def schedule(year=26):
+    """DG /get-schedule rows for EVENTS, one week apart from mid-February."""
+    first = date(2000 + year, 2, 12)
+    return [{"event_id": 100 + i, "event_name": name, "start_date": (first + timedelta(weeks=i)).isoformat(), "tour": "pga"}
+            for i, (_, name) in enumerate(EVENTS)]
+
+def kalshi_events(kalshi_by_type, year=26):
+    """Kalshi /events dicts for every event ticker in a slate, settling on the Sunday of their week."""
+    rows = {row["event_name"]: row for row in schedule(year)}
+    names, out = dict(EVENTS), {}
+    for markets in kalshi_by_type.values():
+        for m in markets:
+            et = m["event_ticker"]
+            if et in out: continue
+            series, code = et.split("-")
+            name = names.get(code[:-len(str(year))], "")
+            start = date.fromisoformat(rows[name]["start_date"]) if name in rows else None
+            out[et] = {"event_ticker": et, "series_ticker": series, "title": f"{name} winner", "category": "Sports",
+                       "strike_date": f"{start + timedelta(days=3)}T23:00:00Z" if start else None}
+    return list(out.values())
+
+def pages(markets, limit=200):
+    """The paginated /markets bodies for one series, cursor-chained like Kalshi's."""
+    out = []
+    for start in range(0, max(len(markets), 1), limit):
+        end = start + limit
+        out.append({"markets": markets[start:end], "cursor": str(end) if end < len(markets) else ""})
+    return out
+
+def slate(markets, field_size=150, series_count=5, seed=0):
+    """A full scan's inputs with about `markets` Kalshi markets: (dg_data, kalshi_by_type).
+
+    Field size and series count are fixed; events are added (current first) until the target is met.
+    Past the known event list the field grows instead.
+    """
+    series = list(KALSHI_SERIES)[:series_count]
+    events = max(1, min(len(EVENTS), round(markets / (field_size * len(series)))))
+    size = max(1, round(markets / (events * len(series))))
+    players = field(size, seed)
+    dg = pretournament(players, EVENTS[0][1], seed)
+    dg_data = {"event_name": dg["event_name"], "players": dg["baseline_history_fit"], "source": "PRE-TOURNAMENT"}
+    return dg_data, kalshi_markets(players, events, series, seed)
+
+
+class FixtureResponse:
+    def __init__(self, body, status=200):
+        self.status_code, self.headers, self._body = status, {}, body
+        self.content = json.dumps(body).encode()
+
+    def json(self):
+        return json.loads(self.content)
+
+class FixtureSession:
+    """Stands in for requests.Session under HttpClient: serves pre-tournament, in-play, the schedule, /events and paginated /markets.
+
+    tours gives other DG tours their own pre-tournament model ({tour: dg_data}); None makes that tour's feed answer 500.
+    """
+    def __init__(self, dg_data, kalshi_by_type, live=None, limit=200, tours=None):
+        self.pre = {"event_name": dg_data["event_name"], "baseline_history_fit": dg_data["players"]}
+        self.tours = {tour: d and {"event_name": d["event_name"], "baseline_history_fit": d["players"]} for tour, d in (tours or {}).items()}
+        self.live = live or {"event_name": "Old Event", "data": []}
+        self.pages = {series: pages(kalshi_by_type.get(m_type, []), limit) for m_type, series in KALSHI_SERIES.items()}
+        self.limit = limit
+        self.events, self.schedule = kalshi_events(kalshi_by_type), schedule()
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        params = params or {}
+        if url.endswith("/preds/pre-tournament"):
+            body = self.tours.get(params.get("tour"), self.pre)
+            return FixtureResponse(body) if body else FixtureResponse({}, 500)
+        if url.endswith("/preds/in-play"): return FixtureResponse(self.live)
+        if url.endswith("/get-schedule"): return FixtureResponse({"tour": "all", "schedule": self.schedule})
+        if url.endswith("/events"):
+            return FixtureResponse({"events": [e for e in self.events if e["series_ticker"] == params.get("series_ticker")], "cursor": ""})
+        if url.endswith("/markets"):
+            book = self.pages.get(params.get("series_ticker"), [{"markets": [], "cursor": ""}])
+            return FixtureResponse(book[int(params.get("cursor") or 0) // self.limit])
+        return FixtureResponse({}, 404)
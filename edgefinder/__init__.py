@@ -0,0 +1,24 @@
+"""Headless Golf Edge Finder core: Data Golf / Kalshi clients, player matching and the edge engine.
+
+Names below resolve on first access, so importing the package (or the CLI) loads nothing heavy
+until a scan actually needs it. The Streamlit dashboard (app.py) is a thin layer on top.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "fetch_all": "api", "fetch_dg_live": "api", "fetch_dg_pretournament": "api", "fetch_kalshi_markets": "api",
+    "select_dg_data": "api", "get_http_session": "api", "get_http_client": "api", "HttpClient": "client",
+    "get_event_code": "events", "get_tournament_label": "events", "identify_current_event_code": "events", "partition_events": "events",
+    "EventRegistry": "registry", "get_event_registry": "registry",
+    "normalize_name": "names", "format_player_name": "names", "get_kalshi_player_name": "names", "PlayerCrosswalk": "names",
+    "calculate_all_edges": "edges", "rescan_edges": "edges", "filter_edges": "edges", "EdgeStore": "edges", "EDGE_COLUMNS": "edges",
+    "METRICS": "metrics", "serve_metrics": "metrics", "KalshiPriceStream": "stream", "Refresher": "refresher", "AlertEngine": "alerts", "serve_feed": "feed", "SnapshotHistory": "history", "Backtest": "backtest", "fetch_settlements": "backtest",
+    "scan": "scanner", "scan_events": "scanner", "build_results_html": "render", "table_payload": "render",
+}
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
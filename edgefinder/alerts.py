@@ -0,0 +1,132 @@
+"""Edge alerts: thousands of subscription rules checked against each refresh, posted to webhooks.
+
+A rule is {"player", "market", "side", "min_edge"} where any of the first three may be None for
+"any". Rules are indexed by that (player, market, side) key, each key holding its thresholds in
+a sorted list, so a quote meets its rules with eight dict lookups and a bisect: the rules it
+clears are a prefix. Only quotes in the rescan delta are looked at (everything on a full rescan).
+
+A rule fires once when a quote's edge reaches its threshold and stays quiet until the edge falls
+more than ALERT_HYSTERESIS below it; on top of that one rule never fires twice on one quote within
+ALERT_COOLDOWN seconds. An edge hovering around a threshold therefore alerts once, not every tick.
+"""
+
+import json
+import time
+import threading
+from bisect import bisect_right
+from itertools import count as counter, product
+
+from .config import ALERT_COOLDOWN, ALERT_HYSTERESIS, REQUEST_TIMEOUT
+from .metrics import count, gauge, log_event
+
+RULE_KEYS = ("player", "market", "side")
+
+
+class AlertEngine:
+    def __init__(self, rules=(), hysteresis=ALERT_HYSTERESIS, cooldown=ALERT_COOLDOWN):
+        self.hysteresis, self.cooldown = hysteresis, cooldown
+        self.lock = threading.Lock()
+        self.rules, self.index = {}, {}   # id -> rule; (player, market, side) -> ([thresholds], [ids]) ascending
+        self.active, self.fired = {}, {}  # (market key, side) -> {rule id: threshold}; (rule id, market key, side) -> last alert time
+        self.ids = counter(1)
+        for rule in rules: self.add(rule)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """Engine and default webhook from a {"webhook": url, "rules": [...]} file."""
+        with open(path) as f: data = json.load(f)
+        return cls(data.get("rules", []), **kwargs), data.get("webhook")
+
+    def add(self, rule):
+        """Index a rule (a copy gets an "id" if it has none); returns the id."""
+        rule = {**dict.fromkeys(RULE_KEYS), **rule, "min_edge": float(rule["min_edge"])}
+        with self.lock:
+            rule.setdefault("id", None)
+            if rule["id"] is None: rule["id"] = f"r{next(self.ids)}"
+            if rule["id"] in self.rules: self._unindex(rule["id"])
+            thresholds, ids = self.index.setdefault(tuple(rule[k] for k in RULE_KEYS), ([], []))
+            at = bisect_right(thresholds, rule["min_edge"])
+            thresholds.insert(at, rule["min_edge"]); ids.insert(at, rule["id"])
+            self.rules[rule["id"]] = rule
+        gauge("alert_rules", len(self.rules))
+        return rule["id"]
+
+    def remove(self, rule_id):
+        with self.lock:
+            if rule_id in self.rules: self._unindex(rule_id)
+        gauge("alert_rules", len(self.rules))
+
+    def _unindex(self, rule_id):
+        rule = self.rules.pop(rule_id)
+        key = tuple(rule[k] for k in RULE_KEYS)
+        thresholds, ids = self.index[key]
+        at = ids.index(rule_id)
+        del thresholds[at], ids[at]
+        if not ids: del self.index[key]
+
+    def matching(self, edge):
+        """(threshold, rule id) of every rule the edge row clears."""
+        for key in product((edge["player"], None), (edge["market"], None), (edge["side"], None)):
+            entry = self.index.get(key)
+            if not entry: continue
+            n = bisect_right(entry[0], edge["edge"])
+            yield from zip(entry[0][:n], entry[1][:n])
+
+    def evaluate(self, snapshot, delta=None, now=None):
+        """Alerts due for one rescan: every row on a full rescan, otherwise only the delta's rows."""
+        now = time.time() if now is None else now
+        if delta is None or delta["full"]:
+            changed = [(k, e) for k, rows in snapshot["rows"].items() for e in rows]
+            live = {(k, e["side"]) for k, e in changed}
+            gone = [rk for rk in self.active if rk not in live]
+        else:
+            changed = [(k, new) for k, new in delta["appeared"]] + [(k, new) for k, _, new in delta["moved"]]
+            gone = [(k, old["side"]) for k, old in delta["disappeared"]]
+        alerts = []
+        with self.lock:
+            for rk in gone: self.active.pop(rk, None)
+            for k, e in changed:
+                rk = (k, e["side"])
+                active = self.active.pop(rk, {})
+                # Re-arm only once the edge is clearly back under the threshold (or the rule is gone)
+                active = {rid: t for rid, t in active.items() if rid in self.rules and e["edge"] >= t - self.hysteresis}
+                for threshold, rid in self.matching(e):
+                    if rid in active: continue
+                    active[rid] = threshold
+                    if now - self.fired.get((rid, *rk), float("-inf")) < self.cooldown: continue
+                    self.fired[(rid, *rk)] = now
+                    rule = self.rules[rid]
+                    alerts.append({"rule": rid, "user": rule.get("user"), "webhook": rule.get("webhook"), "ticker": k, "threshold": threshold,
+                                   **{c: e[c] for c in ("player", "market", "side", "event", "edge", "cost", "dg_prob")}})
+                if active: self.active[rk] = active
+            if len(self.fired) > 4 * max(len(self.rules), 1024):
+                self.fired = {key: t for key, t in self.fired.items() if now - t < self.cooldown}
+        count("alert_quotes_checked", len(changed)); count("alerts_fired", len(alerts))
+        return alerts
+
+    def listener(self, webhook=None):
+        """Refresher listener: evaluate each published scan and post its alerts without holding up the next one."""
+        def on_publish(view):
+            alerts = self.evaluate(view["snapshot"], view.get("delta"))
+            if alerts: threading.Thread(target=deliver, args=(alerts, webhook), name="alerts", daemon=True).start()
+        return on_publish
+
+
+def post_alerts(url, alerts, timeout=REQUEST_TIMEOUT):
+    from .api import get_http_session
+    r = get_http_session().post(url, json={"sent_at": time.time(), "alerts": alerts}, timeout=timeout)
+    r.raise_for_status()
+
+def deliver(alerts, webhook=None):
+    """Post alerts in one batch per webhook (the rule's own, else the default); failures are logged and counted."""
+    batches = {}
+    for a in alerts:
+        url = a.get("webhook") or webhook
+        if url: batches.setdefault(url, []).append({k: v for k, v in a.items() if k != "webhook"})
+    for url, batch in batches.items():
+        try:
+            post_alerts(url, batch)
+            count("alert_posts", result="ok")
+        except Exception as e:
+            count("alert_posts", result="error")
+            log_event("alert_error", url=url, alerts=len(batch), error=str(e))
@@ -0,0 +1,190 @@
+"""Data Golf and Kalshi REST clients plus the concurrent fetch stage.
+
+requests is imported on first use; fetchers take an absolute time.monotonic() deadline so no
+round trip outlives the scan that started it. Every request goes through one HttpClient.
+"""
+
+import sys
+import time
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from .client import HttpClient, HttpError, PartialResult
+from .config import DG_BASE, KALSHI_BASE, KALSHI_MARKET_FIELDS, KALSHI_SERIES, HTTP_POOL_SIZE, MAX_IN_FLIGHT, SCAN_DEADLINE, CACHE_TTLS
+from .metrics import count, timer
+
+_session, _client, _session_lock = None, None, threading.Lock()
+
+def get_http_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount("https://", adapter); session.mount("http://", adapter)
+            _session = session
+    return _session
+
+def get_http_client():
+    global _client
+    session = get_http_session()
+    with _session_lock:
+        if _client is None: _client = HttpClient(session)
+    return _client
+
+def fetch_dg_live(api_key, deadline=None, tour="pga"):
+    """Live model, or None when DG has no in-play data (between rounds); transport errors are raised."""
+    params = {"tour": tour, "dead_heat": "no", "odds_format": "percent", "file_format": "json", "key": api_key}
+    data = get_http_client().get_json(f"{DG_BASE}/preds/in-play", params, deadline)
+    if isinstance(data, dict):
+        event_name = data.get("event_name", data.get("info", {}).get("event_name", "Live Tournament"))
+        for key in ["data", "players", "baseline_history_fit", "baseline"]:
+            if key in data and isinstance(data[key], list) and len(data[key]) > 0:
+                return {"event_name": event_name, "players": data[key], "source": "LIVE", "tour": tour}
+    elif isinstance(data, list) and len(data) > 0:
+        return {"event_name": "Live Tournament", "players": data, "source": "LIVE", "tour": tour}
+    return None
+
+def fetch_dg_pretournament(api_key, deadline=None, tour="pga"):
+    params = {"tour": tour, "odds_format": "percent", "file_format": "json", "key": api_key}
+    data = get_http_client().get_json(f"{DG_BASE}/preds/pre-tournament", params, deadline)
+    return {"event_name": data.get("event_name", "Unknown Event"), "players": data.get("baseline_history_fit", []) or data.get("baseline", []),
+            "source": "PRE-TOURNAMENT", "tour": tour}
+
+def project_page(data):
+    """A /markets page cut down to KALSHI_MARKET_FIELDS as it arrives, its strings interned (intern_markets)."""
+    if not isinstance(data, dict): return data
+    markets = [{f: m[f] for f in KALSHI_MARKET_FIELDS if f in m} for m in data.get("markets") or []]
+    return {"markets": intern_markets(markets), "cursor": data.get("cursor")}
+
+def intern_markets(markets):
+    """Intern event tickers and titles in place and return the markets.
+
+    They repeat across series and pages, so every copy shares one string. A ResponseCache hit is a
+    fresh json.loads, so cached market lists are interned again on the way out.
+    """
+    intern = sys.intern
+    for m in markets or ():
+        event_ticker, title = m.get("event_ticker"), m.get("yes_sub_title")
+        if type(event_ticker) is str: m["event_ticker"] = intern(event_ticker)
+        if type(title) is str: m["yes_sub_title"] = intern(title)
+    return markets
+
+def fetch_kalshi_markets(series_ticker, deadline=None, status="open", max_pages=20):
+    """Every page of a series; raises PartialResult (carrying the pages so far) if it cannot finish."""
+    all_markets, cursor = [], None
+    client = get_http_client()
+    for _ in range(max_pages):
+        if deadline is not None and time.monotonic() >= deadline:
+            raise PartialResult(all_markets, f"{series_ticker}: deadline hit after {len(all_markets)} markets")
+        params = {"series_ticker": series_ticker, "status": status, "limit": 200}
+        if cursor: params["cursor"] = cursor
+        try:
+            with timer("kalshi_page", series=series_ticker):
+                data = client.get_json(f"{KALSHI_BASE}/markets", params, deadline, parse=project_page)
+            count("kalshi_pages", series=series_ticker)
+        except (HttpError, TimeoutError, OSError) as e:
+            if not all_markets: raise
+            raise PartialResult(all_markets, f"{series_ticker}: {e}") from e
+        markets = data.get("markets", [])
+        if not markets: return all_markets
+        all_markets.extend(markets); cursor = data.get("cursor")
+        if not cursor: return all_markets
+    raise PartialResult(all_markets, f"{series_ticker}: more than {max_pages} pages")
+
+def fetch_kalshi_events(series_ticker, deadline=None, status="open", max_pages=10):
+    """Event dicts (event_ticker, title, strike_date, ...) of one series, every page."""
+    events, cursor, client = [], None, get_http_client()
+    for _ in range(max_pages):
+        params = {"series_ticker": series_ticker, "status": status, "limit": 200}
+        if cursor: params["cursor"] = cursor
+        data = client.get_json(f"{KALSHI_BASE}/events", params, deadline)
+        events.extend(data.get("events") or [])
+        cursor = data.get("cursor")
+        if not cursor or not data.get("events"): break
+    return events
+
+def fetch_dg_schedule(api_key, deadline=None, tour="all"):
+    params = {"tour": tour, "file_format": "json", "key": api_key}
+    data = get_http_client().get_json(f"{DG_BASE}/get-schedule", params, deadline)
+    return data.get("schedule", []) if isinstance(data, dict) else []
+
+def refresh_event_registry(api_key=None, deadline=None):
+    from .registry import get_event_registry
+    return get_event_registry().refresh(api_key, deadline)
+
+def cached_fetchers(cache, api_key):
+    """fetch_all fetchers that go through a shared ResponseCache with per-endpoint TTLs."""
+    return {
+        "pretournament": lambda tour, deadline: cache.get(f"dg:pre-tournament:{tour}", partial(fetch_dg_pretournament, api_key, tour=tour),
+                                                          *CACHE_TTLS["dg_pretournament"], deadline=deadline),
+        "live": lambda tour, deadline: cache.get(f"dg:in-play:{tour}", partial(fetch_dg_live, api_key, tour=tour),
+                                                 *CACHE_TTLS["dg_live"], deadline=deadline),
+        "kalshi": lambda series, deadline: intern_markets(cache.get(f"kalshi:markets:{series}", partial(fetch_kalshi_markets, series),
+                                                                    *CACHE_TTLS["kalshi_markets"], deadline=deadline)),
+    }
+
+def fetch_all(api_key=None, deadline_s=SCAN_DEADLINE, fetchers=None, initializer=None, tours=("pga",)):
+    """Run both DG feeds of every tour and every Kalshi series in parallel; returns whatever finished before the deadline.
+
+    The first tour fills "pretournament"/"live" (jobs of the same names); every tour, the first
+    included, lands in "dg_by_tour" as {"pretournament", "live"}, and the other tours' jobs are
+    keyed "pretournament:<tour>" / "live:<tour>". "errors" maps each job that failed, timed out or
+    returned a partial page set to the reason, and "incomplete" lists those jobs; a partial Kalshi
+    series still contributes the markets it did fetch.
+
+    An "events" job refreshes the event registry when it is stale (a no-op otherwise), so the
+    markets are read against current event metadata.
+
+    fetchers overrides the "pretournament"/"live" (tour, deadline), "kalshi" (series, deadline) and
+    "events" (deadline) callables, e.g. with cached wrappers; initializer runs in each worker thread.
+    """
+    fetchers = {"pretournament": lambda tour, deadline: fetch_dg_pretournament(api_key, deadline, tour),
+                "live": lambda tour, deadline: fetch_dg_live(api_key, deadline, tour),
+                "kalshi": fetch_kalshi_markets, "events": partial(refresh_event_registry, api_key), **(fetchers or {})}
+    deadline = time.monotonic() + deadline_s
+    jobs, dg_jobs = {"events": (fetchers["events"], ())}, {}
+    for i, tour in enumerate(tours):
+        for feed in ("pretournament", "live"):
+            key = feed if i == 0 else f"{feed}:{tour}"
+            jobs[key], dg_jobs[key] = (fetchers[feed], (tour,)), (tour, feed)
+    for m_type, ticker in KALSHI_SERIES.items():
+        jobs[m_type] = (fetchers["kalshi"], (ticker,))
+
+    pool = ThreadPoolExecutor(max_workers=MAX_IN_FLIGHT, thread_name_prefix="fetch", initializer=initializer)
+    futures = {pool.submit(_timed_job, key, fn, *args, deadline): key for key, (fn, args) in jobs.items()}
+    done, _ = wait(futures, timeout=deadline_s)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    result = {"pretournament": None, "pretournament_error": None, "live": None, "kalshi_by_type": {}, "errors": {},
+              "dg_by_tour": {tour: {"pretournament": None, "live": None} for tour in tours}}
+    for fut, key in futures.items():
+        err = fut.exception() if fut in done else TimeoutError(f"no response within {deadline_s}s")
+        if err is not None: result["errors"][key] = str(err)
+        if key in dg_jobs:
+            # A live feed is optional: a failure falls back to pre-tournament but is still reported
+            tour, feed = dg_jobs[key]
+            result["dg_by_tour"][tour][feed] = None if err else fut.result()
+            if key == "pretournament": result["pretournament_error"] = err
+            if key in ("pretournament", "live"): result[key] = result["dg_by_tour"][tour][feed]
+        elif key == "events": continue
+        elif isinstance(err, PartialResult):
+            if err.value: result["kalshi_by_type"][key] = err.value
+        elif not err and fut.result(): result["kalshi_by_type"][key] = fut.result()
+    # Anything that failed, timed out or stopped early is reported; nothing is dropped silently
+    result["incomplete"] = list(result["errors"])
+    return result
+
+def _timed_job(job, fn, *args):
+    with timer("fetch", job=job): return fn(*args)
+
+def select_dg_data(pretournament_data, live_data):
+    """Pre-tournament is the source of truth for the CURRENT event; live is used only if it is for the same event."""
+    if not live_data: return pretournament_data
+    # Compare by checking if key words overlap
+    current_words = set(w.lower() for w in pretournament_data.get("event_name", "").split() if len(w) > 3)
+    live_words = set(w.lower() for w in live_data.get("event_name", "").split() if len(w) > 3)
+    # Live data from a different (old) tournament is ignored
+    return live_data if current_words & live_words else pretournament_data
@@ -0,0 +1,145 @@
+"""Replay stored quotes against settled Kalshi markets.
+
+Quotes are SnapshotHistory.query() frames: one row per change of (ticker, side), so a quote
+stands until the next row. An entry rule buys one contract per (ticker, side) at the first quote
+that satisfies it. Rows are sorted by (ticker, side, ts) once; for a threshold sweep the edge is
+offset by group and run through a cumulative max, which makes "first quote with edge >= t" a
+single searchsorted over every group and threshold at once.
+"""
+
+from .config import KALSHI_SERIES
+
+# Edges live in [-100, 100]; groups are spaced further apart so one cumulative max covers them all
+_GROUP_SPAN = 1000.0
+_INELIGIBLE = -500.0
+
+
+def settlements_frame(markets):
+    """ticker / result (1 yes, 0 no) / close_ts (epoch seconds) from settled Kalshi market dicts."""
+    import pandas as pd
+    rows = [(m.get("ticker"), 1.0 if m.get("result") == "yes" else 0.0, m.get("close_time") or m.get("expiration_time"))
+            for m in markets if m.get("ticker") and m.get("result") in ("yes", "no")]
+    frame = pd.DataFrame(rows, columns=["ticker", "result", "close_ts"])
+    frame["close_ts"] = epoch_seconds(pd.to_datetime(frame["close_ts"], utc=True, errors="coerce"))
+    return frame
+
+def epoch_seconds(ts):
+    import pandas as pd
+    return (ts - pd.Timestamp(0, tz="UTC")).dt.total_seconds().to_numpy(dtype=float)
+
+def column_strings(col):
+    import numpy as np
+    import pandas as pd
+    codes, uniques = pd.factorize(col)
+    return np.array([str(u) for u in uniques] + [""], dtype=object)[codes]
+
+def fetch_settlements(series=None, deadline=None, max_pages=100):
+    """Settled markets of every golf series (or the given ones) as a settlements_frame."""
+    import pandas as pd
+    from .api import fetch_kalshi_markets
+    frames = [settlements_frame(fetch_kalshi_markets(s, deadline, status="settled", max_pages=max_pages))
+              for s in (series or KALSHI_SERIES.values())]
+    return pd.concat(frames, ignore_index=True)
+
+
+class Backtest:
+    def __init__(self, quotes, settlements, fee=0.0):
+        """quotes: SnapshotHistory.query() frame. settlements: settlements_frame, or {ticker: 1/0}.
+
+        fee is charged per contract, in cents. Tickers without a settlement are dropped; with no
+        close_ts the last stored quote of the ticker stands in for the close.
+        """
+        import numpy as np
+        import pandas as pd
+        if isinstance(settlements, dict): settlements = pd.DataFrame({"ticker": list(settlements), "result": list(settlements.values())})
+        settle = settlements.drop_duplicates("ticker", keep="last").set_index("ticker")
+        q = quotes[quotes["ask"].notna()]
+        # Strings are handled once per distinct value (categoricals from the history factorize for free)
+        t_codes, t_uniques = pd.factorize(q["ticker"])
+        result = settle["result"].reindex([str(t) for t in t_uniques]).to_numpy(dtype=float)[t_codes]
+        settled = ~np.isnan(result)
+        q, t_codes, result = q[settled], t_codes[settled], result[settled]
+
+        ts = epoch_seconds(q["ts"]) if hasattr(q["ts"], "dt") else q["ts"].to_numpy(dtype=float)
+        yes = column_strings(q["side"]) == "YES"
+        order = np.lexsort((ts, yes, t_codes))
+        key = (t_codes * 2 + yes)[order]
+        starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+        self.group = np.cumsum(np.r_[False, key[1:] != key[:-1]]) if len(key) else key
+        self.group_end = np.r_[starts[1:], len(key)] if len(key) else key  # no rows, no groups
+
+        self.ts, self.yes, self.result = ts[order], yes[order], result[order]
+        self.edge = q["edge"].to_numpy(dtype=float)[order]
+        self.ask = q["ask"].to_numpy(dtype=float)[order]
+        self.prob = q["dg_prob"].to_numpy(dtype=float)[order]
+        self.won = np.where(self.yes, self.result == 1, self.result == 0)
+        self.cost = self.ask + fee
+        self.pnl = self.won * 100.0 - self.cost
+        self.market = column_strings(q["market"])[order]
+
+        close = settle["close_ts"].reindex([str(t) for t in t_uniques]).to_numpy(dtype=float) if "close_ts" in settle else np.full(len(t_uniques), np.nan)
+        last_seen = np.full(len(t_uniques), -np.inf)
+        np.maximum.at(last_seen, t_codes, ts)
+        self.close = np.where(np.isnan(close), last_seen, close)[t_codes[order]]
+        self.markets = sorted(set(self.market.tolist()))
+
+    def _eligible(self, side="All", market="All", hours=None):
+        import numpy as np
+        mask = np.ones(len(self.edge), dtype=bool)
+        if side != "All": mask &= self.yes == (side == "YES")
+        if market != "All": mask &= self.market == market
+        if hours is not None:
+            # Entry window as (min, max) hours before the market closed
+            left = (self.close - self.ts) / 3600
+            mask &= (left >= hours[0]) & (left <= hours[1])
+        return mask
+
+    def entries(self, thresholds, side="All", market="All", hours=None):
+        """(groups x thresholds) row index of each entry, -1 where the rule never triggered."""
+        import numpy as np
+        t = np.maximum(np.atleast_1d(np.asarray(thresholds, dtype=float)), -100.0)  # every real edge clears -100
+        if not len(self.group_end): return np.full((0, len(t)), -1)
+        base = np.arange(len(self.group_end)) * _GROUP_SPAN
+        vals = np.where(self._eligible(side, market, hours), np.nan_to_num(self.edge, nan=_INELIGIBLE), _INELIGIBLE) + base[self.group]
+        pos = np.searchsorted(np.maximum.accumulate(vals), base[:, None] + t[None, :], side="left")
+        return np.where(pos < self.group_end[:, None], pos, -1)
+
+    def sweep(self, thresholds, side="All", market="All", hours=None):
+        """Bets, hit rate, ROI and P&L per (min_edge, market) for every threshold at once, "All" included."""
+        import numpy as np
+        import pandas as pd
+        t = np.atleast_1d(np.asarray(thresholds, dtype=float))
+        pos = self.entries(t, side, market, hours)
+        hit = pos >= 0
+        rows = np.where(hit, pos, 0)
+        g_market = self.market[self.group_end - 1] if len(self.group_end) else self.market[:0]
+        m_codes = np.searchsorted(self.markets, g_market) if len(self.markets) else np.zeros(0, dtype=int)
+        names = self.markets + ["All"]
+        cell = np.broadcast_to(m_codes[:, None] * len(t) + np.arange(len(t))[None, :], pos.shape)
+        size = len(names) * len(t)
+        stats = {}
+        for name, w in (("bets", hit), ("wins", hit & self.won[rows]), ("cost", np.where(hit, self.cost[rows], 0)),
+                        ("pnl", np.where(hit, self.pnl[rows], 0))):
+            per = np.bincount(cell.ravel(), weights=w.ravel().astype(float), minlength=size).reshape(len(names), len(t))
+            per[-1] = per[:-1].sum(axis=0)
+            stats[name] = per.ravel()
+        frame = pd.DataFrame(stats, index=pd.MultiIndex.from_product([names, t], names=["market", "min_edge"]))
+        frame["bets"] = frame["bets"].astype(int)
+        frame["hit_rate"] = frame["wins"] / frame["bets"].where(frame["bets"] > 0)
+        frame["roi"] = frame["pnl"] / frame["cost"].where(frame["cost"] > 0)
+        return frame.swaplevel().sort_index()[["bets", "hit_rate", "roi", "pnl", "cost"]]
+
+    def run(self, min_edge, side="All", market="All", hours=None):
+        """One entry rule, reported per market."""
+        return self.sweep([min_edge], side, market, hours).xs(float(min_edge), level="min_edge")
+
+    def calibration(self, min_edge=float("-inf"), side="All", market="All", hours=None, bins=10):
+        """Mean DG probability vs realized win rate of the entered contracts, per market and probability bin."""
+        import numpy as np
+        import pandas as pd
+        pos = self.entries([min_edge], side, market, hours)[:, 0]
+        pos = pos[pos >= 0]
+        frame = pd.DataFrame({"market": self.market[pos], "prob": self.prob[pos] / 100, "won": self.won[pos].astype(float)})
+        frame["bin"] = pd.cut(frame["prob"], np.linspace(0, 1, bins + 1), include_lowest=True)
+        out = frame.groupby(["market", "bin"], observed=True).agg(predicted=("prob", "mean"), realized=("won", "mean"), n=("won", "size"))
+        return out
@@ -0,0 +1,152 @@
+"""SQLite response cache shared by every thread and process that opens the same file.
+
+Fresh entries are returned as-is. Stale entries (inside the stale window) are returned while a
+single background refresh runs. Misses are single-flight: within a process one thread fetches
+and the rest wait on it; across processes a lease row in the table elects one fetcher.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from .config import RESPONSE_CACHE_PATH, CACHE_LEASE
+from .metrics import count, log_event
+
+
+class ResponseCache:
+    def __init__(self, path=RESPONSE_CACHE_PATH, lease_s=CACHE_LEASE):
+        self.path, self.lease_s = path, lease_s
+        self.local = threading.local()
+        self.lock, self.inflight = threading.Lock(), {}
+        self.hits = self.stale_hits = self.misses = 0
+        if os.path.dirname(path): os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db().execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT, fetched_at REAL NOT NULL DEFAULT 0, lease_until REAL NOT NULL DEFAULT 0)")
+
+    def _db(self):
+        db = getattr(self.local, "db", None)
+        if db is None:
+            db = self.local.db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+        return db
+
+    def get(self, key, fetch, ttl, stale_ttl=0, deadline=None):
+        """Cached fetch(deadline) result for key; deadline is an absolute time.monotonic() value or None."""
+        row = self._read(key)
+        if row is not None:
+            age = time.time() - row[1]
+            if age < ttl:
+                self.hits += 1; count("cache_lookups", result="hit")
+                return row[0]
+            if age < ttl + stale_ttl:
+                self.stale_hits += 1; count("cache_lookups", result="stale")
+                self._refresh_in_background(key, fetch, ttl)
+                return row[0]
+        self.misses += 1; count("cache_lookups", result="miss")
+        return self._fetch_single_flight(key, fetch, ttl, deadline, stale=row)
+
+    def invalidate(self, key=None):
+        if key is None: self._db().execute("DELETE FROM responses")
+        else: self._db().execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def _read(self, key):
+        row = self._db().execute("SELECT value, fetched_at FROM responses WHERE key = ? AND value IS NOT NULL", (key,)).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def _store(self, key, value):
+        self._db().execute(
+            "INSERT INTO responses (key, value, fetched_at, lease_until) VALUES (?, ?, ?, 0) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, fetched_at = excluded.fetched_at, lease_until = 0",
+            (key, json.dumps(value), time.time()))
+
+    def _acquire(self, key):
+        # Lease row elects one fetcher across processes; an expired lease (crashed holder) can be taken over
+        now = time.time()
+        cur = self._db().execute(
+            "INSERT INTO responses (key, lease_until) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET lease_until = excluded.lease_until WHERE responses.lease_until < ?",
+            (key, now + self.lease_s, now))
+        return cur.rowcount == 1
+
+    def _release(self, key):
+        self._db().execute("UPDATE responses SET lease_until = 0 WHERE key = ?", (key,))
+
+    def _run_fetch(self, key, fetch, done, deadline=None):
+        try:
+            value = fetch(deadline)
+            self._store(key, value)
+            return value
+        except BaseException:
+            self._release(key)
+            raise
+        finally:
+            self._drop(key, done)
+
+    def _claim(self, key):
+        """This thread's in-process slot for key (an Event set when it is done), or None if another thread holds it.
+
+        Only the dict is touched under self.lock; the SQLite lease is taken afterwards by _lease, so a slow or
+        busy database stalls the one key being fetched, not every other key in every thread.
+        """
+        with self.lock:
+            if key in self.inflight: return None
+            done = self.inflight[key] = threading.Event()
+        return done
+
+    def _lease(self, key, done):
+        # Another process holding the lease gives the slot back (waking this process's waiters to poll the row)
+        try:
+            if self._acquire(key): return True
+        except BaseException:
+            self._drop(key, done)
+            raise
+        self._drop(key, done)
+        return False
+
+    def _drop(self, key, done):
+        with self.lock: self.inflight.pop(key, None)
+        done.set()
+
+    def _fresh_after_lease(self, key, done, ttl):
+        """The row, if the previous lease holder stored it fresh after this caller last read it; the lease is handed back."""
+        row = self._read(key)
+        if row is None or time.time() - row[1] >= ttl: return None
+        self._release(key); self._drop(key, done)
+        return row
+
+    def _refresh_in_background(self, key, fetch, ttl):
+        done = self._claim(key)
+        if done is None or not self._lease(key, done) or self._fresh_after_lease(key, done, ttl) is not None: return
+        def refresh():
+            try:
+                self._run_fetch(key, fetch, done)
+                count("cache_refreshes", result="ok")
+            except Exception as e:
+                # The stale value keeps being served; the next stale read starts another refresh
+                count("cache_refreshes", result="error")
+                log_event("cache_refresh_error", key=key, error=f"{type(e).__name__}: {e}")
+        threading.Thread(target=refresh, name=f"cache-refresh:{key}", daemon=True).start()
+
+    def _fetch_single_flight(self, key, fetch, ttl, deadline, stale=None):
+        while True:
+            done = self._claim(key)
+            if done is not None:
+                if self._lease(key, done):
+                    # A poller can read the row just before the previous holder's _store and win the lease it frees
+                    row = self._fresh_after_lease(key, done, ttl)
+                    return row[0] if row is not None else self._run_fetch(key, fetch, done, deadline)
+                done = None
+            else:
+                with self.lock: done = self.inflight.get(key)
+
+            # Another thread (done is set when it finishes) or process (poll the row) is fetching this key
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                if stale is not None: return stale[0]
+                raise TimeoutError(f"timed out waiting for {key}")
+            wait = 0.05 if remaining is None else min(0.05, remaining)
+            if done is not None: done.wait(remaining)
+            else: time.sleep(wait)
+            row = self._read(key)
+            if row is not None and time.time() - row[1] < ttl: return row[0]
@@ -0,0 +1,101 @@
+"""Headless scanner: python -m edgefinder [--format json|csv] [filters]. Never imports Streamlit."""
+
+import os
+import sys
+import csv
+import json
+import logging
+import argparse
+from datetime import datetime, timezone
+
+from .config import CROSSWALK_PATH, DG_TOURS, HISTORY_DIR, MARKET_LABELS, PROFILE_DIR, RESPONSE_CACHE_PATH, SCAN_DEADLINE
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="edgefinder", description="Scan Kalshi golf markets against the Data Golf model.")
+    parser.add_argument("--dg-key", default=os.environ.get("DG_API_KEY", ""), help="Data Golf API key (default: $DG_API_KEY)")
+    parser.add_argument("--format", choices=["json", "csv"], default="json")
+    parser.add_argument("-o", "--output", help="write to this file instead of stdout")
+    parser.add_argument("--min-edge", type=float, default=float("-inf"), help="minimum edge in percentage points (default: all)")
+    parser.add_argument("--side", choices=["All", "YES", "NO"], default="All")
+    parser.add_argument("--market", choices=["All", *MARKET_LABELS.values()], default="All")
+    parser.add_argument("--sort", choices=["Edge", "R/R", "Profit"], default="Edge")
+    parser.add_argument("--all-events", action="store_true", help="scan every DG tour against every open Kalshi event code")
+    parser.add_argument("--tours", default=",".join(DG_TOURS), help="comma-separated DG tours for --all-events")
+    parser.add_argument("--depth-stake", type=float, default=0, help="price the best edges against their order books for this stake in dollars")
+    parser.add_argument("--deadline", type=float, default=SCAN_DEADLINE, help="per-scan fetch deadline in seconds")
+    parser.add_argument("--cache", default=RESPONSE_CACHE_PATH, help="shared response cache file ('' to always fetch)")
+    parser.add_argument("--history", default=HISTORY_DIR, help="append this scan to the history directory ('' to skip)")
+    parser.add_argument("--crosswalk", default=CROSSWALK_PATH, help="player crosswalk file ('' to keep it in memory)")
+    parser.add_argument("--confirm", action="append", default=[], metavar="NAME=DG_ID",
+                        help="record a checked Kalshi name -> Data Golf dg_id match in the crosswalk (repeatable; no scan without a key)")
+    parser.add_argument("--profile", default=PROFILE_DIR, help="dump a cProfile of the scan into this directory")
+    parser.add_argument("--metrics", help="write Prometheus text metrics to this file after the scan (textfile collector)")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="keep rescanning and serve the latest edges on :PORT/edges until interrupted")
+    parser.add_argument("--log-level", default="WARNING", help="stage timings are JSON lines on stderr at INFO (per request at DEBUG)")
+    return parser
+
+def write_result(result, edges, fmt, out):
+    from .edges import EDGE_COLUMNS
+    if fmt == "csv":
+        from .depth import DEPTH_COLUMNS
+        writer = csv.DictWriter(out, fieldnames=EDGE_COLUMNS + (DEPTH_COLUMNS if "depth" in result else []), lineterminator="\n")
+        writer.writeheader(); writer.writerows(edges)
+        return
+    keys = ["event_name", "source", "matched", "field_size", "skipped_other", "incomplete", "errors", "unmatched", "events", "depth"]
+    payload = {"scanned_at": datetime.now(timezone.utc).isoformat(timespec="seconds"), **{k: result[k] for k in keys if k in result}, "edges": [dict(e) for e in edges]}
+    json.dump(payload, out, indent=2); out.write("\n")
+
+def serve(args, kwargs):
+    from .feed import serve_feed
+    from .refresher import Refresher
+    from .scanner import scan
+    refresher = Refresher(lambda prev: scan(args.dg_key, prev=prev, **kwargs)).start()
+    server = serve_feed(refresher, args.serve)
+    print(f"edgefinder: serving edges on http://{server.server_address[0]}:{server.server_port}/edges", file=sys.stderr)
+    try: refresher.thread.join()
+    except KeyboardInterrupt: pass
+    refresher.stop(); server.shutdown()
+    return 0
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.serve is not None and args.all_events: parser.error("--serve rescans the current event only; drop --all-events")
+    logging.basicConfig(level=args.log_level.upper(), format="%(message)s", stream=sys.stderr)
+    from .names import PlayerCrosswalk
+    crosswalk = PlayerCrosswalk(args.crosswalk or None)
+    for pair in args.confirm:
+        name, _, dg_id = pair.rpartition("=")
+        if not (name.strip() and dg_id.strip()): parser.error(f"--confirm expects NAME=DG_ID, got {pair!r}")
+        crosswalk.confirm(name.strip(), int(dg_id) if dg_id.strip().isdigit() else dg_id.strip())
+    if args.confirm:
+        crosswalk.save()
+        if not args.dg_key: return 0
+    if not args.dg_key:
+        print("edgefinder: no Data Golf key (pass --dg-key or set DG_API_KEY)", file=sys.stderr)
+        return 2
+
+    from .cache import ResponseCache
+    from .history import SnapshotHistory
+    from .edges import filter_edges
+    from .scanner import scan, scan_events
+    kwargs = {"crosswalk": crosswalk, "cache": ResponseCache(args.cache) if args.cache else None,
+              "history": SnapshotHistory(args.history) if args.history else None, "deadline_s": args.deadline, "profile_dir": args.profile,
+              "depth_stake": args.depth_stake}
+    if args.serve is not None: return serve(args, kwargs)
+    try:
+        if args.all_events: result = scan_events(args.dg_key, tours=tuple(t.strip() for t in args.tours.split(",") if t.strip()), **kwargs)
+        else: result = scan(args.dg_key, **kwargs)
+    except Exception as e:
+        print(f"edgefinder: Data Golf error: {e}", file=sys.stderr)
+        return 1
+    edges = filter_edges(result["edges"], args.min_edge, args.side, args.market, args.sort)
+    if args.metrics:
+        from .metrics import METRICS
+        with open(args.metrics, "w") as f: f.write(METRICS.prometheus())
+    if args.output:
+        with open(args.output, "w", newline="") as f: write_result(result, edges, args.format, f)
+    else:
+        write_result(result, edges, args.format, sys.stdout)
+    return 0
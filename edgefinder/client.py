@@ -0,0 +1,120 @@
+"""One HTTP layer for Data Golf and Kalshi: per-host token buckets, jittered retries, conditional GETs.
+
+Every request first takes a token from its host's bucket, so bursts from parallel scans queue
+locally instead of earning 429s. 429 and 5xx responses (and dropped connections) are retried
+with full-jitter exponential backoff, honouring Retry-After, but never past the caller's
+deadline. Responses carrying an ETag or Last-Modified are remembered and revalidated, so an
+unchanged payload costs a 304 and no body. Anything that still fails is raised, never swallowed.
+"""
+
+import time
+import random
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+from .config import HTTP_BACKOFF, HTTP_RETRIES, RATE_LIMITS, REQUEST_TIMEOUT
+from .metrics import count, timer
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+VALIDATOR_SLOTS = 256
+
+
+class HttpError(Exception):
+    def __init__(self, status, url, attempts=1):
+        super().__init__(f"HTTP {status} from {url} after {attempts} attempt{'s' if attempts != 1 else ''}")
+        self.status, self.url, self.attempts = status, url, attempts
+
+class PartialResult(Exception):
+    """Raised by a paginated fetch that had to stop early; value holds everything fetched before it did."""
+    def __init__(self, value, reason):
+        super().__init__(reason)
+        self.value, self.reason = value, reason
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate, self.burst = rate, burst
+        self.tokens, self.stamp = float(burst), time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self, deadline=None):
+        """Reserve one token, sleeping until it is ours; TimeoutError if that would pass the deadline."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp = now
+            wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            if deadline is not None and now + wait > deadline: raise TimeoutError("rate limit wait exceeds the scan deadline")
+            self.tokens -= 1
+        if wait: time.sleep(wait)
+        return wait
+
+
+class HttpClient:
+    def __init__(self, session, limits=RATE_LIMITS, retries=HTTP_RETRIES, backoff=HTTP_BACKOFF):
+        self.session, self.retries, self.backoff = session, retries, backoff
+        self.buckets = {host: TokenBucket(*limit) for host, limit in limits.items()}
+        self.validators = OrderedDict()  # request key -> (ETag, Last-Modified, parsed body)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "not_modified": 0, "throttled_s": 0.0}
+
+    def timeout(self, deadline):
+        # Never let a single round trip outlive the scan deadline
+        if deadline is None: return REQUEST_TIMEOUT
+        return max(0.5, min(REQUEST_TIMEOUT, deadline - time.monotonic()))
+
+    def get_json(self, url, params=None, deadline=None, parse=None):
+        """Parsed JSON body of a GET, from the 304-revalidated copy when the server says it is unchanged.
+
+        parse, if given, transforms the body before it is returned or remembered for revalidation.
+        """
+        import requests
+        key = (url, tuple(sorted((params or {}).items())))
+        host = urlsplit(url).hostname
+        bucket = self.buckets.get(host)
+        for attempt in range(self.retries + 1):
+            with self.lock: cached = self.validators.get(key)
+            headers = {"Accept-Encoding": "gzip, deflate"}
+            if cached and cached[0]: headers["If-None-Match"] = cached[0]
+            if cached and cached[1]: headers["If-Modified-Since"] = cached[1]
+            if bucket:
+                waited = bucket.take(deadline)
+                self._count("throttled_s", waited); count("http_throttled_seconds", waited, host=host)
+            self._count("requests")
+            try:
+                with timer("http", host=host):
+                    r = self.session.get(url, params=params, headers=headers, timeout=self.timeout(deadline))
+            except (requests.ConnectionError, requests.Timeout) as e:
+                count("http_requests", host=host, status=type(e).__name__)
+                if not self._backoff(attempt, None, deadline, host): raise
+                continue
+            count("http_requests", host=host, status=r.status_code)
+            if r.status_code == 304 and cached:
+                self._count("not_modified")
+                return cached[2]
+            if r.status_code == 200:
+                body = r.json() if parse is None else parse(r.json())
+                etag, modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+                if etag or modified:
+                    with self.lock:
+                        self.validators[key] = (etag, modified, body); self.validators.move_to_end(key)
+                        while len(self.validators) > VALIDATOR_SLOTS: self.validators.popitem(last=False)
+                return body
+            if r.status_code not in RETRY_STATUS or not self._backoff(attempt, r.headers.get("Retry-After"), deadline, host):
+                raise HttpError(r.status_code, url, attempt + 1)
+
+    def _backoff(self, attempt, retry_after, deadline, host=None):
+        # Full jitter; Retry-After (seconds) is a floor. False means give up: out of attempts or out of time
+        if attempt >= self.retries: return False
+        base, cap = self.backoff
+        delay = random.uniform(0, min(cap, base * 2 ** attempt))
+        try: delay = max(delay, float(retry_after)) if retry_after else delay
+        except ValueError: pass
+        if deadline is not None and time.monotonic() + delay >= deadline: return False
+        self._count("retries"); count("http_retries", host=host)
+        time.sleep(delay)
+        return True
+
+    def _count(self, stat, n=1):
+        with self.lock: self.stats[stat] += n
@@ -0,0 +1,84 @@
+"""Endpoints, market definitions and tuning knobs shared by the dashboard and headless scans."""
+
+import os
+
+KALSHI_BASE = "https://api.elections.kalshi.com/trade-api/v2"
+KALSHI_WS_URL = os.environ.get("KALSHI_WS_URL", "wss://api.elections.kalshi.com/trade-api/ws/v2")
+DG_BASE = "https://feeds.datagolf.com"
+
+KALSHI_SERIES = {"win": "KXPGATOUR", "top_5": "KXPGATOP5", "top_10": "KXPGATOP10", "top_20": "KXPGATOP20", "make_cut": "KXPGAMAKECUT"}
+KNOWN_EVENTS = {
+    "ATPBP": "Pebble Beach", "MAST": "Masters", "PGAC": "PGA Championship",
+    "USOP": "US Open", "OPEN": "The Open", "PLAY": "Players",
+    "GENE": "Genesis", "GENI": "Genesis", "GNES": "Genesis", "GNIN": "Genesis", "GNINV": "Genesis",
+    "PHOE": "WM Phoenix", "FARM": "Farmers", "MEMO": "Memorial", "TRAV": "Travelers",
+    "SENT": "Sentry", "SONY": "Sony Open", "WELL": "Wells Fargo", "RBC": "RBC Heritage",
+    "AMEX": "AmEx", "AMER": "AmEx", "ARNO": "Arnold Palmer", "HOND": "Honda",
+    "VALE": "Valero", "BYRO": "Byron Nelson", "CHAR": "Charles Schwab",
+    "JOHN": "John Deere", "ROCK": "Rocket Mortgage", "SCOT": "Scottish Open",
+    "WYNDH": "Wyndham", "ZURC": "Zurich", "CIGN": "Cigna", "RSM": "RSM Classic",
+    "HERO": "Hero", "TOUR": "Tour Championship", "FEDEX": "FedEx",
+}
+MARKET_LABELS = {"win": "Win", "top_5": "Top 5", "top_10": "Top 10", "top_20": "Top 20", "make_cut": "Make Cut"}
+DG_FIELDS = {"win": "win", "top_5": "top_5", "top_10": "top_10", "top_20": "top_20", "make_cut": "make_cut"}
+# The Kalshi market fields anything reads (scans, streaming, depth, settlements); pages are cut down to these on arrival
+KALSHI_MARKET_FIELDS = ("ticker", "event_ticker", "yes_sub_title", "yes_ask", "no_ask", "result", "close_time", "expiration_time")
+
+# Fetch stage: one keep-alive pool shared by every session, capped in-flight requests, hard per-scan deadline
+HTTP_POOL_SIZE = 10
+MAX_IN_FLIGHT = 7
+SCAN_DEADLINE = 25
+REQUEST_TIMEOUT = 15
+
+# Multi-event scans: DG tours fetched side by side, and how many Kalshi events are priced at once
+DG_TOURS = ("pga", "euro", "kft", "opp", "alt")
+EVENT_WORKERS = 4
+
+# Depth pricing: order books are fetched only for the best top-of-book edges, a few at a time
+DEPTH_STAKE = 50.0        # dollars per position the fill price is computed for
+DEPTH_MIN_EDGE = 3.0      # top-of-book edge (points) a market needs before its book is fetched
+DEPTH_MAX_BOOKS = 40
+DEPTH_WORKERS = 4
+DEPTH_DEADLINE = 8
+ORDERBOOK_DEPTH = 20      # price levels per side
+
+# HTTP client: per-host token buckets (requests/second, burst) and retry policy for 429/5xx
+RATE_LIMITS = {"feeds.datagolf.com": (0.75, 5), "api.elections.kalshi.com": (15.0, 20)}
+HTTP_RETRIES = 4
+HTTP_BACKOFF = (0.25, 4.0)  # (base, cap) seconds for full-jitter exponential backoff
+
+# Background refresh (dashboard): seconds between scans while DG is live, while the current event's markets are up, and otherwise
+REFRESH_CADENCE = {"live": 30, "event": 120, "idle": 900}
+
+# Edge alerts: rules file ('' = off), points an edge must fall below a rule's threshold before it can fire again,
+# and the minimum seconds between two alerts of one rule on one quote
+ALERT_RULES_PATH = os.environ.get("EDGEFINDER_ALERTS", "")
+ALERT_HYSTERESIS = 1.0
+ALERT_COOLDOWN = 900
+
+# Edge feed: read-only HTTP API of the latest edges on :FEED_PORT/edges (0 = off); smaller bodies are never gzipped
+FEED_PORT = int(os.environ.get("EDGEFINDER_FEED_PORT", "0"))
+FEED_GZIP_MIN_BYTES = 1024
+
+# Diagnostics: Prometheus text on :METRICS_PORT/metrics (0 = off), one cProfile dump per scan into PROFILE_DIR ('' = off)
+METRICS_PORT = int(os.environ.get("EDGEFINDER_METRICS_PORT", "0"))
+PROFILE_DIR = os.environ.get("EDGEFINDER_PROFILE", "")
+
+# Player crosswalk: Kalshi yes_sub_title -> DG dg_id, persisted per event
+CROSSWALK_PATH = os.environ.get("EDGEFINDER_CROSSWALK", os.path.join(".cache", "crosswalk.json"))
+FUZZY_MIN_SCORE = 0.72
+FUZZY_MIN_MARGIN = 0.08
+# Events whose DG field and unresolved titles stay in memory; an older event is rebuilt by its next scan
+CROSSWALK_EVENTS = 16
+
+# Shared response cache (SQLite): (fresh seconds, extra seconds stale data may be served while one refresh runs)
+RESPONSE_CACHE_PATH = os.environ.get("EDGEFINDER_CACHE", os.path.join(".cache", "responses.sqlite"))
+CACHE_TTLS = {"dg_pretournament": (300, 900), "dg_live": (60, 240), "kalshi_markets": (30, 90), "kalshi_orderbook": (10, 20)}
+CACHE_LEASE = 30
+
+# Event registry: Kalshi events (and their DG schedule entries) on disk, re-read from the API at most this often
+EVENT_REGISTRY_PATH = os.environ.get("EDGEFINDER_EVENTS", os.path.join(".cache", "events.json"))
+EVENT_REGISTRY_TTL = 3 * 3600
+
+# Scan history: append-only columnar files, memory-mapped for reads
+HISTORY_DIR = os.environ.get("EDGEFINDER_HISTORY", os.path.join(".cache", "history"))
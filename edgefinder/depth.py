@@ -0,0 +1,97 @@
+"""Depth-aware fill pricing for the edges worth a closer look.
+
+Top-of-book asks say nothing about size, and fetching every order book would multiply the scan's
+request count by the size of the field. So pricing runs in two phases: a prefilter on the
+snapshot picks the (ticker, side) quotes whose top-of-book edge clears DEPTH_MIN_EDGE, best
+first, capped at DEPTH_MAX_BOOKS tickers; only those books are fetched, DEPTH_WORKERS at a time
+through the shared HttpClient (and, given a ResponseCache, a short-TTL cache). Each book is then
+walked for a target stake: the size-weighted fill price, the edge at that price, and how many
+contracts can be bought before the next one stops being profitable.
+
+Kalshi books list bids only: buying YES means lifting NO bids at 100 - price, and vice versa.
+"""
+
+import time
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from .api import get_http_client
+from .config import (CACHE_TTLS, DEPTH_DEADLINE, DEPTH_MAX_BOOKS, DEPTH_MIN_EDGE, DEPTH_STAKE, DEPTH_WORKERS, KALSHI_BASE,
+                     ORDERBOOK_DEPTH)
+from .metrics import count, timer
+
+DEPTH_COLUMNS = ["fill", "fill_edge", "filled", "max_size", "max_ev"]
+
+
+def fetch_orderbook(ticker, deadline=None, depth=ORDERBOOK_DEPTH):
+    data = get_http_client().get_json(f"{KALSHI_BASE}/markets/{ticker}/orderbook", {"depth": depth}, deadline)
+    count("orderbooks")
+    return data.get("orderbook") or {}
+
+def cached_orderbook(cache):
+    """fetch(ticker, deadline) for price_depth that goes through a shared ResponseCache."""
+    return lambda ticker, deadline: cache.get(f"kalshi:orderbook:{ticker}", partial(fetch_orderbook, ticker),
+                                              *CACHE_TTLS["kalshi_orderbook"], deadline=deadline)
+
+def ask_ladder(book, side):
+    """[(ask cents, contracts)] cheapest first for buying `side` ("YES"/"NO") out of a Kalshi orderbook."""
+    bids = book.get("no" if side == "YES" else "yes") or []
+    return sorted((100 - price, qty) for price, qty in bids if 0 < price < 100 and qty > 0)
+
+def walk_book(ladder, prob, stake=DEPTH_STAKE):
+    """Fill of a `stake`-dollar buy against an ask ladder, valued at `prob` (percent = fair cents).
+
+    fill is the size-weighted average price of the contracts the stake buys; max_size counts the
+    contracts priced below prob, and max_ev is their expected profit in dollars.
+    """
+    budget, filled, cost = stake * 100, 0, 0
+    for price, qty in ladder:
+        n = min(qty, int(budget // price))
+        filled, cost, budget = filled + n, cost + n * price, budget - n * price
+        if n < qty: break
+    fill = cost / filled if filled else None
+    profitable = [(price, qty) for price, qty in ladder if price < prob]
+    return {"fill": fill, "fill_edge": prob - fill if fill is not None else None, "filled": filled,
+            "max_size": sum(qty for _, qty in profitable), "max_ev": sum((prob - price) * qty for price, qty in profitable) / 100}
+
+def depth_candidates(snapshot, min_edge=DEPTH_MIN_EDGE, limit=DEPTH_MAX_BOOKS):
+    """{ticker: [(side, dg_prob)]} for the best top-of-book edges of a rescan_edges snapshot, at most `limit` tickers."""
+    ranked = sorted(((e["edge"], k, e["side"], e["dg_prob"]) for k, rows in snapshot["rows"].items() for e in rows
+                     if e["edge"] >= min_edge and ":" not in k), key=lambda c: c[0], reverse=True)
+    picked = {}
+    for _, k, side, prob in ranked:
+        if k not in picked and len(picked) >= limit: continue
+        picked.setdefault(k, []).append((side, prob))
+    return picked
+
+def price_depth(snapshot, stake=DEPTH_STAKE, min_edge=DEPTH_MIN_EDGE, limit=DEPTH_MAX_BOOKS, deadline_s=DEPTH_DEADLINE,
+                fetch=None, workers=DEPTH_WORKERS):
+    """{"fills": {(ticker, side): walk_book result}, "books": fetched, "errors": {ticker: reason}}.
+
+    fetch(ticker, deadline) defaults to fetch_orderbook; books still outstanding at the deadline are
+    reported as errors and their quotes keep top-of-book pricing only.
+    """
+    fetch = fetch or fetch_orderbook
+    picked = depth_candidates(snapshot, min_edge, limit)
+    out = {"fills": {}, "books": 0, "errors": {}}
+    if not picked: return out
+    deadline = time.monotonic() + deadline_s
+    with timer("depth"):
+        pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="depth")
+        futures = {pool.submit(fetch, ticker, deadline): ticker for ticker in picked}
+        done, _ = wait(futures, timeout=deadline_s)
+        pool.shutdown(wait=False, cancel_futures=True)
+        for fut, ticker in futures.items():
+            err = fut.exception() if fut in done else TimeoutError(f"no order book within {deadline_s}s")
+            if err is not None:
+                out["errors"][ticker] = str(err); continue
+            out["books"] += 1
+            book = fut.result()
+            for side, prob in picked[ticker]: out["fills"][(ticker, side)] = walk_book(ask_ladder(book, side), prob, stake)
+    return out
+
+def apply_fills(snapshot, fills):
+    """The snapshot's edges in scan order as new dicts carrying DEPTH_COLUMNS (None where no book was priced)."""
+    empty = dict.fromkeys(DEPTH_COLUMNS)
+    market = {id(e): k for k, rows in snapshot["rows"].items() for e in rows}
+    return [{**e, **fills.get((market[id(e)], e["side"]), empty)} for e in snapshot["edges"]]
@@ -0,0 +1,288 @@
+"""Columnar edge engine, delta rescans and the dashboard's filter/sort pass and edge store.
+
+numpy and pandas are imported inside the engine so importing this module stays cheap.
+"""
+
+import sys
+from bisect import bisect_right
+from itertools import accumulate
+from operator import attrgetter, itemgetter
+
+from .config import DG_FIELDS, MARKET_LABELS
+from .events import identify_current_event_code, pick_event_code
+from .metrics import gauge, timer
+from .names import PlayerCrosswalk, format_player_name, player_key
+from .registry import get_event_registry, short_label
+
+
+EDGE_COLUMNS = ["player", "market", "side", "event", "dg_prob", "dg_yes", "dg_no", "cost", "edge", "profit", "rr"]
+_GET = {c: attrgetter(c) for c in EDGE_COLUMNS}
+_KEYS = dict.fromkeys(EDGE_COLUMNS).keys()
+
+class Edge:
+    """One edge row, read like the dict it replaces: e["edge"], e.get(), keys(), {**e}, dict(e).
+
+    Slots instead of a per-row dict, interned strings, and dg_prob / dg_no / profit derived from
+    the stored fields. Rows are shared by every snapshot and session holding them: never modified.
+    """
+    __slots__ = ("player", "market", "side", "event", "dg_yes", "cost", "edge", "rr")
+
+    def __init__(self, player, market, side, event, dg_yes, cost, edge, rr):
+        self.player, self.market, self.side, self.event, self.dg_yes, self.cost, self.edge, self.rr = player, market, side, event, dg_yes, cost, edge, rr
+
+    dg_no = property(lambda self: 100 - self.dg_yes)
+    dg_prob = property(lambda self: self.dg_yes if self.side == "YES" else 100 - self.dg_yes)
+    profit = property(lambda self: 100 - self.cost)
+
+    def __getitem__(self, key): return _GET[key](self)
+    def get(self, key, default=None): return _GET[key](self) if key in _GET else default
+    def keys(self): return _KEYS
+    def items(self): return [(c, _GET[c](self)) for c in EDGE_COLUMNS]
+    def __iter__(self): return iter(EDGE_COLUMNS)
+    def __len__(self): return len(EDGE_COLUMNS)
+    def __contains__(self, key): return key in _GET
+    def __eq__(self, other):
+        if isinstance(other, Edge): return _ROW(self) == _ROW(other)
+        return dict(self.items()) == other if isinstance(other, dict) else NotImplemented
+    __hash__ = None
+    def __repr__(self): return f"Edge({dict(self)!r})"
+
+_ROW = attrgetter(*Edge.__slots__)
+
+def build_market_frame(kalshi_by_type):
+    import pandas as pd
+    cols = {"m_type": [], "event_ticker": [], "yes_sub_title": [], "yes_ask": [], "no_ask": []}
+    for m_type, markets in kalshi_by_type.items():
+        cols["m_type"] += [m_type] * len(markets)
+        cols["event_ticker"] += [m.get("event_ticker", "") for m in markets]
+        cols["yes_sub_title"] += [m.get("yes_sub_title", "") for m in markets]
+        cols["yes_ask"] += [m.get("yes_ask") for m in markets]
+        cols["no_ask"] += [m.get("no_ask") for m in markets]
+    return pd.DataFrame({k: pd.Series(v, dtype=object) for k, v in cols.items()})
+
+def calculate_all_edges(dg_data, kalshi_by_type, crosswalk=None):
+    result = run_edge_engine(dg_data, kalshi_by_type, crosswalk)
+    return result["edges"], int(result["matched"].sum()), result["field_size"], int(result["skipped"].sum())
+
+def run_edge_engine(dg_data, kalshi_by_type, crosswalk=None, event_code=None):
+    """Edge rows plus per-market bookkeeping (flattened scan order) for calculate_all_edges and delta rescans.
+
+    event_code pins the current event instead of detecting it from the slate, so a subset of
+    markets is scored exactly as it would be inside the full scan.
+    """
+    import numpy as np
+    import pandas as pd
+    players = dg_data.get("players", [])
+    dg_event_name = dg_data.get("event_name", "Unknown")
+    fallback_label = short_label(dg_event_name)
+
+    mk = build_market_frame(kalshi_by_type)
+    result = {"edges": [], "edge_market": np.zeros(0, dtype=int), "market_player": np.full(len(mk), None, dtype=object),
+              "matched": np.zeros(len(mk), dtype=bool), "skipped": np.zeros(len(mk), dtype=bool),
+              "event_code": event_code, "field_size": len(players), "match_event": event_code or dg_event_name}
+    if mk.empty: return result
+
+    # Event metadata is one registry lookup per distinct event ticker, broadcast back through factor codes
+    registry = get_event_registry()
+    et_codes, et_uniques = pd.factorize(mk["event_ticker"].fillna(""))
+    et_info = [registry.lookup(str(t)) for t in et_uniques]
+    et_event_code = np.array([i["code"] for i in et_info], dtype=object)
+    market_code = et_event_code[et_codes]
+
+    # Current event: the registry's DG match, else first-seen code order and per-code counts as in identify_current_event_code
+    et_counts = np.bincount(et_codes, minlength=len(et_uniques))
+    event_code_counts, event_code_to_label = {}, {}
+    for info, n in zip(et_info, et_counts):
+        if not info["code"]: continue
+        event_code_counts[info["code"]] = event_code_counts.get(info["code"], 0) + int(n)
+        event_code_to_label.setdefault(info["code"], info["label"] or "Unknown")
+    current_event_code = event_code or registry.current_code(dg_event_name, event_code_counts) \
+        or pick_event_code(event_code_counts, event_code_to_label, dg_data.get("event_name", ""))
+    other_event = (market_code != "") & (market_code != current_event_code) if current_event_code else np.zeros(len(mk), dtype=bool)
+    result.update(event_code=current_event_code, skipped=other_event)
+
+    # Titles resolve through the persistent crosswalk: one hash lookup each once the event is known
+    with timer("match"):
+        crosswalk = crosswalk or PlayerCrosswalk()
+        event_key = result["match_event"] = current_event_code or dg_event_name
+        crosswalk.sync_field(event_key, players)
+        id_to_idx = {player_key(p): i for i, p in enumerate(players)}
+        nm_codes, nm_uniques = pd.factorize(mk["yes_sub_title"].fillna(""))
+        nm_idx = np.array([id_to_idx.get(crosswalk.resolve(event_key, str(t)), np.nan) for t in nm_uniques], dtype=float)
+        dg_idx = nm_idx[nm_codes]
+        crosswalk.save()
+
+    with timer("price"):
+        keep = ~other_event & ~np.isnan(dg_idx)
+        keys = np.array([player_key(p) for p in players] + [None], dtype=object)
+        result.update(matched=keep.copy(), market_player=keys[np.where(keep, np.nan_to_num(dg_idx, nan=-1), -1).astype(int)])
+        m_types = list(kalshi_by_type)
+        type_idx = mk["m_type"].map({t: i for i, t in enumerate(m_types)}).to_numpy(dtype=int)
+        probs = np.array([[p.get(DG_FIELDS.get(t)) for t in m_types] for p in players], dtype=float).reshape(len(players), len(m_types))
+        dg_prob = np.full(len(mk), np.nan)
+        dg_prob[keep] = probs[dg_idx[keep].astype(int), type_idx[keep]]
+        keep &= ~np.isnan(dg_prob)
+        if not keep.any(): return result
+
+        pos = np.flatnonzero(keep)
+        dg_yes = np.where(dg_prob[pos] <= 1, dg_prob[pos] * 100, dg_prob[pos])
+        dg_no = 100 - dg_yes
+        # Interned: a player's name, market and event are one string object in every row and snapshot that holds them
+        display = np.array([sys.intern(format_player_name(p.get("player_name", ""))) for p in players], dtype=object)[dg_idx[pos].astype(int)]
+        market = np.array([MARKET_LABELS.get(t) for t in m_types], dtype=object)[type_idx[pos]]
+        event = np.array([sys.intern(i["label"] or fallback_label) for i in et_info], dtype=object)[et_codes[pos]]
+
+        cols = {c: [] for c in Edge.__slots__}
+        order, at = [], []
+        for side_order, (side, ask_col, prob, upper) in enumerate([("YES", "yes_ask", dg_yes, None), ("NO", "no_ask", dg_no, 100)]):
+            raw_ask = mk[ask_col].to_numpy(dtype=object)[pos]
+            ask = pd.to_numeric(pd.Series(raw_ask, dtype=object), errors="coerce").to_numpy(dtype=float)
+            ok = ask > 0 if upper is None else (ask > 0) & (ask < upper)
+            # cost/profit keep the ask's own scalar type (int cents stay ints), exactly as the dict loop emitted them
+            cost = raw_ask[ok]
+            for c, v in [("player", display[ok]), ("market", market[ok]), ("side", np.full(ok.sum(), side, dtype=object)),
+                         ("event", event[ok]), ("dg_yes", dg_yes[ok]), ("cost", cost), ("edge", prob[ok] - ask[ok]), ("rr", (100 - ask[ok]) / ask[ok])]:
+                cols[c].append(v)
+            order.append(np.flatnonzero(ok) * 2 + side_order)
+            at.append(pos[ok])
+        # Interleave YES/NO per market in scan order, as the dict loop appended them
+        sort = np.argsort(np.concatenate(order), kind="stable")
+        columns = [np.concatenate(cols[c])[sort].tolist() for c in Edge.__slots__]
+        result.update(edges=[Edge(*row) for row in zip(*columns)], edge_market=np.concatenate(at)[sort])
+    return result
+
+def market_key(m_type, m):
+    return m.get("ticker") or f"{m_type}:{m.get('event_ticker', '')}:{m.get('yes_sub_title', '')}"
+
+@timer("rescan")
+def rescan_edges(prev, dg_data, kalshi_by_type, crosswalk=None):
+    """Recompute only the markets whose quotes (or DG player) changed since prev; returns (snapshot, delta).
+
+    The snapshot's edge list is identical to calculate_all_edges on the same payloads. A full
+    recompute happens on the first scan, a new DG event, a confirmed crosswalk alias, or a market set
+    that moves the current event.
+    """
+    crosswalk = crosswalk or PlayerCrosswalk()
+    players = dg_data.get("players", [])
+    markets, order = {}, []
+    for m_type, ms in kalshi_by_type.items():
+        for m in ms:
+            k = market_key(m_type, m)
+            markets[k] = (m_type, m, (m_type, m.get("event_ticker", ""), m.get("yes_sub_title", ""), m.get("yes_ask"), m.get("no_ask")))
+            order.append(k)
+    fields = list(DG_FIELDS.values())
+    player_fp = {player_key(p): (p.get("player_name"),) + tuple(p.get(f) for f in fields) for p in players}
+
+    # A confirmed alias can move any title to another player, so it starts the delta over
+    full = prev is None or prev["event_name"] != dg_data.get("event_name", "Unknown") or prev.get("crosswalk_version") != crosswalk.version
+    event_code = None if full else prev["event_code"]
+    if not full and markets.keys() != prev["markets"].keys():
+        event_code = identify_current_event_code(kalshi_by_type, dg_data.get("event_name", ""))
+        full = event_code != prev["event_code"]
+
+    if full:
+        affected, rows, matched, skipped, market_player = order, {}, set(), set(), {}
+    else:
+        changed_players = {i for i in player_fp.keys() | prev["players"].keys() if player_fp.get(i) != prev["players"].get(i)}
+        new_players = bool(player_fp.keys() - prev["players"].keys())
+        affected = [k for k in order if markets[k][2] != prev["markets"].get(k)
+                    or prev["market_player"].get(k) in changed_players
+                    or (new_players and prev["market_player"].get(k) is None)]
+        rows = {k: prev["rows"][k] for k in order if k in prev["rows"]}
+        matched, skipped = prev["matched"] & markets.keys(), prev["skipped"] & markets.keys()
+        market_player = {k: v for k, v in prev["market_player"].items() if k in markets}
+
+    sub = {}
+    for k in affected: sub.setdefault(markets[k][0], []).append(markets[k][1])
+    result = run_edge_engine(dg_data, sub, crosswalk, event_code)
+    fresh = {k: [] for k in affected}
+    for e, at in zip(result["edges"], result["edge_market"]): fresh[affected[at]].append(e)
+    for k, is_matched, is_skipped, pk in zip(affected, result["matched"], result["skipped"], result["market_player"]):
+        (matched.add if is_matched else matched.discard)(k)
+        (skipped.add if is_skipped else skipped.discard)(k)
+        market_player[k] = pk
+
+    delta = {"full": full, "recomputed": len(affected), "markets": len(order), "appeared": [], "disappeared": [], "moved": []}
+    if not full:
+        for k in list(affected) + [k for k in prev["rows"] if k not in markets]:
+            old = {e["side"]: e for e in prev["rows"].get(k, [])}
+            new = {e["side"]: e for e in fresh.get(k, [])}
+            for side in old.keys() | new.keys():
+                if side not in old: delta["appeared"].append((k, new[side]))
+                elif side not in new: delta["disappeared"].append((k, old[side]))
+                elif old[side] != new[side]: delta["moved"].append((k, old[side], new[side]))
+    rows.update(fresh)
+
+    # The crosswalk event titles were matched under, passed on explicitly since parallel scans share one crosswalk
+    match_event = result["match_event"] if full or affected else prev["match_event"]
+    changed = full or any(delta[c] for c in ("appeared", "disappeared", "moved")) \
+        or (len(matched), len(skipped), len(players)) != (len(prev["matched"]), len(prev["skipped"]), prev["field_size"])
+    snapshot = {
+        "event_name": dg_data.get("event_name", "Unknown"), "event_code": result["event_code"] if full else event_code,
+        "markets": {k: v[2] for k, v in markets.items()}, "players": player_fp, "market_player": market_player,
+        "rows": rows, "matched": matched, "skipped": skipped, "field_size": len(players), "match_event": match_event, "crosswalk_version": crosswalk.version,
+        "edges": [e for k in order for e in rows.get(k, ())],
+        "version": (0 if prev is None else prev["version"] + 1) if changed else prev["version"],
+    }
+    gauge("markets", len(order)); gauge("matched_markets", len(matched)); gauge("edges", len(snapshot["edges"]))
+    gauge("unmatched_names", len(crosswalk.misses(match_event)), event=match_event)
+    return snapshot, delta
+
+def field(edges, *names):
+    """Getter for columns of an edge list: attribute access for Edge rows (as fast as a dict lookup), item access for dicts."""
+    return attrgetter(*names) if edges and isinstance(edges[0], Edge) else itemgetter(*names)
+
+SORT_KEYS = {"Edge": "edge", "R/R": "rr", "Profit": "profit"}
+
+def filter_edges(edges, min_edge, side="All", market="All", sort_by="Edge"):
+    edge, side_of, market_of = field(edges, "edge"), field(edges, "side"), field(edges, "market")
+    filtered = [e for e in edges if edge(e) >= min_edge]
+    if side != "All": filtered = [e for e in filtered if side_of(e) == side]
+    if market != "All": filtered = [e for e in filtered if market_of(e) == market]
+    filtered.sort(key=field(edges, SORT_KEYS[sort_by]), reverse=True)
+    return filtered
+
+class EdgeStore:
+    """Edges of one scan, indexed once so filter/sort widget changes never rescan the full list.
+
+    Every (market, side) selection the dashboard offers, "All" included, keeps one order per sort key.
+    Ties break on scan position, so results match filter_edges exactly. In edge order a min_edge
+    threshold is a prefix found by bisect, and counts and sums come from prefix sums without touching rows.
+    """
+    def __init__(self, edges):
+        import numpy as np
+        self.edges, self._edge = edges, list(map(field(edges, "edge"), edges))
+        market, side = np.array(list(map(field(edges, "market"), edges)), dtype=object), np.array(list(map(field(edges, "side"), edges)), dtype=object)
+        markets, sides = {m: market == m for m in set(market.tolist())}, {s: side == s for s in set(side.tolist())}
+        masks = {("All", "All"): None, **{(m, "All"): mm for m, mm in markets.items()}, **{("All", s): sm for s, sm in sides.items()},
+                 **{(m, s): mm & sm for m, mm in markets.items() for s, sm in sides.items()}}
+        self.parts = {part: {} for part in masks}
+        for col in SORT_KEYS.values():
+            vals = np.array(self._edge if col == "edge" else list(map(field(edges, col), edges)), dtype=float)
+            order = np.argsort(-vals, kind="stable")  # stable: ties stay in scan order, as in filter_edges
+            for part, mask in masks.items(): self.parts[part][col] = (order if mask is None else order[mask[order]]).tolist()
+        self._prefix = {}
+        for part, orders in self.parts.items():
+            ranked = list(map(self._edge.__getitem__, orders["edge"]))
+            self._prefix[part] = ([-v for v in ranked], list(accumulate(ranked, initial=0)))
+
+    def count(self, min_edge, side="All", market="All"):
+        """(count, edge sum) of edges at or above min_edge in one selection."""
+        neg_edge, sums = self._prefix.get((market, side), ((), (0,)))
+        n = bisect_right(neg_edge, -min_edge)
+        return n, sums[n]
+
+    def stats(self, min_edge, side="All", market="All"):
+        """(yes_count, no_count, avg_edge) of the edges filter_edges would return."""
+        (yes, yes_sum), (no, no_sum) = (self.count(min_edge, s, market) if side in ("All", s) else (0, 0) for s in ("YES", "NO"))
+        return yes, no, (yes_sum + no_sum) / (yes + no) if yes + no else 0
+
+    def query(self, min_edge, side="All", market="All", sort_by="Edge"):
+        """Same result as filter_edges(edges, min_edge, side, market, sort_by)."""
+        orders, col = self.parts.get((market, side)), SORT_KEYS[sort_by]
+        if not orders: return []
+        n, _ = self.count(min_edge, side, market)
+        if col == "edge": idx = orders["edge"][:n]
+        elif n == len(orders[col]): idx = orders[col]
+        else: idx = [i for i in orders[col] if self._edge[i] >= min_edge]
+        return [self.edges[i] for i in idx]
@@ -0,0 +1,72 @@
+"""Kalshi event lookups (through the event registry) and current-event detection."""
+
+from .registry import get_event_registry, name_words
+
+
+def get_event_code(market):
+    return get_event_registry().lookup(market.get("event_ticker", ""))["code"]
+
+def get_tournament_label(market, fallback="Unknown"):
+    return get_event_registry().lookup(market.get("event_ticker", ""))["label"] or fallback
+
+def identify_current_event_code(markets_by_type, dg_event_name):
+    # Counted per event ticker, so each distinct ticker is looked up once
+    ticker_counts = {}
+    for markets in markets_by_type.values():
+        for m in markets:
+            et = m.get("event_ticker", "")
+            ticker_counts[et] = ticker_counts.get(et, 0) + 1
+    registry = get_event_registry()
+    event_code_counts, event_code_to_label = {}, {}
+    for et, n in ticker_counts.items():
+        info = registry.lookup(et)
+        if not info["code"]: continue
+        event_code_counts[info["code"]] = event_code_counts.get(info["code"], 0) + n
+        event_code_to_label.setdefault(info["code"], info["label"] or "Unknown")
+    return registry.current_code(dg_event_name, event_code_counts) or pick_event_code(event_code_counts, event_code_to_label, dg_event_name)
+
+def pick_event_code(event_code_counts, event_code_to_label, dg_event_name):
+    if not event_code_counts: return None
+    code = named_event_code(event_code_to_label, dg_event_name)
+    if code: return code
+    major_codes = {c for c, l in event_code_to_label.items() if l in ["Masters", "PGA Championship", "US Open", "The Open"]}
+    non_major = {c: n for c, n in event_code_counts.items() if c not in major_codes}
+    return max(non_major, key=non_major.get) if non_major else max(event_code_counts, key=event_code_counts.get)
+
+def named_event_code(event_code_to_label, dg_event_name):
+    """First code whose tournament label shares a distinctive word (4+ letters, not a GENERIC_WORDS one) with the DG event name."""
+    dg_words = name_words(dg_event_name)
+    for code, label in event_code_to_label.items():
+        if name_words(label) & dg_words: return code
+    return None
+
+def partition_events(markets_by_type):
+    """{event_code: {m_type: [markets]}} in first-seen order; markets without an event code are left out."""
+    by_event = {}
+    for m_type, markets in markets_by_type.items():
+        for m in markets:
+            code = get_event_code(m)
+            if code: by_event.setdefault(code, {}).setdefault(m_type, []).append(m)
+    return by_event
+
+def assign_event_codes(dg_events, markets_by_event):
+    """{event_code: key} pairing each Kalshi event with the DG event ({key: event name}) that prices it.
+
+    Every DG event claims the code the event registry ties to its name, else the first free code
+    its name matches by label. Then the first DG event,
+    if still unpaired, falls back to pick_event_code's busiest non-major code, so the primary tour
+    resolves exactly as a single-event scan would. Codes nobody claims (futures on a later major,
+    a tour DG has no model for) are left out.
+    """
+    labels = {code: get_tournament_label(next(m for ms in by_type.values() for m in ms)) for code, by_type in markets_by_event.items()}
+    assigned, registry = {}, get_event_registry()
+    for key, name in dg_events.items():
+        free = {c: l for c, l in labels.items() if c not in assigned}
+        code = registry.current_code(name, free) or named_event_code(free, name)
+        if code: assigned[code] = key
+    first = next(iter(dg_events), None)
+    if first is not None and first not in assigned.values():
+        free = {c: sum(map(len, markets_by_event[c].values())) for c in labels if c not in assigned}
+        code = pick_event_code(free, {c: labels[c] for c in free}, dg_events[first])
+        if code: assigned[code] = first
+    return assigned
@@ -0,0 +1,127 @@
+"""Read-only HTTP feed of the latest published edge table, for execution bots and other pollers.
+
+    GET /edges?min_edge=5&side=YES&market=Top%2010&sort=Edge&format=json|csv|arrow
+
+Filters mirror the dashboard's widgets and are answered by the published EdgeStore. Each encoded
+table is built once per (publication, query) through Refresher.derive and shared by every
+consumer. Its ETag names the snapshot version and the query, so polling an unchanged table costs a
+304 and no body; gzip is served to clients that accept it. A scan with depth_stake adds DEPTH_COLUMNS. Arrow IPC (stream format) needs
+pyarrow, which Streamlit already depends on.
+"""
+
+import io
+import os
+import csv
+import gzip
+import json
+import math
+import hashlib
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+from .config import FEED_GZIP_MIN_BYTES, MARKET_LABELS
+from .edges import EDGE_COLUMNS, SORT_KEYS, field
+from .metrics import count, timer
+
+FORMATS = {"json": "application/json", "csv": "text/csv; charset=utf-8", "arrow": "application/vnd.apache.arrow.stream"}
+CHOICES = {"side": ("All", "YES", "NO"), "market": ("All", *MARKET_LABELS.values()), "sort": tuple(SORT_KEYS), "format": tuple(FORMATS)}
+# New on every process start, so snapshot versions counted by a restarted server never match an old ETag
+BOOT = os.urandom(4).hex()
+
+
+class BadQuery(ValueError):
+    pass
+
+def parse_query(query):
+    """(min_edge, side, market, sort_by, fmt) from a query string; BadQuery for anything the dashboard doesn't offer."""
+    q = {k: v[-1] for k, v in parse_qs(query).items()}
+    min_edge = float("-inf")
+    if "min_edge" in q:
+        # float() also takes nan/inf, which would silently answer with an empty or unfiltered table
+        try: min_edge = float(q["min_edge"])
+        except ValueError: min_edge = None
+        if min_edge is None or not math.isfinite(min_edge): raise BadQuery(f"min_edge must be a finite number, got {q['min_edge']!r}")
+    picked = {name: q.get(name, allowed[0]) for name, allowed in CHOICES.items()}
+    for name, value in picked.items():
+        if value not in CHOICES[name]: raise BadQuery(f"{name} must be one of {', '.join(CHOICES[name])}, got {value!r}")
+    return min_edge, picked["side"], picked["market"], picked["sort"], picked["format"]
+
+def etag(view, query):
+    snap = view["snapshot"]
+    # Order books are re-priced on every scan, so a table with fill columns can change while the snapshot version holds
+    published = view["published_at"] if "depth" in view else None
+    key = repr((BOOT, view["event_name"], view["source"], snap["event_code"], snap["version"], published, query))
+    # Weak: the gzip and identity bodies of one table share it
+    return 'W/"' + hashlib.sha1(key.encode()).hexdigest()[:20] + '"'
+
+def encode(view, min_edge, side, market, sort_by, fmt):
+    """Body bytes of one filtered table, plus its gzip when it is worth compressing."""
+    columns = EDGE_COLUMNS
+    if "depth" in view:
+        from .depth import DEPTH_COLUMNS
+        columns = EDGE_COLUMNS + DEPTH_COLUMNS
+    edges = view["store"].query(min_edge, side, market, sort_by)
+    rows = list(map(field(edges, *columns), edges))
+    meta = {"event_name": view["event_name"], "source": view["source"], "version": view["snapshot"]["version"],
+            "matched": view["matched"], "field_size": view["field_size"], "count": len(rows)}
+    with timer("feed", format=fmt):
+        if fmt == "json":
+            body = json.dumps({**meta, "edges": [dict(zip(columns, r)) for r in rows]}).encode()
+        elif fmt == "csv":
+            out = io.StringIO()
+            writer = csv.writer(out, lineterminator="\n")
+            writer.writerow(columns); writer.writerows(rows)
+            body = out.getvalue().encode()
+        else:
+            import pyarrow as pa
+            values = list(zip(*rows)) if rows else [()] * len(columns)
+            table = pa.table({c: list(v) for c, v in zip(columns, values)}, metadata={k: str(v) for k, v in meta.items()})
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer: writer.write_table(table)
+            body = sink.getvalue().to_pybytes()
+        gz = gzip.compress(body, 6) if len(body) >= FEED_GZIP_MIN_BYTES else None
+    return body, gz
+
+def feed_handler(refresher):
+    """Request handler class answering GET /edges from refresher.latest."""
+    from http.server import BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if url.path.rstrip("/") != "/edges":
+                return self.reply(404, b"not found\n")
+            view = refresher.latest
+            if view is None:
+                return self.reply(503, b"no scan published yet\n", {"Retry-After": "5"})
+            try: query = parse_query(url.query)
+            except BadQuery as e: return self.reply(400, f"{e}\n".encode())
+            fmt, accepts_gzip = query[-1], "gzip" in self.headers.get("Accept-Encoding", "")
+            tag = etag(view, query)
+            headers = {"ETag": tag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+            if {tag, "*"} & {t.strip() for t in self.headers.get("If-None-Match", "").split(",")}:
+                return self.reply(304, b"", headers, fmt)
+            try: body, gz = refresher.derive(view, ("feed", *query), lambda v: encode(v, *query))
+            except ImportError: return self.reply(501, b"arrow format needs pyarrow (pip install pyarrow)\n")
+            if gz is not None and accepts_gzip: body, headers["Content-Encoding"] = gz, "gzip"
+            self.reply(200, body, {**headers, "Content-Type": FORMATS[fmt]}, fmt)
+
+        def reply(self, status, body, headers=None, fmt=None):
+            count("feed_requests", status=status, format=fmt)
+            self.send_response(status)
+            if status >= 400: self.send_header("Content-Type", "text/plain; charset=utf-8")
+            for k, v in (headers or {}).items(): self.send_header(k, v)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body: self.wfile.write(body)
+
+        def log_message(self, *args): pass
+
+    return Handler
+
+def serve_feed(refresher, port, host="0.0.0.0"):
+    """Serve refresher.latest on http://host:port/edges from a daemon thread; returns the server."""
+    from http.server import ThreadingHTTPServer
+    server = ThreadingHTTPServer((host, port), feed_handler(refresher))
+    threading.Thread(target=server.serve_forever, name="feed", daemon=True).start()
+    return server
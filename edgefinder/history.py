@@ -0,0 +1,152 @@
+"""Append-only columnar history of every scan, memory-mapped for reads.
+
+One directory, one raw little-endian file per column plus strings.txt, the string dictionary
+(line n is code n). Rows are written in scan order, so the ts column is sorted and a time range
+is two binary searches; per-player and per-ticker filters are a vectorized compare on the
+int32 code column. Only quotes whose ask or DG probability moved since the previous append
+are written (a market that left the board gets a NaN row), so every series is a step function
+and an idle board costs nothing. Appends take an exclusive lock on the directory so several
+processes can share one history; a torn write is trimmed back to the last whole row (and
+strings.txt to its last whole line) before the next append.
+"""
+
+import os
+import threading
+
+from .config import HISTORY_DIR
+
+try:
+    import fcntl
+except ImportError:  # no cross-process lock on Windows; appends stay thread-safe
+    fcntl = None
+
+HISTORY_COLUMNS = {"ts": "<f8", "ticker": "<i4", "player": "<i4", "market": "<i4", "side": "u1", "dg_prob": "<f4", "ask": "<f4", "edge": "<f4"}
+STRING_COLUMNS = ("ticker", "player", "market")
+SIDES = ("YES", "NO")
+
+
+class SnapshotHistory:
+    def __init__(self, path=HISTORY_DIR):
+        self.path = path
+        self.lock = threading.Lock()
+        self.strings, self.codes = [], {}
+        self.last = {}  # (ticker, side) -> ((dg_prob, ask), player, market type) as last written by this process
+        self.maps = None
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _rows(self):
+        import numpy as np
+        sizes = [os.path.getsize(self._file(c)) // np.dtype(t).itemsize if os.path.exists(self._file(c)) else 0
+                 for c, t in HISTORY_COLUMNS.items()]
+        return min(sizes)
+
+    def _load_strings(self, trim=False):
+        # Other processes may have appended codes since we last looked; the file only ever grows.
+        # trim (only under the append lock) cuts a torn last line off on disk, so the next code starts on its own line
+        if not os.path.exists(self._file("strings.txt")): return
+        with open(self._file("strings.txt"), "r+b" if trim else "rb") as f:
+            data = f.read()
+            whole = data.rfind(b"\n") + 1
+            if trim and whole < len(data): f.truncate(whole)
+        lines = data[:whole].decode("utf-8").split("\n")[:-1]
+        for s in lines[len(self.strings):]:
+            self.codes[s] = len(self.strings); self.strings.append(s)
+
+    def _encode(self, values, new):
+        out = []
+        for v in values:
+            v = str(v).replace("\n", " ")
+            if v not in self.codes:
+                self.codes[v] = len(self.strings); self.strings.append(v); new.append(v)
+            out.append(self.codes[v])
+        return out
+
+    def append(self, snapshot, ts):
+        """Record one rescan_edges snapshot taken at ts (epoch seconds); returns the number of rows written."""
+        import numpy as np
+        # self.last is shared by every caller (sessions, the refresher, stream overlays): diff and write under one lock
+        with self.lock:
+            rows, seen = [], set()
+            for k, edges in snapshot["rows"].items():
+                m_type, player = snapshot["markets"].get(k, ("",))[0], snapshot["market_player"].get(k)
+                for e in edges:
+                    key, quote = (k, e["side"]), (float(e["dg_prob"]), float(e["cost"]))
+                    seen.add(key)
+                    if self.last.get(key, (None,))[0] != quote: rows.append((k, player, m_type, e["side"], *quote, float(e["edge"])))
+                    self.last[key] = (quote, player, m_type)
+            for key in [key for key in self.last if key not in seen]:
+                # Gone from the board (or no longer matched): close the series with a NaN quote
+                _, player, m_type = self.last.pop(key)
+                rows.append((key[0], player, m_type, key[1], np.nan, np.nan, np.nan))
+            if not rows: return 0
+
+            with open(self._file("append.lock"), "a") as lock:
+                if fcntl: fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    self._load_strings(trim=True)
+                    n = self._rows()
+                    new = []
+                    tickers, players, markets, sides, dg_prob, ask, edge = zip(*rows)
+                    cols = {
+                        "ts": np.full(len(rows), max(ts, self._last_ts(n))), "ticker": self._encode(tickers, new),
+                        "player": self._encode(["" if p is None else p for p in players], new), "market": self._encode(markets, new),
+                        "side": [SIDES.index(s) for s in sides], "dg_prob": dg_prob, "ask": ask, "edge": edge,
+                    }
+                    if new:
+                        with open(self._file("strings.txt"), "ab") as f: f.write("".join(s + "\n" for s in new).encode("utf-8"))
+                    for c, t in HISTORY_COLUMNS.items():
+                        with open(self._file(c), "r+b" if os.path.exists(self._file(c)) else "wb") as f:
+                            f.truncate(n * np.dtype(t).itemsize); f.seek(0, os.SEEK_END)
+                            f.write(np.asarray(cols[c], dtype=t).tobytes())
+                finally:
+                    if fcntl: fcntl.flock(lock, fcntl.LOCK_UN)
+        return len(rows)
+
+    def _last_ts(self, n):
+        # Keeps ts sorted even if a caller's clock steps backwards
+        import numpy as np
+        if not n: return float("-inf")
+        with open(self._file("ts"), "rb") as f:
+            f.seek((n - 1) * 8)
+            return float(np.frombuffer(f.read(8), dtype="<f8")[0])
+
+    def columns(self):
+        """Read-only memory maps of every column, refreshed when another append has grown the files."""
+        import numpy as np
+        n = self._rows()
+        if self.maps is None or len(self.maps["ts"]) != n:
+            if not n: return {c: np.zeros(0, dtype=t) for c, t in HISTORY_COLUMNS.items()}
+            self.maps = {c: np.memmap(self._file(c), dtype=t, mode="r", shape=(n,)) for c, t in HISTORY_COLUMNS.items()}
+            self._load_strings()
+        return self.maps
+
+    def query(self, start=None, end=None, player=None, ticker=None, market=None):
+        """Rows with start <= ts < end, optionally for one player key (dg_id or name), ticker or market type.
+
+        Returns a DataFrame in write order with ticker/player/market/side as categoricals.
+        """
+        import numpy as np
+        import pandas as pd
+        cols = self.columns()
+        ts = cols["ts"]
+        lo = 0 if start is None else int(np.searchsorted(ts, start, side="left"))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, end, side="left"))
+        idx = np.arange(lo, hi)
+        for c, v in (("player", player), ("ticker", ticker), ("market", market)):
+            if v is None: continue
+            code = self.codes.get(str(v))
+            if code is None: idx = idx[:0]; break
+            idx = idx[np.asarray(cols[c][lo:hi])[idx - lo] == code]
+        strings = pd.Index(self.strings, dtype=object)
+        out = {}
+        for c in HISTORY_COLUMNS:
+            v = np.asarray(cols[c][idx]) if len(idx) else np.zeros(0, dtype=HISTORY_COLUMNS[c])
+            if c in STRING_COLUMNS: v = pd.Categorical.from_codes(v, categories=strings) if len(strings) else pd.Categorical([])
+            elif c == "side": v = pd.Categorical.from_codes(v, categories=list(SIDES))
+            out[c] = v
+        frame = pd.DataFrame(out)
+        frame["ts"] = pd.to_datetime(frame["ts"], unit="s", utc=True)
+        return frame
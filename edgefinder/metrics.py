@@ -0,0 +1,127 @@
+"""Process-wide stage timers and counters, exported as JSON log lines and Prometheus text.
+
+timer() wraps a stage (fetch job, Kalshi page, matching, edge engine, render) and records a
+count/sum/max summary labelled by stage; count() and gauge() cover cache lookups, retries,
+unmatched names and rendered rows. Each finished stage is also logged as one JSON object on the
+"edgefinder" logger, so the same numbers can be grepped from logs or scraped from serve_metrics().
+profiled() runs one scan under cProfile when a profile directory is configured.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+from .config import PROFILE_DIR
+
+log = logging.getLogger("edgefinder")
+PREFIX = "edgefinder_"
+# Per-request stages log at DEBUG so a 20-page scan doesn't flood INFO
+DEBUG_STAGES = {"http", "kalshi_page"}
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters, self.gauges, self.timers = {}, {}, {}
+
+    def count(self, name, n=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock: self.counters[key] = self.counters.get(key, 0) + n
+
+    def gauge(self, name, value, **labels):
+        with self.lock: self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, stage, seconds, **labels):
+        key = tuple(sorted({"stage": stage, **labels}.items()))
+        with self.lock:
+            n, total, peak = self.timers.get(key, (0, 0.0, 0.0))
+            self.timers[key] = (n + 1, total + seconds, max(peak, seconds))
+
+    def snapshot(self):
+        with self.lock: return dict(self.counters), dict(self.gauges), dict(self.timers)
+
+    def reset(self):
+        with self.lock: self.counters.clear(); self.gauges.clear(); self.timers.clear()
+
+    def prometheus(self):
+        """Text exposition format (version 0.0.4)."""
+        counters, gauges, timers = self.snapshot()
+        lines = []
+        def emit(name, kind, samples):
+            lines.append(f"# TYPE {PREFIX}{name} {kind}")
+            lines.extend(f"{PREFIX}{metric}{_labels(labels)} {value:g}" for metric, labels, value in sorted(samples))
+        for kind, store, suffix in (("counter", counters, "_total"), ("gauge", gauges, "")):
+            for name in sorted({k[0] for k in store}):
+                emit(name + suffix, kind, [(name + suffix, labels, v) for (n, labels), v in store.items() if n == name])
+        if timers:
+            emit("stage_seconds", "summary", [(f"stage_seconds{s}", labels, v) for labels, (n, total, _) in timers.items()
+                                               for s, v in (("_count", n), ("_sum", total))])
+            emit("stage_seconds_max", "gauge", [("stage_seconds_max", labels, peak) for labels, (_, _, peak) in timers.items()])
+        return "\n".join(lines) + "\n"
+
+def _labels(labels):
+    if not labels: return ""
+    escape = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels) + "}"
+
+METRICS = Registry()
+
+def count(name, n=1, **labels): METRICS.count(name, n, **labels)
+def gauge(name, value, **labels): METRICS.gauge(name, value, **labels)
+
+@contextmanager
+def timer(stage, **labels):
+    start, ok = time.perf_counter(), False
+    try:
+        yield
+        ok = True
+    finally:
+        seconds = time.perf_counter() - start
+        METRICS.observe(stage, seconds, **labels)
+        log.log(logging.DEBUG if stage in DEBUG_STAGES else logging.INFO,
+                json.dumps({"event": "stage", "stage": stage, "seconds": round(seconds, 6), "ok": ok, **labels}, default=str))
+
+def log_event(event, **fields):
+    log.info(json.dumps({"event": event, **fields}, default=str))
+
+@contextmanager
+def profiled(directory=PROFILE_DIR, name="scan"):
+    """cProfile the body into directory/<name>-<epoch ms>.prof; a no-op when directory is empty.
+
+    Only the calling thread is profiled: time spent in the fetch pool shows up as the wait for it.
+    """
+    if not directory:
+        yield None
+        return
+    import cProfile
+    os.makedirs(directory, exist_ok=True)
+    prof = cProfile.Profile()
+    prof.enable()
+    try: yield prof
+    finally:
+        prof.disable()
+        path = os.path.join(directory, f"{name}-{int(time.time() * 1000)}.prof")
+        prof.dump_stats(path)
+        log_event("profile", path=path)
+
+def serve_metrics(port, host="0.0.0.0"):
+    """Serve METRICS on http://host:port/metrics from a daemon thread; returns the server."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404); return
+            body = METRICS.prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers(); self.wfile.write(body)
+        def log_message(self, *args): pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    return server
@@ -0,0 +1,199 @@
+"""Player name normalization and the persistent Kalshi-to-DG player crosswalk."""
+
+import os
+import re
+import json
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from .config import CROSSWALK_EVENTS, FUZZY_MIN_SCORE, FUZZY_MIN_MARGIN
+
+
+NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv"}
+
+def normalize_name(name):
+    if not name: return ""
+    name = name.strip()
+    if "," in name:
+        parts = name.split(",", 1); name = f"{parts[1].strip()} {parts[0].strip()}"
+    # Suffixes are dropped wherever they sit: "Højgaard, Rasmus Sr." puts "sr" before the surname
+    return " ".join(w for w in re.sub(r"[.\-']", "", name.lower()).split() if w not in NAME_SUFFIXES)
+
+def format_player_name(name):
+    if not name: return ""
+    if "," in name:
+        parts = name.split(",", 1); return f"{parts[1].strip()} {parts[0].strip()}"
+    return name
+
+def get_kalshi_player_name(market):
+    name = market.get("yes_sub_title", "")
+    if name and len(name.strip().split()) >= 2:
+        return re.sub(r"\s+(finish|wins?|top|make|miss).*$", "", name, flags=re.IGNORECASE).strip()
+    return None
+
+def fold_name(norm):
+    return "".join(c for c in unicodedata.normalize("NFKD", norm) if not unicodedata.combining(c))
+
+def name_grams(norm):
+    # Trigrams over accent-folded, sorted tokens so "aberg"/"åberg" and "im sungjae"/"sungjae im" share every gram
+    padded = f"  {' '.join(sorted(fold_name(norm).split()))} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+# Short given names -> the full names they stand for; a prefix alone ("tom"/"tommy") is not enough
+NICKNAMES = {
+    "matt": {"matthew"}, "tom": {"thomas"}, "tommy": {"thomas"}, "alex": {"alexander"}, "chris": {"christopher"},
+    "mike": {"michael"}, "nick": {"nicholas", "nicolai"}, "will": {"william"}, "bill": {"william"}, "billy": {"william"},
+    "ben": {"benjamin"}, "dan": {"daniel"}, "danny": {"daniel"}, "sam": {"samuel"}, "zach": {"zachary"},
+    "cam": {"cameron"}, "max": {"maximilian"}, "fred": {"frederick"}, "rob": {"robert"},
+    "bob": {"robert"}, "andy": {"andrew"}, "pat": {"patrick"}, "jon": {"jonathan"}, "joe": {"joseph"},
+}
+
+def givens_agree(a, b):
+    return a == b or (len(a) == 1 and b.startswith(a)) or (len(b) == 1 and a.startswith(b)) \
+        or b in NICKNAMES.get(a, ()) or a in NICKNAMES.get(b, ())
+
+def names_agree(a, b):
+    """Whether two normalized names can be one player: the same surname, and given names equal, an initial, or a listed nickname.
+
+    "matt fitzpatrick"/"matthew fitzpatrick" and "j thomas"/"justin thomas" agree; "tom hovland"/"tony hovland"
+    and "tom mcilroy"/"tommy mcilroy" do not. Two-word names may also come surname first ("im sungjae").
+    """
+    a, b = fold_name(a).split(), fold_name(b).split()
+    if len(a) < 2 or len(b) < 2: return False
+    for other in ((b, b[::-1]) if len(b) == 2 else (b,)):
+        if a[-1] == other[-1] and givens_agree("".join(a[:-1]), "".join(other[:-1])): return True
+    return False
+
+def name_key(norm):
+    # Accents and token order are not a spelling difference: "ludvig åberg", "aberg ludvig" and "ludvig aberg" share a key
+    return " ".join(sorted(fold_name(norm).split()))
+
+def player_key(p):
+    return p["dg_id"] if "dg_id" in p else normalize_name(p.get("player_name", ""))
+
+class PlayerCrosswalk:
+    """Kalshi title -> DG dg_id map, built once per event and extended as new titles or players show up.
+
+    Steady state is one dict lookup per title. Misses fall back to the exact name (up to accents and
+    word order), the confirmed alias table, then a trigram candidate index whose pick must agree on
+    surname and given name (names_agree) and clear the runner-up by a margin. Such a fuzzy pick is
+    applied but still listed in misses(event) for review until confirm() settles the name; anything
+    unresolved or ambiguous is listed there instead of being guessed. Remembered titles that are not
+    exact or confirmed are re-matched whenever the field grows, so a player with exactly a title's
+    name always wins it. version counts confirm() calls, so a delta rescan knows to start over. Every
+    call names its event, so scans of several events can share one crosswalk from parallel threads.
+    Only the max_events most recently synced fields (and their misses) are kept in memory.
+    """
+
+    def __init__(self, path=None, max_events=CROSSWALK_EVENTS):
+        self.path, self.max_events = path, max_events
+        self.lock = threading.Lock()
+        self.events, self.aliases = {}, {}
+        self.fields, self.by_norm, self.grams, self.pending, self.review = {}, {}, {}, {}, {}
+        self.recent, self.dirty, self.version = OrderedDict(), False, 0
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f: data = json.load(f)
+                # Only confirmed aliases are global; the old "aliases" table mixed in fuzzy picks and is dropped
+                self.events, self.aliases = data.get("events", {}), data.get("confirmed_aliases", {})
+            except (OSError, ValueError): pass
+
+    def sync_field(self, event, players):
+        with self.lock:
+            self.recent[event] = None; self.recent.move_to_end(event)
+            while len(self.recent) > self.max_events:
+                old, _ = self.recent.popitem(last=False)
+                for table in (self.fields, self.by_norm, self.grams, self.pending, self.review): table.pop(old, None)
+            field = self.fields.setdefault(event, {})
+            by_norm, grams = self.by_norm.setdefault(event, {}), self.grams.setdefault(event, {})
+            added = False
+            for p in players:
+                dg_id = player_key(p)
+                if dg_id in field: continue
+                norm = normalize_name(p.get("player_name", ""))
+                if not norm: continue
+                field[dg_id], key = norm, name_key(norm)
+                by_norm[key] = None if key in by_norm and by_norm[key] != dg_id else dg_id
+                added = True
+                for g in name_grams(norm): grams.setdefault(g, set()).add(dg_id)
+            if not added: return
+            # A new entrant can resolve titles that missed on an earlier scan. Fuzzy picks are re-matched,
+            # so one gives way to a player with exactly its name
+            self.pending.get(event, {}).clear()
+            known, review = self.events.get(event, {}), self.review.get(event, {})
+            for title, dg_id in list(known.items()):
+                norm = self._title_norm(title)
+                if by_norm.get(name_key(norm)) != dg_id and self.aliases.get(norm) != dg_id:
+                    del known[title]; review.pop(title, None); self.dirty = True
+
+    def resolve(self, event, title):
+        dg_id = self.events.get(event, {}).get(title)
+        if dg_id is not None and dg_id in self.fields.get(event, ()): return dg_id
+        with self.lock:
+            misses = self.pending.setdefault(event, {})
+            if title in misses: return None
+            dg_id, reason = self._match(event, title)
+            if dg_id is None:
+                misses[title] = reason
+                return None
+            if reason: self.review.setdefault(event, {})[title] = reason
+            self.events.setdefault(event, {})[title] = dg_id
+            self.dirty = True
+            return dg_id
+
+    @staticmethod
+    def _title_norm(title):
+        name = get_kalshi_player_name({"yes_sub_title": title})
+        return normalize_name(name) if name else ""
+
+    def _match(self, event, title):
+        norm = self._title_norm(title)
+        if not norm: return None, "no player name"
+        field, by_norm = self.fields.get(event, {}), self.by_norm.get(event, {})
+        key = name_key(norm)
+        if key in by_norm:
+            return (by_norm[key], None) if by_norm[key] is not None else (None, "duplicate name in DG field")
+        if self.aliases.get(norm) in field: return self.aliases[norm], None
+
+        grams, shared = name_grams(norm), {}
+        for g in grams:
+            for dg_id in self.grams.get(event, {}).get(g, ()): shared[dg_id] = shared.get(dg_id, 0) + 1
+        scored = sorted(((2 * n / (len(grams) + len(name_grams(field[i]))), i) for i, n in shared.items()), key=lambda x: x[0], reverse=True)
+        if not scored: return None, "no match in DG field"
+        # A close spelling is not enough: "Tom Hovland" must not become "Tony Hovland" when Tom has withdrawn.
+        # Agreeing names share the surname, so the score only ranks them ("J Thomas" scores low against "Justin Thomas")
+        agreeing = [c for c in scored if names_agree(norm, field[c[1]])]
+        if not agreeing:
+            closest = f" (closest: {field[scored[0][1]]})" if scored[0][0] >= FUZZY_MIN_SCORE else ""
+            return None, f"no match in DG field{closest}"
+        # An initial says nothing about which of two agreeing players it is, whatever their scores
+        if len(agreeing) > 1 and (min(map(len, norm.split())) == 1 or agreeing[0][0] - agreeing[1][0] < FUZZY_MIN_MARGIN):
+            return None, f"ambiguous: {field[agreeing[0][1]]} / {field[agreeing[1][1]]}"
+        return agreeing[0][1], f"fuzzy match: {field[agreeing[0][1]]} (dg_id {agreeing[0][1]}), not confirmed"
+
+    def confirm(self, name, dg_id):
+        """Record a checked Kalshi name (or market title) -> dg_id alias; it applies in every event whose field has that player."""
+        norm = self._title_norm(name) or normalize_name(name)
+        with self.lock:
+            self.aliases[norm] = dg_id
+            # Titles with this name are resolved again, now through the alias
+            for event, known in self.events.items():
+                for title in [t for t in known if self._title_norm(t) == norm]:
+                    del known[title]; self.review.get(event, {}).pop(title, None)
+            for misses in self.pending.values(): misses.clear()
+            self.version += 1
+            self.dirty = True
+
+    def misses(self, event):
+        """{title: reason} of the titles left unmatched and the fuzzy picks awaiting review."""
+        return {**self.review.get(event, {}), **self.pending.get(event, {})}
+
+    def save(self):
+        if not (self.path and self.dirty): return
+        with self.lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as f: json.dump({"events": self.events, "confirmed_aliases": self.aliases}, f)
+            os.replace(tmp, self.path)
+            self.dirty = False
@@ -0,0 +1,127 @@
+"""Background scans on an adaptive cadence, published as one immutable snapshot for every reader.
+
+One thread per process runs the scan (a delta rescan against its own previous snapshot) and swaps
+in a read-only `latest` view; readers never wait on the network and upstream load is one scan per
+interval no matter how many sessions are open. The interval follows the data: fast while DG
+serves a live model for the current event, slower while the event's markets are up pre-tournament,
+slow between tournaments, and a failed scan keeps the last good snapshot and retries at the
+middle pace.
+
+Anything computed from a published view (a streamed-price overlay, a filtered table) goes through
+derive(), so it too is built once and shared instead of held privately by every session.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from types import MappingProxyType
+
+from .config import REFRESH_CADENCE
+from .metrics import count, gauge, log_event
+
+DERIVED_SLOTS = 64
+
+
+def cadence(result):
+    """Name of the REFRESH_CADENCE pace a scan result calls for."""
+    if result.get("source") == "LIVE": return "live"
+    return "event" if result.get("matched") else "idle"
+
+class Refresher:
+    def __init__(self, scan, cadence_s=REFRESH_CADENCE, listeners=()):
+        """scan(prev_snapshot) -> scanner.scan()-style result dict carrying "snapshot"; listeners(view) run after each publish."""
+        self.scan, self.cadence_s, self.listeners = scan, dict(cadence_s), list(listeners)
+        self.latest, self.version, self.failures, self.status, self.error = None, 0, 0, "idle", None
+        self.published = threading.Condition()
+        self.wake, self.stopped = threading.Event(), threading.Event()
+        self.thread, self.next_at = None, None
+        # (id(view), key) -> (view, Future of the value); holding the view keeps its id from being reused while the entry lives
+        self.derived, self.derived_lock = OrderedDict(), threading.Lock()
+
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.stopped.clear()
+            self.thread = threading.Thread(target=self._run, name="refresher", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set(); self.wake.set()
+
+    def refresh_now(self):
+        self.wake.set()
+
+    def wait(self, timeout=None, after=0):
+        """Latest publication newer than version `after`, waiting up to timeout.
+
+        None if there is none yet: the timeout ran out, the refresher stopped, or a scan failed while
+        waiting, in which case error says why and the call returns as soon as the scan gives up.
+        """
+        with self.published:
+            failures = self.failures
+            self.published.wait_for(lambda: self.version > after or self.failures > failures or self.stopped.is_set(), timeout)
+            return self.latest if self.version > after else None
+
+    def derive(self, view, key, build):
+        """build(view), computed once per (view, key) and shared by every caller; the newest DERIVED_SLOTS are kept.
+
+        Single-flight per slot: the lock only finds or claims the slot's Future, and build runs outside it,
+        so one slow build (a big feed encode, say) never holds up a different view or key. Callers asking
+        for a slot that is being built wait for that build; a failed build is not kept.
+        """
+        slot = (id(view), key)
+        with self.derived_lock:
+            entry = self.derived.get(slot)
+            owner = entry is None
+            if owner:
+                entry = self.derived[slot] = (view, Future())
+                while len(self.derived) > DERIVED_SLOTS: self.derived.popitem(last=False)
+            else: self.derived.move_to_end(slot)
+        count("derived", result="miss" if owner else "hit")
+        future = entry[1]
+        if owner:
+            try: future.set_result(build(view))
+            except BaseException as e:
+                future.set_exception(e)
+                with self.derived_lock:
+                    if self.derived.get(slot) is entry: del self.derived[slot]
+        return future.result()
+
+    def _run(self):
+        prev = None
+        while not self.stopped.is_set():
+            self.status, started = "scanning", time.time()
+            try:
+                result = self.scan(prev)
+                prev, pace, self.error = result["snapshot"], cadence(result), None
+                self._publish(result, pace)
+                count("refreshes", result="ok")
+            except Exception as e:
+                pace = "event"
+                with self.published:
+                    self.error, self.failures = f"{type(e).__name__}: {e}", self.failures + 1
+                    self.published.notify_all()
+                count("refreshes", result="error")
+                log_event("refresh_error", error=self.error)
+            interval = self.cadence_s[pace]
+            gauge("refresh_interval_seconds", interval)
+            self.next_at, self.status = started + interval, f"{pace} · every {interval}s"
+            self.wake.wait(max(0.0, self.next_at - time.time()))
+            self.wake.clear()
+        self.status = "stopped"
+        with self.published: self.published.notify_all()
+
+    def _publish(self, result, pace):
+        from .edges import EdgeStore
+        # Built once here and shared read-only: sessions copy the reference, never the data. The result's edges,
+        # not the snapshot's: a scan with depth_stake has added the fill columns to them
+        edges = tuple(result["edges"])
+        view = MappingProxyType({**result, "edges": edges, "store": EdgeStore(edges), "cadence": pace, "published_at": time.time()})
+        with self.published:
+            self.latest = view
+            self.version += 1
+            self.published.notify_all()
+        for listener in self.listeners:
+            try: listener(view)
+            except Exception as e: log_event("listener_error", listener=getattr(listener, "__name__", repr(listener)), error=str(e))
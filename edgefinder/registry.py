@@ -0,0 +1,159 @@
+"""Kalshi event metadata, read from the events endpoint once and kept on disk.
+
+Each event ticker maps to its event code, a short tournament label, its dates and, once matched
+against the Data Golf schedule, the DG event it settles on. Lookups are one dict hit; tickers the
+registry has not seen yet are parsed once (the old KNOWN_EVENTS heuristic) and memoized, so no
+market is parsed on the hot path twice. The current event is then the Kalshi event whose DG
+event name is the one DG is pricing, instead of a word-overlap guess on every scan.
+"""
+
+import os
+import re
+import json
+import time
+import threading
+from datetime import date, timedelta
+
+from .config import EVENT_REGISTRY_PATH, EVENT_REGISTRY_TTL, KALSHI_SERIES, KNOWN_EVENTS
+
+# Words every golf event title shares, useless for telling two events apart
+GENERIC_WORDS = {"championship", "invitational", "tournament", "classic", "open", "winner", "golf", "tour", "finish", "make",
+                 "will", "presented", "the"}
+# A Kalshi event settles at most this many days after its DG event starts
+EVENT_WINDOW_DAYS = 7
+
+
+def parse_event_ticker(event_ticker):
+    """(event code, KNOWN_EVENTS label or None) from the ticker alone, for events the registry has not seen."""
+    parts = event_ticker.split("-")
+    if len(parts) < 2: return "", None
+    code = parts[1].upper()
+    stem = re.sub(r"\d+$", "", code)
+    for key, name in KNOWN_EVENTS.items():
+        if key in stem: return code, name
+    return code, None
+
+def name_key(name):
+    return re.sub(r"[^a-z0-9]+", " ", (name or "").lower()).strip()
+
+def name_words(name):
+    return {w for w in name_key(name).split() if len(w) > 3 and w not in GENERIC_WORDS}
+
+def short_label(name):
+    # "The Genesis Invitational" -> "Genesis"; also the edge engine's label for markets whose event has none
+    label = name
+    for word in ["The ", "the ", "Invitational", "Tournament", "Championship", "Classic", "Open"]: label = label.replace(word, "")
+    return label.strip() or name
+
+def _date(value):
+    try: return date.fromisoformat(str(value)[:10]) if value else None
+    except ValueError: return None
+
+def match_dg_event(title, label, settles, schedule):
+    """The DG schedule row a Kalshi event belongs to: dates first, names to break ties, None if unsure."""
+    words = name_words(f"{title} {label or ''}")
+    named = [row for row in schedule if words & name_words(row.get("event_name"))]
+    dated = []
+    if settles:
+        for row in schedule:
+            start = _date(row.get("start_date"))
+            if start and start <= settles <= start + timedelta(days=EVENT_WINDOW_DAYS): dated.append(row)
+    for pool in ([row for row in dated if row in named], dated if len(dated) == 1 else [], named if len(named) == 1 else []):
+        if pool: return pool[0]
+    return None
+
+
+class EventRegistry:
+    def __init__(self, path=EVENT_REGISTRY_PATH):
+        self.path = path
+        self.lock, self.refresh_lock = threading.Lock(), threading.Lock()
+        self.events, self.fetched_at = {}, 0.0   # event_ticker -> info, persisted
+        self.parsed, self.by_dg_name = {}, {}    # memoized fallbacks; DG event name key -> [event codes]
+        self.load()
+
+    def load(self):
+        if not (self.path and os.path.exists(self.path)): return
+        try:
+            with open(self.path) as f: data = json.load(f)
+        except (OSError, ValueError): return
+        with self.lock:
+            self.events, self.fetched_at = data.get("events", {}), data.get("fetched_at", 0.0)
+            self._index()
+
+    def save(self):
+        if not self.path: return
+        with self.lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as f: json.dump({"fetched_at": self.fetched_at, "events": self.events}, f)
+            os.replace(tmp, self.path)
+
+    def _index(self):
+        self.by_dg_name = {}
+        for info in self.events.values():
+            codes = self.by_dg_name.setdefault(name_key(info.get("dg_event_name")), [])
+            if info.get("dg_event_name") and info["code"] not in codes: codes.append(info["code"])
+        self.by_dg_name.pop("", None)
+
+    def lookup(self, event_ticker):
+        """{"code", "label", "start", "end", "dg_event_id", "dg_event_name"} for an event ticker; label is None when unknown."""
+        info = self.events.get(event_ticker) or self.parsed.get(event_ticker)
+        if info is None:
+            code, label = parse_event_ticker(event_ticker)
+            info = self.parsed[event_ticker] = {"code": code, "label": label, "start": None, "end": None, "dg_event_id": None, "dg_event_name": None}
+        return info
+
+    def current_code(self, dg_event_name, codes=None):
+        """Code of the Kalshi event that settles on DG's event_name (restricted to codes), or None if the registry can't tell."""
+        for code in self.by_dg_name.get(name_key(dg_event_name), ()):
+            if codes is None or code in codes: return code
+        return None
+
+    def stale(self, max_age=EVENT_REGISTRY_TTL):
+        return time.time() - self.fetched_at > max_age
+
+    def refresh(self, api_key=None, deadline=None, series=None, max_age=EVENT_REGISTRY_TTL):
+        """Re-read open events of every golf series (and the DG schedule, given a key) when older than max_age."""
+        with self.refresh_lock:
+            self.load()  # another process may have refreshed the file already
+            if not self.stale(max_age): return self
+            from .api import fetch_dg_schedule, fetch_kalshi_events
+            events = [e for s in (series or KALSHI_SERIES.values()) for e in fetch_kalshi_events(s, deadline)]
+            self.update(events, fetch_dg_schedule(api_key, deadline) if api_key else [])
+            self.save()
+        return self
+
+    def update(self, kalshi_events, schedule=()):
+        """Merge Kalshi event dicts (matched against DG schedule rows) into the registry."""
+        schedule = list(schedule)
+        fresh = {}
+        for e in kalshi_events:
+            ticker = e.get("event_ticker")
+            if not ticker: continue
+            code, label = parse_event_ticker(ticker)
+            title, settles = e.get("title") or "", _date(e.get("strike_date"))
+            row = match_dg_event(title, label, settles, schedule)
+            dg_name = row.get("event_name") if row else None
+            fresh[ticker] = {"code": code, "label": label or short_label(dg_name or title) or None,
+                             "start": row.get("start_date") if row else None, "end": settles.isoformat() if settles else None,
+                             "dg_event_id": row.get("event_id") if row else None, "dg_event_name": dg_name}
+        with self.lock:
+            for ticker, info in fresh.items():
+                old = self.events.get(ticker, {})
+                # Keep a DG match from an earlier schedule if this one could not make it
+                if not info["dg_event_name"] and old.get("dg_event_name"):
+                    info.update({k: old[k] for k in ("start", "dg_event_id", "dg_event_name")}, label=old.get("label") or info["label"])
+                self.events[ticker] = info
+                self.parsed.pop(ticker, None)
+            self.fetched_at = time.time()
+            self._index()
+        return self
+
+_registry, _registry_lock = None, threading.Lock()
+
+def get_event_registry():
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None: _registry = EventRegistry()
+    return _registry
@@ -0,0 +1,116 @@
+"""Results view: the static results document and the compact payload for the edge_table component.
+
+The component (frontend/edge_table) ships its stylesheet and renderer to the browser once; each
+rerun then sends only the stats and the filtered rows as seven columns, which it virtualizes and
+sorts client-side. dg_prob, dg_no and R/R follow from side, dg_yes and cost, so the browser derives
+them, and the two float columns are rounded once through NumPy. Every filtered row is still sent:
+header sorts and scrolling run without a rerun, so virtualization bounds the DOM (visible rows plus
+overscan), not the payload. The payload is under a third of the HTML's bytes and under half its build
+time (python -m benchmarks.bench --render).
+"""
+
+import os
+from functools import lru_cache
+
+from .edges import field
+from .metrics import count, timer
+
+FRONTEND_DIR = os.path.join(os.path.dirname(__file__), "frontend", "edge_table")
+PAYLOAD_COLUMNS = ("event", "player", "market", "side", "dg_yes", "edge", "cost")
+
+
+@lru_cache(maxsize=1)
+def results_css():
+    with open(os.path.join(FRONTEND_DIR, "results.css")) as f: return f.read()
+
+def row_html(e):
+    evt_cls = "badge-masters" if e["event"] == "Masters" else "badge-current"
+    evt_html = f'<span class="badge {evt_cls}">{e["event"]}</span>'
+
+    if e["side"] == "YES":
+        side_html = '<span class="badge badge-yes">YES</span>'
+        model_html = f'<span class="text-bright">{e["dg_prob"]:.1f}%</span>'
+    else:
+        side_html = '<span class="badge badge-no">NO</span>'
+        model_html = f'<span class="text-dim">{e["dg_yes"]:.1f}% &rarr;</span> <span class="text-bright">{e["dg_no"]:.1f}%</span>'
+
+    edge_cls = "edge-hot" if e["edge"] >= 7 else "edge-warm" if e["edge"] >= 5 else "edge-mild"
+    rr_cls = "rr-hot" if e["rr"] >= 2 else "rr-warm" if e["rr"] >= 1 else "rr-cool"
+
+    return f"""<tr>
+<td>{evt_html}</td>
+<td class="player-cell">{e["player"]}</td>
+<td class="text-secondary">{e["market"]}</td>
+<td>{side_html}</td>
+<td>{model_html}</td>
+<td><span class="{edge_cls}">+{e["edge"]:.1f}%</span></td>
+<td class="text-bright" style="font-weight:500;">{e["cost"]}&cent;</td>
+<td><span class="{rr_cls}">{e["rr"]:.1f}x</span></td>
+</tr>"""
+
+@timer("render", view="html")
+def build_results_html(filtered, event_name, field_size, matched, min_edge, yes_count, no_count, avg_edge, source, skipped_other):
+    """Self-contained results document (stylesheet and every row inlined); the dashboard uses the edge_table component instead."""
+    rows = "".join(row_html(e) for e in filtered)
+
+    table_body = rows if filtered else f'<tr><td colspan="8" class="empty-state">No edges above {min_edge}% — try lowering the threshold</td></tr>'
+
+    source_badge = '<span class="source-badge source-live"><span class="live-dot"></span>LIVE MODEL</span>' if source == "LIVE" else '<span class="source-badge source-pre">PRE-TOURNAMENT</span>'
+    skipped_note = f" &middot; {skipped_other} future markets filtered" if skipped_other > 0 else ""
+
+    count("rows_rendered", len(filtered), view="html")
+    return f"""<!DOCTYPE html><html><head><style>{results_css()}</style></head><body>
+
+<div class="event-banner">
+  <div>
+    <div style="display:flex;align-items:center;gap:10px;margin-bottom:2px;">
+        <span class="event-label">Current Event</span>
+        {source_badge}
+    </div>
+    <div class="event-name">{event_name}</div>
+  </div>
+  <div style="display:flex;gap:28px;">
+    <div class="event-stat"><div class="event-label">Field</div><div class="event-stat-value">{field_size}</div></div>
+    <div class="event-stat"><div class="event-label">Matched</div><div class="event-stat-value">{matched}</div></div>
+  </div>
+</div>
+
+<div class="stat-row">
+  <div class="stat-card"><div class="stat-label">Edges Found</div><div class="stat-value stat-green">{len(filtered)}</div></div>
+  <div class="stat-card"><div class="stat-label">Buy Yes</div><div class="stat-value stat-blue">{yes_count}</div></div>
+  <div class="stat-card"><div class="stat-label">Buy No</div><div class="stat-value stat-amber">{no_count}</div></div>
+  <div class="stat-card"><div class="stat-label">Avg Edge</div><div class="stat-value stat-purple">{avg_edge:.1f}%</div></div>
+</div>
+
+<div class="table-wrap">
+  <div style="overflow-x:auto;">
+    <table>
+      <thead><tr>
+        <th>Event</th><th>Player</th><th>Market</th><th>Side</th><th>DG Model</th><th>Edge</th><th>Cost</th><th>R/R</th>
+      </tr></thead>
+      <tbody>{table_body}</tbody>
+    </table>
+  </div>
+</div>
+
+<div class="footer">
+    <span>Edge = DG probability &minus; Kalshi ask &middot; Live orderbook prices</span>
+    <span>{matched} matched &middot; {field_size} players{skipped_note}</span>
+</div>
+
+<div class="footer-credit">
+    Created by Zack Hennigan
+</div>
+
+</body></html>"""
+
+
+@timer("render", view="table")
+def table_payload(filtered, event_name, field_size, matched, min_edge, yes_count, no_count, avg_edge, source, skipped_other):
+    """Arguments for the edge_table component; columns are [event, player, market, side, dg_yes, edge, cost]."""
+    import numpy as np
+    columns = [list(c) for c in zip(*map(field(filtered, *PAYLOAD_COLUMNS), filtered))] or [[] for _ in PAYLOAD_COLUMNS]
+    for i in (4, 5): columns[i] = np.round(np.asarray(columns[i], dtype=float), 4).tolist()
+    count("rows_rendered", len(filtered), view="table")
+    return {"columns": columns, "event_name": event_name, "field_size": field_size, "matched": matched, "min_edge": min_edge,
+            "yes_count": yes_count, "no_count": no_count, "avg_edge": round(avg_edge, 4), "source": source, "skipped_other": skipped_other}
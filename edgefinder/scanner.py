@@ -0,0 +1,137 @@
+"""One complete headless scan: fetch, pick the DG model, match and price every edge.
+
+scan() covers the PGA Tour's current event; scan_events() covers every DG tour and every open
+Kalshi event code at once.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .api import cached_fetchers, fetch_all, select_dg_data
+from .config import DG_TOURS, EVENT_WORKERS, PROFILE_DIR, SCAN_DEADLINE
+from .edges import rescan_edges
+from .events import assign_event_codes, get_tournament_label, partition_events
+from .metrics import count, gauge, log_event, profiled, timer
+from .names import PlayerCrosswalk
+
+
+def scan(api_key, crosswalk=None, cache=None, history=None, deadline_s=SCAN_DEADLINE, profile_dir=PROFILE_DIR, depth_stake=None,
+         prev=None, **fetch_kwargs):
+    """Returns a dict with the edge rows and the same scan stats the dashboard shows.
+
+    With a ResponseCache, fetches are shared with every other process using the same cache file.
+    With a SnapshotHistory, the scan's quotes are appended to it. profile_dir dumps a cProfile of the scan.
+    depth_stake (dollars) prices the best edges against their order books: those rows gain
+    DEPTH_COLUMNS and the result a "depth" summary. prev (an earlier result's "snapshot") makes
+    this a delta rescan; "delta" says what moved. "fetched_mono" is time.monotonic() when the fetch
+    started: every Kalshi ask in the result was read after it.
+    Raises whatever the DG pre-tournament request raised (or TimeoutError) since no event can be
+    identified without it.
+    """
+    with profiled(profile_dir), timer("scan"):
+        if cache is not None: fetch_kwargs.setdefault("fetchers", cached_fetchers(cache, api_key))
+        fetched_mono = time.monotonic()
+        fetched = fetch_all(api_key, deadline_s=deadline_s, **fetch_kwargs)
+        if fetched["pretournament_error"] is not None: raise fetched["pretournament_error"]
+        dg_data = select_dg_data(fetched["pretournament"], fetched["live"])
+        crosswalk = crosswalk or PlayerCrosswalk()
+        snapshot, delta = rescan_edges(prev, dg_data, fetched["kalshi_by_type"], crosswalk)
+        if history is not None: history.append(snapshot, time.time())
+        depth = _price_depth(snapshot, depth_stake, cache)
+    count("scans", source=dg_data.get("source", "PRE-TOURNAMENT"))
+    log_event("scan", event_name=dg_data.get("event_name", "Unknown"), edges=len(snapshot["edges"]), matched=len(snapshot["matched"]),
+              incomplete=fetched["incomplete"])
+    return {
+        "event_name": dg_data.get("event_name", "Unknown"), "source": dg_data.get("source", "PRE-TOURNAMENT"),
+        "edges": depth.pop("edges", snapshot["edges"]), **depth, "matched": len(snapshot["matched"]), "field_size": snapshot["field_size"],
+        "skipped_other": len(snapshot["skipped"]),
+        "unmatched": crosswalk.misses(snapshot["match_event"]),
+        "incomplete": fetched["incomplete"], "errors": fetched["errors"], "dg_data": dg_data, "kalshi_by_type": fetched["kalshi_by_type"],
+        "snapshot": snapshot, "delta": delta, "fetched_mono": fetched_mono,
+    }
+
+def scan_events(api_key, tours=DG_TOURS, crosswalk=None, cache=None, history=None, deadline_s=SCAN_DEADLINE,
+                profile_dir=PROFILE_DIR, workers=EVENT_WORKERS, depth_stake=None, **fetch_kwargs):
+    """Every DG tour against every open Kalshi event code: one ranked edge list plus a status row per event.
+
+    Kalshi markets are partitioned by event code and each code is paired with the DG event that
+    names it (assign_event_codes), so an opposite-field or DP World Tour week is priced alongside
+    the PGA Tour event instead of being skipped. Partitions are priced in parallel on `workers`
+    threads and merged into one list ranked by edge. Codes with no DG model this week (futures on
+    a later major, say) and tours whose feed failed still get a status row; nothing is raised.
+    depth_stake works as in scan().
+    """
+    with profiled(profile_dir), timer("scan", mode="events"):
+        if cache is not None: fetch_kwargs.setdefault("fetchers", cached_fetchers(cache, api_key))
+        fetched_mono = time.monotonic()
+        fetched = fetch_all(api_key, deadline_s=deadline_s, tours=tours, **fetch_kwargs)
+        dg_by_tour = {tour: select_dg_data(feeds["pretournament"], feeds["live"])
+                      for tour, feeds in fetched["dg_by_tour"].items() if feeds["pretournament"]}
+        by_event = partition_events(fetched["kalshi_by_type"])
+        assigned = assign_event_codes({tour: dg["event_name"] for tour, dg in dg_by_tour.items()}, by_event)
+
+        crosswalk = crosswalk or PlayerCrosswalk()
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="event") as pool:
+            futures = {code: pool.submit(_scan_event, code, dg_by_tour[tour], by_event[code], crosswalk) for code, tour in assigned.items()}
+        snapshots, events = {}, []
+        for code, by_type in by_event.items():
+            tour = assigned.get(code)
+            row = {"event_code": code, "label": get_tournament_label(next(m for ms in by_type.values() for m in ms)), "tour": tour,
+                   "dg_event": dg_by_tour[tour]["event_name"] if tour else None, "source": dg_by_tour[tour].get("source") if tour else None,
+                   "markets": sum(map(len, by_type.values())), "matched": 0, "edges": 0, "unmatched": 0, "status": "no_model", "error": None}
+            if tour and futures[code].exception() is not None:
+                row.update(status="error", error=str(futures[code].exception()))
+            elif tour:
+                snapshots[code] = snap = futures[code].result()
+                row.update(status="ok", matched=len(snap["matched"]), edges=len(snap["edges"]), unmatched=len(crosswalk.misses(snap["match_event"])))
+            events.append(row)
+        for tour in tours:
+            # Tours with no Kalshi event to price still report why
+            if tour in assigned.values(): continue
+            error = fetched["errors"].get("pretournament" if tour == tours[0] else f"pretournament:{tour}")
+            events.append({"event_code": None, "label": None, "tour": tour, "dg_event": dg_by_tour[tour]["event_name"] if tour in dg_by_tour else None,
+                           "source": dg_by_tour[tour].get("source") if tour in dg_by_tour else None, "markets": 0, "matched": 0, "edges": 0,
+                           "unmatched": 0, "status": "error" if error else "no_markets", "error": error})
+
+        snapshot = merge_snapshots(snapshots.values())
+        if history is not None: history.append(snapshot, time.time())
+        depth = _price_depth(snapshot, depth_stake, cache)
+    gauge("markets", sum(r["markets"] for r in events)); gauge("matched_markets", len(snapshot["matched"])); gauge("edges", len(snapshot["edges"]))
+    count("scans", source="EVENTS")
+    log_event("scan", mode="events", events={r["event_code"] or r["tour"]: r["status"] for r in events}, edges=len(snapshot["edges"]),
+              matched=len(snapshot["matched"]), incomplete=fetched["incomplete"])
+    return {
+        "event_name": " / ".join(dg_by_tour[assigned[code]]["event_name"] for code in snapshots) or "No event",
+        "source": "EVENTS", "edges": depth.pop("edges", snapshot["edges"]), **depth, "matched": len(snapshot["matched"]), "field_size": snapshot["field_size"],
+        "skipped_other": sum(r["markets"] for r in events if r["status"] != "ok"),
+        "unmatched": {code: crosswalk.misses(s["match_event"]) for code, s in snapshots.items() if crosswalk.misses(s["match_event"])},
+        "events": events, "incomplete": fetched["incomplete"], "errors": fetched["errors"],
+        "dg_by_tour": dg_by_tour, "kalshi_by_type": fetched["kalshi_by_type"], "snapshot": snapshot,
+        "fetched_mono": fetched_mono,
+    }
+
+def _price_depth(snapshot, stake, cache):
+    # {} when depth pricing is off; otherwise the annotated edges plus a "depth" summary
+    if not stake: return {}
+    from .depth import apply_fills, cached_orderbook, price_depth
+    priced = price_depth(snapshot, stake, fetch=cached_orderbook(cache) if cache is not None else None)
+    return {"edges": apply_fills(snapshot, priced["fills"]),
+            "depth": {"stake": stake, "books": priced["books"], "priced": len(priced["fills"]), "errors": priced["errors"]}}
+
+def _scan_event(code, dg_data, kalshi_by_type, crosswalk):
+    # Only this event's markets are in the slate, so rescan_edges settles on its code
+    with timer("event", event=code):
+        snapshot, _ = rescan_edges(None, dg_data, kalshi_by_type, crosswalk)
+    return snapshot
+
+def merge_snapshots(snapshots):
+    """One rescan_edges-shaped snapshot over several events, edges ranked by edge (scan order breaks ties)."""
+    snapshots = list(snapshots)
+    merged = {"event_name": " / ".join(s["event_name"] for s in snapshots), "event_code": None, "markets": {}, "players": {},
+              "market_player": {}, "rows": {}, "matched": set(), "skipped": set(), "version": 0, "match_event": None,
+              "field_size": sum(s["field_size"] for s in snapshots)}
+    for s in snapshots:
+        for k in ("markets", "players", "market_player", "rows"): merged[k].update(s[k])
+        merged["matched"] |= s["matched"]; merged["skipped"] |= s["skipped"]
+    merged["edges"] = sorted((e for s in snapshots for e in s["edges"]), key=lambda e: e["edge"], reverse=True)
+    return merged
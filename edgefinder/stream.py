@@ -0,0 +1,143 @@
+"""Optional WebSocket price book fed by Kalshi's ticker channel (needs websocket-client)."""
+
+import json
+import time
+import base64
+import threading
+from urllib.parse import urlparse
+
+from .config import KALSHI_WS_URL, REQUEST_TIMEOUT
+
+
+def kalshi_ws_headers(key_id, private_key, url=KALSHI_WS_URL):
+    # Kalshi signs "<ms timestamp><METHOD><path>" with the account's RSA key (PSS, SHA-256)
+    if not (key_id and private_key): return {}
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import padding
+    ts = str(int(time.time() * 1000))
+    key = serialization.load_pem_private_key(private_key.encode(), password=None)
+    sig = key.sign(f"{ts}GET{urlparse(url).path}".encode(),
+                   padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH), hashes.SHA256())
+    return {"KALSHI-ACCESS-KEY": key_id, "KALSHI-ACCESS-SIGNATURE": base64.b64encode(sig).decode(), "KALSHI-ACCESS-TIMESTAMP": ts}
+
+class KalshiPriceStream:
+    """Top-of-book asks for watched market tickers, kept current by Kalshi's WebSocket ticker channel.
+
+    One background thread owns the connection (reconnecting with backoff); readers call apply() to
+    overlay the latest quotes onto a REST market listing and use version to tell when anything moved.
+    watch() sets the whole watched set: tickers that left it are dropped from their subscription
+    (update_subscription/delete_markets on the sid Kalshi assigned) and from the book.
+    """
+
+    def __init__(self, url=KALSHI_WS_URL, headers=lambda url: {}):
+        self.url, self.headers = url, headers
+        self.lock, self.send_lock = threading.Lock(), threading.Lock()
+        self.book, self.tickers = {}, set()
+        self.subs, self.sids = {}, {}  # subscribe msg id -> its tickers (until Kalshi answers); ticker -> sid
+        self.version, self.status, self.msg_id = 0, "idle", 0
+        self.ws, self.thread = None, None
+        self.stopped = threading.Event()
+
+    def watch(self, tickers):
+        """Stream exactly these market tickers: subscribe the new ones, unsubscribe the ones no longer listed."""
+        tickers = set(tickers)
+        with self.lock:
+            new, gone = tickers - self.tickers, self.tickers - tickers
+            self.tickers = tickers
+            for t in gone: self.book.pop(t, None)
+        if self.thread is None or not self.thread.is_alive():
+            self.stopped.clear()
+            self.thread = threading.Thread(target=self._run, name="kalshi-stream", daemon=True)
+            self.thread.start()
+            return
+        if gone: self._unsubscribe(gone)
+        if new: self._subscribe(new)
+
+    def stop(self):
+        self.stopped.set()
+        if self.ws is not None:
+            try: self.ws.close()
+            except Exception: pass
+
+    def apply(self, kalshi_by_type, since=0):
+        """Copy of kalshi_by_type with asks replaced by any stream quote received after `since` (monotonic)."""
+        with self.lock:
+            book = {t: {k: v for k, v in q.items() if k != "at" and v is not None} for t, q in self.book.items() if q["at"] > since}
+        if not book: return kalshi_by_type
+        return {m_type: [dict(m, **book[m["ticker"]]) if m.get("ticker") in book else m for m in markets]
+                for m_type, markets in kalshi_by_type.items()}
+
+    def _run(self):
+        try:
+            import websocket
+        except ImportError:
+            self.status = "unavailable (pip install websocket-client)"
+            return
+        backoff = 1
+        while not self.stopped.is_set():
+            try:
+                self.status = "connecting"
+                # Subscriptions die with the connection; the new one resubscribes everything watched
+                with self.lock: self.subs, self.sids = {}, {}
+                self.ws = websocket.create_connection(self.url, header=self.headers(self.url), timeout=REQUEST_TIMEOUT)
+                self.ws.settimeout(60)
+                self.status, backoff = "live", 1
+                self._subscribe(set(self.tickers))
+                while not self.stopped.is_set():
+                    try: raw = self.ws.recv()
+                    except websocket.WebSocketTimeoutException: continue
+                    if raw: self._handle(json.loads(raw))
+            except Exception as e:
+                if not self.stopped.is_set(): self.status = f"reconnecting ({e.__class__.__name__})"
+            finally:
+                if self.ws is not None:
+                    try: self.ws.close()
+                    except Exception: pass
+                    self.ws = None
+            self.stopped.wait(backoff)
+            backoff = min(backoff * 2, 30)
+        self.status = "stopped"
+
+    def _subscribe(self, tickers):
+        ws = self.ws
+        if ws is None or not tickers: return
+        with self.send_lock:
+            self.msg_id += 1
+            with self.lock: self.subs[self.msg_id] = set(tickers)
+            ws.send(json.dumps({"id": self.msg_id, "cmd": "subscribe", "params": {"channels": ["ticker"], "market_tickers": sorted(tickers)}}))
+
+    def _unsubscribe(self, tickers):
+        ws = self.ws
+        if ws is None: return
+        with self.lock:
+            by_sid = {}
+            # Tickers whose subscribe isn't acknowledged yet have no sid; the ack drops them instead
+            for t in tickers:
+                sid = self.sids.pop(t, None)
+                if sid is not None: by_sid.setdefault(sid, []).append(t)
+        with self.send_lock:
+            for sid, gone in sorted(by_sid.items()):
+                self.msg_id += 1
+                ws.send(json.dumps({"id": self.msg_id, "cmd": "update_subscription",
+                                    "params": {"sids": [sid], "market_tickers": sorted(gone), "action": "delete_markets"}}))
+
+    def _handle(self, msg):
+        if msg.get("type") == "error":
+            self.status = f"error: {msg.get('msg', {}).get('msg', 'unknown')}"
+            return
+        body = msg.get("msg", {})
+        if msg.get("type") == "subscribed":
+            with self.lock:
+                tickers = self.subs.pop(msg.get("id"), set())
+                for t in tickers: self.sids[t] = body.get("sid")
+                unwatched = tickers - self.tickers
+            if unwatched: self._unsubscribe(unwatched)
+            return
+        if msg.get("type") != "ticker" or body.get("market_ticker") not in self.tickers: return
+        with self.lock:
+            quote = self.book.get(body["market_ticker"], {"yes_ask": None, "no_ask": None})
+            # The NO ask is the complement of the best YES bid
+            quote = {"yes_ask": body.get("yes_ask", quote["yes_ask"]),
+                     "no_ask": 100 - body["yes_bid"] if body.get("yes_bid") is not None else quote["no_ask"], "at": time.monotonic()}
+            self.book[body["market_ticker"]] = quote
+            self.version += 1
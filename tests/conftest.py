@@ -0,0 +1,23 @@
+"""Fixtures shared by the test modules that talk to a local HTTP server."""
+
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+
+@pytest.fixture
+def http_server():
+    """start(handler) serves a BaseHTTPRequestHandler class on a free 127.0.0.1 port; every server is shut down after the test.
+
+    The returned server has url ("http://127.0.0.1:<port>"); each module passes its own handler.
+    """
+    servers = []
+    def start(handler):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        server.url = f"http://127.0.0.1:{server.server_address[1]}"
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+    yield start
+    for server in servers: server.shutdown(); server.server_close()
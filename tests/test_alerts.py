@@ -0,0 +1,126 @@
+"""AlertEngine rule matching, hysteresis and cooldown, and webhook delivery to a local stub."""
+
+import json
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from edgefinder.alerts import AlertEngine, deliver
+from edgefinder.metrics import METRICS
+
+
+def webhook_handler(status, received):
+    """Keeps every posted JSON body in received and answers with status."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            received.append(json.loads(body or b"null"))
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args): pass
+
+    return Handler
+
+
+@pytest.fixture
+def webhook(http_server):
+    def start(status=204):
+        received = []
+        server = http_server(webhook_handler(status, received))
+        server.received = received
+        return server
+    return start
+
+def row(player="Scottie Scheffler", market="Top 10", side="YES", edge=6.0):
+    return {"player": player, "market": market, "side": side, "event": "Masters", "edge": edge, "cost": 40, "dg_prob": 40 + edge}
+
+def snapshot(**rows):
+    return {"rows": {k: list(v) for k, v in rows.items()}}
+
+def moved(*pairs):
+    """Delta of a partial rescan in which each (ticker, new row) moved."""
+    return {"full": False, "appeared": [], "disappeared": [], "moved": [(k, None, new) for k, new in pairs]}
+
+def fired(alerts):
+    return sorted((a["rule"], a["ticker"]) for a in alerts)
+
+def counter(name, **labels):
+    return METRICS.snapshot()[0].get((name, tuple(sorted(labels.items()))), 0)
+
+
+def test_only_changed_quotes_are_evaluated():
+    engine = AlertEngine([{"id": "any", "min_edge": 5}, {"id": "rory", "player": "Rory McIlroy", "min_edge": 5}], cooldown=0)
+    snap = snapshot(A=[row(edge=6)], B=[row("Rory McIlroy", edge=7)])
+    checked = counter("alert_quotes_checked")
+    assert fired(engine.evaluate(snap, moved(("B", row("Rory McIlroy", edge=7))), now=0)) == [("any", "B"), ("rory", "B")]
+    assert counter("alert_quotes_checked") - checked == 1
+    # A full rescan looks at every row; B's rules are already active, so only A is new
+    assert fired(engine.evaluate(snap, now=1)) == [("any", "A")]
+
+def test_rules_match_on_player_market_and_side():
+    engine = AlertEngine([{"id": "top10-yes", "market": "Top 10", "side": "YES", "min_edge": 1},
+                          {"id": "win", "market": "Win", "min_edge": 1}, {"id": "no", "side": "NO", "min_edge": 1}])
+    alerts = engine.evaluate(snapshot(A=[row(), row(side="NO")], B=[row(market="Win")]), now=0)
+    assert fired(alerts) == [("no", "A"), ("top10-yes", "A"), ("win", "B")]
+    assert alerts[0]["threshold"] == 1.0 and alerts[0]["edge"] == 6.0
+
+def test_threshold_bands_fire_on_upward_crossing():
+    engine = AlertEngine([{"id": f"t{t}", "min_edge": t} for t in (8, 3, 5)], cooldown=0)
+    assert engine.evaluate(snapshot(A=[row(edge=2)]), now=0) == []
+    assert [a["rule"] for a in engine.evaluate({}, moved(("A", row(edge=6))), now=1)] == ["t3", "t5"]
+    assert [a["rule"] for a in engine.evaluate({}, moved(("A", row(edge=9))), now=2)] == ["t8"]
+    assert engine.evaluate({}, moved(("A", row(edge=10))), now=3) == []
+
+def test_hysteresis_holds_an_oscillating_edge():
+    engine = AlertEngine([{"id": "r", "min_edge": 5}], hysteresis=1.0, cooldown=0)
+    assert len(engine.evaluate({}, moved(("A", row(edge=5.5))), now=0)) == 1
+    for i, edge in enumerate((4.5, 5.2, 4.1, 5.9, 4.0)):
+        assert engine.evaluate({}, moved(("A", row(edge=edge))), now=i + 1) == [], edge
+    # Only a drop of more than the band re-arms the rule
+    assert engine.evaluate({}, moved(("A", row(edge=3.9))), now=10) == []
+    assert len(engine.evaluate({}, moved(("A", row(edge=5.0))), now=11)) == 1
+
+def test_cooldown_suppresses_repeats_on_one_quote():
+    engine = AlertEngine([{"id": "r", "min_edge": 5}], hysteresis=1.0, cooldown=900)
+    cross = lambda now: engine.evaluate({}, moved(("A", row(edge=3)), ("A", row(edge=6))), now=now)
+    assert len(cross(0)) == 1
+    assert cross(600) == []
+    assert len(cross(901)) == 1
+    # The cooldown is per quote: another ticker fires straight away
+    assert fired(engine.evaluate({}, moved(("B", row(edge=6))), now=902)) == [("r", "B")]
+
+def test_disappeared_quote_rearms():
+    engine = AlertEngine([{"id": "r", "min_edge": 5}], cooldown=0)
+    assert len(engine.evaluate({}, moved(("A", row(edge=6))), now=0)) == 1
+    engine.evaluate({}, {"full": False, "appeared": [], "moved": [], "disappeared": [("A", row(edge=6))]}, now=1)
+    assert len(engine.evaluate({}, {"full": False, "appeared": [("A", row(edge=6))], "moved": [], "disappeared": []}, now=2)) == 1
+
+def test_deliver_batches_per_webhook(webhook):
+    default, own = webhook(), webhook()
+    engine = AlertEngine([{"id": "a", "min_edge": 1}, {"id": "b", "min_edge": 2},
+                          {"id": "c", "user": "ana", "min_edge": 3, "webhook": own.url}])
+    ok = counter("alert_posts", result="ok")
+    deliver(engine.evaluate(snapshot(A=[row()], B=[row("Rory McIlroy")]), now=0), default.url)
+    assert len(default.received) == 1 and len(own.received) == 1
+    assert fired(default.received[0]["alerts"]) == [("a", "A"), ("a", "B"), ("b", "A"), ("b", "B")]
+    assert [(a["rule"], a["user"]) for a in sorted(own.received[0]["alerts"], key=lambda a: a["ticker"])] == [("c", "ana")] * 2
+    assert all("webhook" not in a for body in default.received + own.received for a in body["alerts"])
+    assert "sent_at" in default.received[0]
+    assert counter("alert_posts", result="ok") - ok == 2
+
+def test_deliver_without_any_webhook_posts_nothing(webhook):
+    stub = webhook()
+    deliver(AlertEngine([{"min_edge": 1}]).evaluate(snapshot(A=[row()]), now=0))
+    assert stub.received == []
+
+def test_failing_webhook_is_counted_not_raised(webhook):
+    broken, fine = webhook(status=500), webhook()
+    engine = AlertEngine([{"id": "a", "min_edge": 1}, {"id": "b", "min_edge": 1, "webhook": fine.url}])
+    errors, ok = counter("alert_posts", result="error"), counter("alert_posts", result="ok")
+    deliver(engine.evaluate(snapshot(A=[row()]), now=0), broken.url)
+    assert len(broken.received) == 1 and len(fine.received) == 1
+    assert counter("alert_posts", result="error") - errors == 1
+    assert counter("alert_posts", result="ok") - ok == 1
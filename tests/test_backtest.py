@@ -0,0 +1,98 @@
+"""Backtest's vectorized entries, sweep and calibration against a row-by-row replay of the same quotes."""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from edgefinder.backtest import Backtest
+
+
+def quotes(*rows):
+    """SnapshotHistory.query()-shaped frame from (ts, ticker, market, side, dg_prob, ask) rows; edge is dg_prob - ask."""
+    frame = pd.DataFrame(rows, columns=["ts", "ticker", "market", "side", "dg_prob", "ask"])
+    frame["edge"] = frame["dg_prob"] - frame["ask"]
+    frame["ts"] = pd.to_datetime(frame["ts"], unit="s", utc=True)
+    for c in ("ticker", "market", "side"): frame[c] = frame[c].astype("category")
+    return frame
+
+# Settled: KXA yes, KXB no, KXC yes; KXD never settled, so its quotes are dropped
+SETTLED = pd.DataFrame({"ticker": ["KXA", "KXB", "KXC"], "result": [1.0, 0.0, 1.0], "close_ts": [10_000.0, 10_000.0, np.nan]})
+HISTORY = quotes(
+    # A threshold crossing: the edge climbs 2 -> 5 -> 8
+    (100, "KXA", "win", "YES", 12.0, 10), (200, "KXA", "win", "YES", 15.0, 10), (300, "KXA", "win", "YES", 20.0, 12),
+    # Re-entry after decay: 6 -> 1 -> 7 at a cheaper ask; a market off the board (NaN quote) in between
+    (100, "KXB", "top_10", "NO", 66.0, 60), (200, "KXB", "top_10", "NO", 61.0, 60), (250, "KXB", "top_10", "NO", np.nan, np.nan),
+    (300, "KXB", "top_10", "NO", 62.0, 55),
+    (150, "KXB", "top_10", "YES", 45.0, 40), (400, "KXC", "top_10", "YES", 30.0, 31), (500, "KXC", "top_10", "YES", 33.0, 30),
+    (100, "KXD", "win", "YES", 50.0, 10),
+)
+THRESHOLDS = [-200.0, 0.0, 2.0, 3.0, 5.0, 6.5, 7.5, 50.0]
+
+
+def replay(frame, settled, thresholds, fee=0.0, side="All", market="All", hours=None):
+    """{(market, min_edge): (bets, wins, cost, pnl)} by walking each (ticker, side) series in time order."""
+    result = dict(zip(settled["ticker"], settled["result"]))
+    close = {t: c for t, c in zip(settled["ticker"], settled["close_ts"]) if not math.isnan(c)}
+    rows = [r for r in frame.itertuples() if not math.isnan(r.ask) and r.ticker in result]
+    last = {}
+    for r in rows: last[r.ticker] = max(last.get(r.ticker, -math.inf), r.ts.timestamp())
+    series = {}
+    for r in sorted(rows, key=lambda r: (r.ticker, r.side, r.ts)): series.setdefault((r.ticker, r.side), []).append(r)
+    out = {}
+    for t in thresholds:
+        for group in series.values():
+            for r in group:
+                if side != "All" and r.side != side: continue
+                if market != "All" and r.market != market: continue
+                left = (close.get(r.ticker, last[r.ticker]) - r.ts.timestamp()) / 3600
+                if hours is not None and not hours[0] <= left <= hours[1]: continue
+                if math.isnan(r.edge) or r.edge < t: continue
+                won = result[r.ticker] == (1.0 if r.side == "YES" else 0.0)
+                for name in (r.market, "All"):
+                    bets, wins, cost, pnl = out.get((name, t), (0, 0, 0.0, 0.0))
+                    out[(name, t)] = (bets + 1, wins + won, cost + r.ask + fee, pnl + won * 100 - r.ask - fee)
+                break
+    return out
+
+def assert_matches_replay(fee=0.0, **rule):
+    swept, expected = Backtest(HISTORY, SETTLED, fee=fee).sweep(THRESHOLDS, **rule), replay(HISTORY, SETTLED, THRESHOLDS, fee=fee, **rule)
+    for (t, name), row in swept.iterrows():
+        bets, wins, cost, pnl = expected.get((name, t), (0, 0, 0.0, 0.0))
+        assert row["bets"] == bets and row["cost"] == pytest.approx(cost) and row["pnl"] == pytest.approx(pnl), (name, t)
+        assert (math.isnan(row["hit_rate"]) and not bets) or row["hit_rate"] == pytest.approx(wins / bets), (name, t)
+
+
+def test_sweep_matches_row_by_row_replay():
+    assert Backtest(HISTORY, SETTLED).markets == ["top_10", "win"]
+    assert_matches_replay()
+    assert_matches_replay(fee=1.0, side="NO")
+    assert_matches_replay(market="win")
+    # KXC has no close_ts, so its last quote (t=500) stands in for the close
+    assert_matches_replay(hours=(0.0, 10_000 / 3600 - 0.05))
+
+def test_threshold_crossing_and_reentry_after_decay():
+    bt = Backtest(HISTORY, SETTLED)
+    # KXA YES enters when the edge first reaches the threshold, at that quote's ask
+    assert bt.run(5.0).loc["win", "cost"] == 10.0 and bt.run(7.5).loc["win", "cost"] == 12.0
+    # KXB NO: one contract per series, bought at the 6-point quote; 6.5 waits through the decay for the 7-point one
+    no = bt.run(5.0, side="NO").loc["top_10"]
+    assert no["bets"] == 1 and no["cost"] == 60.0 and no["pnl"] == 40.0
+    assert bt.run(6.5, side="NO").loc["top_10", "cost"] == 55.0
+    assert bt.run(50.0).loc["All", "bets"] == 0
+
+def test_calibration_matches_the_entered_contracts():
+    bt = Backtest(HISTORY, SETTLED)
+    cal = bt.calibration(min_edge=2.0, bins=4)
+    expected = replay(HISTORY, SETTLED, [2.0])
+    for name in bt.markets:
+        bets, wins, _, _ = expected[(name, 2.0)]
+        assert cal.loc[name, "n"].sum() == bets
+        assert (cal.loc[name, "realized"] * cal.loc[name, "n"]).sum() == pytest.approx(wins)
+
+def test_empty_history():
+    bt = Backtest(quotes(), SETTLED)
+    swept = bt.sweep([0.0, 5.0])
+    assert list(swept.index) == [(0.0, "All"), (5.0, "All")] and (swept["bets"] == 0).all()
+    assert bt.run(0.0).loc["All", "bets"] == 0 and bt.calibration().empty
@@ -0,0 +1,107 @@
+"""ResponseCache single-flight fetches, within a process and across two caches sharing one file."""
+
+import sys
+import time
+import logging
+import threading
+
+from edgefinder.cache import ResponseCache
+from edgefinder.metrics import METRICS
+
+
+def run_all(*fns):
+    out, threads = [None] * len(fns), []
+    for i, fn in enumerate(fns):
+        threads.append(threading.Thread(target=lambda i=i, fn=fn: out.__setitem__(i, fn())))
+        threads[-1].start()
+    for t in threads: t.join(10)
+    return out
+
+def counting(value, delay=0.0):
+    calls = []
+    def fetch(deadline):
+        calls.append(deadline); time.sleep(delay)
+        return value
+    return fetch, calls
+
+
+def test_miss_is_fetched_once_for_all_threads(tmp_path):
+    cache = ResponseCache(str(tmp_path / "c.sqlite"))
+    fetch, calls = counting({"v": 1}, delay=0.2)
+    assert run_all(*[lambda: cache.get("k", fetch, ttl=60)] * 8) == [{"v": 1}] * 8
+    assert len(calls) == 1
+    assert cache.get("k", fetch, ttl=60) == {"v": 1} and len(calls) == 1 and cache.hits == 1
+
+def test_stale_entry_is_served_while_one_refresh_runs(tmp_path):
+    cache = ResponseCache(str(tmp_path / "c.sqlite"))
+    cache.get("k", counting(1)[0], ttl=60)
+    fetch, calls = counting(2, delay=0.2)
+    assert cache.get("k", fetch, ttl=0, stale_ttl=60) == 1 and cache.get("k", fetch, ttl=0, stale_ttl=60) == 1
+    time.sleep(0.4)
+    assert len(calls) == 1 and cache.get("k", fetch, ttl=60) == 2
+
+def test_lease_elects_one_fetcher_across_caches(tmp_path):
+    path = str(tmp_path / "c.sqlite")
+    first, second = ResponseCache(path), ResponseCache(path)
+    fetch, calls = counting("v", delay=0.3)
+    assert run_all(lambda: first.get("k", fetch, ttl=60), lambda: (time.sleep(0.05), second.get("k", fetch, ttl=60))[1]) == ["v", "v"]
+    assert len(calls) == 1
+
+def test_lease_won_after_the_holder_stored_returns_the_stored_row(tmp_path):
+    cache = ResponseCache(str(tmp_path / "c.sqlite"))
+    # A poller read the row just before the holder's _store, then took the lease _store freed
+    cache._store("k", "v")
+    fetch, calls = counting("again")
+    assert cache._fetch_single_flight("k", fetch, ttl=60, deadline=None) == "v" and calls == []
+    assert cache.inflight == {} and cache._acquire("k")
+
+def test_failed_background_refresh_is_logged_and_counted(tmp_path, caplog):
+    cache = ResponseCache(str(tmp_path / "c.sqlite"))
+    cache.get("k", counting(1)[0], ttl=60)
+    errors = METRICS.snapshot()[0].get(("cache_refreshes", (("result", "error"),)), 0)
+    def broken(deadline): raise ConnectionError("down")
+    with caplog.at_level(logging.INFO, logger="edgefinder"):
+        assert cache.get("k", broken, ttl=0, stale_ttl=60) == 1
+        for _ in range(40):
+            if cache.inflight == {} and "cache_refresh_error" in caplog.text: break
+            time.sleep(0.05)
+    assert "ConnectionError: down" in caplog.text
+    assert METRICS.snapshot()[0].get(("cache_refreshes", (("result", "error"),)), 0) == errors + 1
+
+def test_a_slow_lease_does_not_block_other_keys(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "c.sqlite"))
+    acquire, entered = cache._acquire, threading.Event()
+    def slow_acquire(key):
+        # A lease write stuck behind another connection's write lock
+        if key == "slow": entered.set(); time.sleep(0.5)
+        return acquire(key)
+    monkeypatch.setattr(cache, "_acquire", slow_acquire)
+    slow = threading.Thread(target=cache.get, args=("slow", counting(0)[0], 60))
+    slow.start()
+    assert entered.wait(2)
+    start = time.monotonic()
+    assert cache.get("fast", counting(1)[0], ttl=60) == 1
+    assert time.monotonic() - start < 0.25
+    slow.join()
+
+def test_failed_fetch_releases_the_key(tmp_path):
+    cache = ResponseCache(str(tmp_path / "c.sqlite"))
+    def broken(deadline): raise ConnectionError("down")
+    try: cache.get("k", broken, ttl=60)
+    except ConnectionError: pass
+    assert cache.inflight == {}
+    # The lease was released, so the next caller fetches straight away instead of polling until it expires
+    start = time.monotonic()
+    assert cache.get("k", counting(3)[0], ttl=60, deadline=time.monotonic() + 1) == 3
+    assert time.monotonic() - start < 0.2
+
+def test_cached_kalshi_markets_are_interned_on_a_hit(tmp_path, monkeypatch):
+    from edgefinder import api
+    cache = ResponseCache(str(tmp_path / "c.sqlite"))
+    ticker, title = "".join(["KXPGATOUR-", "MAST26"]), "".join(["Scottie ", "Scheffler"])
+    monkeypatch.setattr(api, "fetch_kalshi_markets", lambda series, deadline=None: [{"event_ticker": ticker, "yes_sub_title": title}])
+    kalshi = api.cached_fetchers(cache, "key")["kalshi"]
+    kalshi("KXPGATOUR", None)
+    # Served from the cache file: json.loads hands back new strings, which are interned again
+    hit = kalshi("KXPGATOUR", None)[0]
+    assert cache.hits == 1 and hit["event_ticker"] is sys.intern(ticker) and hit["yes_sub_title"] is sys.intern(title)
@@ -0,0 +1,157 @@
+"""HttpClient retries and revalidation, and the Kalshi/fetch_all error reporting, against a local HTTP server."""
+
+import json
+import time
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+import requests
+
+from edgefinder import api
+from edgefinder.client import HttpClient, HttpError, PartialResult
+from edgefinder.config import HTTP_RETRIES, KALSHI_SERIES
+
+
+def fake_handler(route, hits):
+    """Answers every GET with route(path, query, headers) -> (status, headers, body) and logs each hit in hits."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            query = dict(parse_qsl(url.query))
+            hits.append((url.path, query, dict(self.headers)))
+            status, headers, body = route(url.path, query, self.headers)
+            data = b"" if body is None else json.dumps(body).encode()
+            self.send_response(status)
+            for k, v in headers.items(): self.send_header(k, v)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            if data: self.wfile.write(data)
+
+        def log_message(self, *args): pass
+
+    return Handler
+
+
+@pytest.fixture
+def serve(http_server):
+    def start(route):
+        hits = []
+        server = http_server(fake_handler(route, hits))
+        server.hits = hits
+        return server
+    return start
+
+@pytest.fixture
+def client():
+    # No token buckets and millisecond backoff, so only Retry-After can make a test slow
+    session = requests.Session()
+    yield HttpClient(session, limits={}, backoff=(0.01, 0.02))
+    session.close()
+
+def scripted(*responses):
+    """A route that plays responses in order and then repeats the last one."""
+    it = iter(responses)
+    last = [None]
+    def route(path, query, headers):
+        last[0] = next(it, last[0])
+        return last[0]
+    return route
+
+
+def test_429_waits_for_retry_after_then_succeeds(serve, client):
+    server = serve(scripted((429, {"Retry-After": "0.3"}, None), (200, {}, {"ok": True})))
+    start = time.monotonic()
+    assert client.get_json(server.url + "/x") == {"ok": True}
+    assert time.monotonic() - start >= 0.3
+    assert len(server.hits) == 2 and client.stats["retries"] == 1
+
+def test_5xx_is_retried_until_attempts_run_out(serve, client):
+    server = serve(scripted((503, {}, None)))
+    with pytest.raises(HttpError) as e:
+        client.get_json(server.url + "/x")
+    assert e.value.status == 503 and e.value.attempts == HTTP_RETRIES + 1
+    assert len(server.hits) == HTTP_RETRIES + 1 and client.stats["retries"] == HTTP_RETRIES
+
+def test_404_is_not_retried(serve, client):
+    server = serve(scripted((404, {}, None)))
+    with pytest.raises(HttpError) as e:
+        client.get_json(server.url + "/x")
+    assert e.value.status == 404 and e.value.attempts == 1
+    assert len(server.hits) == 1 and client.stats["retries"] == 0
+
+def test_etag_is_revalidated_and_304_reuses_the_body(serve, client):
+    def route(path, query, headers):
+        if headers.get("If-None-Match") == '"v1"': return 304, {"ETag": '"v1"'}, None
+        return 200, {"ETag": '"v1"'}, {"markets": [1, 2]}
+    server = serve(route)
+    first = client.get_json(server.url + "/m", {"series_ticker": "A"})
+    again = client.get_json(server.url + "/m", {"series_ticker": "A"})
+    assert again is first and first == {"markets": [1, 2]}
+    assert "If-None-Match" not in server.hits[0][2] and server.hits[1][2]["If-None-Match"] == '"v1"'
+    assert client.stats["not_modified"] == 1
+    # Validators are per request: other params start unconditional
+    client.get_json(server.url + "/m", {"series_ticker": "B"})
+    assert "If-None-Match" not in server.hits[2][2]
+
+
+def market(ticker, **extra):
+    return {"ticker": ticker, "event_ticker": "KXPGATOP5-26X", "yes_sub_title": ticker, "yes_ask": 20, "no_ask": 81, **extra}
+
+def paged_markets(fail=None, slow=(), empty=()):
+    """/markets in pages cursor None -> "p2" -> "p3"; fail maps a series to the page that 404s."""
+    pages = {None: ("p2", ["A", "B"]), "p2": ("p3", ["C", "D"]), "p3": (None, ["E"])}
+    def route(path, query, headers):
+        series, page = query["series_ticker"], query.get("cursor")
+        if series in slow: time.sleep(2)
+        if series in empty: return 200, {}, {"markets": [], "cursor": ""}
+        if (fail or {}).get(series, "never") == page: return 404, {}, None
+        cursor, tickers = pages[page]
+        return 200, {}, {"markets": [market(f"{series}-{t}", volume=5) for t in tickers], "cursor": cursor}
+    return route
+
+@pytest.fixture
+def kalshi(serve, client, monkeypatch):
+    def start(**kw):
+        server = serve(paged_markets(**kw))
+        monkeypatch.setattr(api, "KALSHI_BASE", server.url)
+        monkeypatch.setattr(api, "_client", client)
+        return server
+    return start
+
+def test_kalshi_pages_are_followed_and_projected(kalshi):
+    server = kalshi()
+    markets = api.fetch_kalshi_markets("S")
+    assert [m["ticker"] for m in markets] == ["S-A", "S-B", "S-C", "S-D", "S-E"]
+    assert all("volume" not in m for m in markets)
+    assert [q.get("cursor") for _, q, _ in server.hits] == [None, "p2", "p3"]
+    assert server.hits[0][1] == {"series_ticker": "S", "status": "open", "limit": "200"}
+
+def test_kalshi_failure_on_page_3_is_a_partial_result(kalshi):
+    kalshi(fail={"S": "p3"})
+    with pytest.raises(PartialResult) as e:
+        api.fetch_kalshi_markets("S")
+    assert [m["ticker"] for m in e.value.value] == ["S-A", "S-B", "S-C", "S-D"]
+    assert "404" in e.value.reason
+
+def test_kalshi_failure_on_page_1_is_raised(kalshi):
+    kalshi(fail={"S": None})
+    with pytest.raises(HttpError):
+        api.fetch_kalshi_markets("S")
+
+def test_fetch_all_reports_errors_and_keeps_partial_series(kalshi):
+    top_5, top_20, make_cut = KALSHI_SERIES["top_5"], KALSHI_SERIES["top_20"], KALSHI_SERIES["make_cut"]
+    kalshi(fail={top_5: "p3"}, slow={top_20}, empty={make_cut})
+    def live(tour, deadline): raise HttpError(500, "live", HTTP_RETRIES + 1)
+    result = api.fetch_all(deadline_s=1, fetchers={"events": lambda deadline: None, "live": live,
+                                                   "pretournament": lambda tour, deadline: {"players": []}})
+    # live failed, top_5 stopped on page 3 and top_20 outlived the deadline; an empty series is not an error
+    assert set(result["errors"]) == {"live", "top_5", "top_20"}
+    assert sorted(result["incomplete"]) == sorted(result["errors"])
+    assert "500" in result["errors"]["live"] and "404" in result["errors"]["top_5"]
+    assert result["pretournament"] == {"players": []} and result["live"] is None and result["pretournament_error"] is None
+    by_type = result["kalshi_by_type"]
+    assert [m["ticker"] for m in by_type["top_5"]] == [f"{top_5}-{t}" for t in "ABCD"]
+    assert len(by_type["win"]) == len(by_type["top_10"]) == 5
+    assert "top_20" not in by_type and "make_cut" not in by_type
@@ -0,0 +1,63 @@
+"""Order-book walks, the YES/NO ask ladders and the depth prefilter, on hand-built books."""
+
+import pytest
+
+from edgefinder.depth import apply_fills, ask_ladder, depth_candidates, price_depth, walk_book
+
+
+def edge(side, dg_prob, cost):
+    return {"side": side, "dg_prob": dg_prob, "cost": cost, "edge": dg_prob - cost}
+
+def snapshot(**rows):
+    return {"rows": rows, "edges": [e for es in rows.values() for e in es]}
+
+
+def test_yes_asks_are_the_complement_of_no_bids():
+    book = {"yes": [[38, 5], [40, 2]], "no": [[55, 10], [57, 3], [0, 4], [100, 1], [52, 0]]}
+    # Buying YES lifts NO bids at 100 - price, cheapest first; empty and out-of-range levels are dropped
+    assert ask_ladder(book, "YES") == [(43, 3), (45, 10)]
+    assert ask_ladder(book, "NO") == [(60, 2), (62, 5)]
+    assert ask_ladder({"yes": None}, "NO") == [] and ask_ladder({}, "YES") == []
+
+def test_stake_is_walked_level_by_level():
+    fill = walk_book([(40, 10), (42, 10), (45, 100)], prob=50, stake=10)
+    # $10 = 1000 cents: 10 @ 40 + 10 @ 42 = 820, then 4 @ 45 = 180
+    assert fill["filled"] == 24 and fill["fill"] == pytest.approx(1000 / 24)
+    assert fill["fill_edge"] == pytest.approx(50 - 1000 / 24)
+
+def test_a_thin_ladder_only_partly_fills_the_stake():
+    fill = walk_book([(40, 3), (44, 2)], prob=50, stake=50)
+    assert fill["filled"] == 5 and fill["fill"] == pytest.approx((3 * 40 + 2 * 44) / 5)
+    empty = walk_book([], prob=50, stake=50)
+    assert empty["filled"] == 0 and empty["fill"] is None and empty["fill_edge"] is None and empty["max_size"] == 0
+
+def test_max_size_stops_at_the_first_level_at_or_above_the_model():
+    fill = walk_book([(40, 10), (45, 5), (50, 7), (55, 9)], prob=50, stake=1)
+    assert fill["max_size"] == 15 and fill["max_ev"] == pytest.approx((10 * 10 + 5 * 5) / 100)
+    # The stake only bought 2 contracts; max_size is about the book, not the stake
+    assert fill["filled"] == 2
+    assert walk_book([(50, 7)], prob=50)["max_size"] == 0
+
+def test_candidates_are_the_best_edges_over_min_edge_up_to_the_limit():
+    snap = snapshot(**{"KX-A": [edge("YES", 30, 20), edge("NO", 70, 72)], "KX-B": [edge("YES", 50, 44)],
+                       "KX-C": [edge("NO", 60, 51)], "KX-D": [edge("YES", 12, 10)],
+                       "win:KX:Someone": [edge("YES", 40, 20)]})
+    # Synthetic keys (no real ticker) have no book to fetch
+    assert depth_candidates(snap, min_edge=3, limit=10) == {"KX-A": [("YES", 30)], "KX-C": [("NO", 60)], "KX-B": [("YES", 50)]}
+    assert depth_candidates(snap, min_edge=3, limit=2) == {"KX-A": [("YES", 30)], "KX-C": [("NO", 60)]}
+    # Both sides of a picked ticker share its one book, even past the limit
+    both = snapshot(**{"KX-A": [edge("YES", 30, 20), edge("NO", 70, 65)], "KX-B": [edge("YES", 50, 44)]})
+    assert depth_candidates(both, min_edge=3, limit=1) == {"KX-A": [("YES", 30), ("NO", 70)]}
+
+def test_price_depth_fetches_only_candidates_and_reports_failures():
+    snap = snapshot(**{"KX-A": [edge("YES", 50, 40)], "KX-B": [edge("NO", 60, 50)], "KX-C": [edge("YES", 20, 19)]})
+    fetched = []
+    def fetch(ticker, deadline):
+        fetched.append(ticker)
+        if ticker == "KX-B": raise ConnectionError("down")
+        return {"no": [[60, 10]]}
+    priced = price_depth(snap, stake=10, min_edge=3, fetch=fetch)
+    assert sorted(fetched) == ["KX-A", "KX-B"] and priced["books"] == 1 and priced["errors"] == {"KX-B": "down"}
+    assert priced["fills"][("KX-A", "YES")]["fill"] == 40
+    rows = apply_fills(snap, priced["fills"])
+    assert [r["fill"] for r in rows] == [40, None, None] and rows[0]["cost"] == 40
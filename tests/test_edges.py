@@ -0,0 +1,171 @@
+"""Delta rescans against a full edge-engine pass, and EdgeStore against filter_edges."""
+
+import random
+
+import pytest
+
+from benchmarks import fixtures
+from edgefinder import registry
+from edgefinder.config import DG_FIELDS, MARKET_LABELS
+from edgefinder.edges import SORT_KEYS, Edge, EdgeStore, calculate_all_edges, filter_edges, rescan_edges, run_edge_engine
+from edgefinder.events import get_event_code, get_tournament_label, identify_current_event_code
+from edgefinder.names import PlayerCrosswalk, format_player_name, get_kalshi_player_name, player_key
+from edgefinder.registry import EventRegistry, short_label
+
+
+@pytest.fixture(autouse=True)
+def event_registry(monkeypatch):
+    # An empty in-memory registry: event codes and labels come from the tickers alone
+    monkeypatch.setattr(registry, "_registry", EventRegistry(path=None))
+
+
+def dg(*players, event_name="Masters Tournament"):
+    """DG payload from (dg_id, "Last, First", win, top_10) players."""
+    return {"event_name": event_name, "players": [{"dg_id": i, "player_name": n, "win": w, "top_10": t} for i, n, w, t in players]}
+
+def market(ticker, title, yes_ask, no_ask, event="KXPGATOUR-MAST26"):
+    return {"ticker": ticker, "event_ticker": event, "yes_sub_title": title, "yes_ask": yes_ask, "no_ask": no_ask}
+
+PLAYERS = [(1, "Scheffler, Scottie", 0.22, 0.71), (2, "McIlroy, Rory", 0.12, 0.55), (3, "Åberg, Ludvig", 0.05, 0.33)]
+KALSHI = {
+    "win": [market("W-SS", "Scottie Scheffler", 20, 82), market("W-RM", "Rory McIlroy", 11, 90), market("W-LA", "Ludvig Aberg", 6, 95),
+            market("W-JR", "Jon Rahm", 7, 94), market("W-XX", "Tiger Woods", 2, 99, event="KXPGATOUR-USOP26")],
+    "top_10": [market("T-SS", "Scottie Scheffler", 65, 38), market("T-RM", "Rory McIlroy", 50, 52), market("T-LA", "Ludvig Aberg", None, 70)],
+}
+
+def with_market(kalshi, m_type, ticker, **changes):
+    return {t: [dict(m, **changes) if t == m_type and m["ticker"] == ticker else m for m in ms] for t, ms in kalshi.items()}
+
+def assert_same_as_full(snapshot, dg_data, kalshi):
+    full, _ = rescan_edges(None, dg_data, kalshi, PlayerCrosswalk())
+    assert snapshot["edges"] == run_edge_engine(dg_data, kalshi, PlayerCrosswalk())["edges"] == full["edges"]
+    for k in ("rows", "matched", "skipped", "market_player", "markets", "players", "event_code"):
+        assert snapshot[k] == full[k], k
+
+
+def test_delta_rescan_equals_a_full_engine_pass():
+    data, cw = dg(*PLAYERS), PlayerCrosswalk()
+    snap, delta = rescan_edges(None, data, KALSHI, cw)
+    assert delta["full"] and snap["edges"]
+    assert_same_as_full(snap, data, KALSHI)
+
+    # One quote moves: only that market is recomputed
+    kalshi = with_market(KALSHI, "win", "W-RM", yes_ask=9)
+    snap, delta = rescan_edges(snap, data, kalshi, cw)
+    assert not delta["full"] and delta["recomputed"] == 1 and [k for k, _, _ in delta["moved"]] == ["W-RM"]
+    assert_same_as_full(snap, data, kalshi)
+
+    # A DG probability moves: that player's markets are recomputed
+    players = [PLAYERS[0], (2, "McIlroy, Rory", 0.15, 0.55), PLAYERS[2]]
+    data = dg(*players)
+    snap, delta = rescan_edges(snap, data, kalshi, cw)
+    assert delta["recomputed"] == 2
+    assert_same_as_full(snap, data, kalshi)
+
+    # A late entrant matches a title that missed before
+    data = dg(*players, (4, "Rahm, Jon", 0.08, 0.45))
+    snap, delta = rescan_edges(snap, data, kalshi, cw)
+    assert not delta["full"] and "W-JR" in snap["matched"]
+    assert_same_as_full(snap, data, kalshi)
+
+    # Markets leave and join the same event
+    kalshi = {"win": kalshi["win"][1:] + [market("W-NEW", "Ludvig Aberg", 3, 98)], "top_10": kalshi["top_10"]}
+    snap, delta = rescan_edges(snap, data, kalshi, cw)
+    assert not delta["full"] and delta["recomputed"] == 1 and "W-SS" in {k for k, _ in delta["disappeared"]}
+    assert_same_as_full(snap, data, kalshi)
+
+def test_unchanged_rescan_keeps_its_version():
+    data, cw = dg(*PLAYERS), PlayerCrosswalk()
+    snap, _ = rescan_edges(None, data, KALSHI, cw)
+    again, delta = rescan_edges(snap, data, KALSHI, cw)
+    assert delta["recomputed"] == 0 and again["version"] == snap["version"] and again["edges"] == snap["edges"]
+
+
+def dict_loop(dg_data, kalshi_by_type, crosswalk):
+    """The per-market dict loop the columnar engine replaced, matching titles through the same crosswalk."""
+    players = dg_data.get("players", [])
+    by_key = {player_key(p): p for p in players}
+    current_event_code = identify_current_event_code(kalshi_by_type, dg_data.get("event_name", ""))
+    fallback_label = short_label(dg_data.get("event_name", "Unknown"))
+    event_key = current_event_code or dg_data.get("event_name", "Unknown")
+    crosswalk.sync_field(event_key, players)
+    edges, matched, skipped = [], 0, 0
+    for m_type, markets in kalshi_by_type.items():
+        for m in markets:
+            if current_event_code:
+                if get_event_code(m) and get_event_code(m) != current_event_code: skipped += 1; continue
+            k_name = get_kalshi_player_name(m)
+            if not k_name: continue
+            yes_ask, no_ask = m.get("yes_ask"), m.get("no_ask")
+            dg = by_key.get(crosswalk.resolve(event_key, m.get("yes_sub_title", "")))
+            if not dg: continue
+            matched += 1
+            dg_prob = dg.get(DG_FIELDS.get(m_type))
+            if dg_prob is None: continue
+            dg_yes = dg_prob * 100 if dg_prob <= 1 else float(dg_prob); dg_no = 100 - dg_yes
+            tournament = get_tournament_label(m, fallback=fallback_label)
+            display_name = format_player_name(dg.get("player_name", k_name))
+            if yes_ask and yes_ask > 0:
+                edges.append({"player": display_name, "market": MARKET_LABELS.get(m_type), "side": "YES", "event": tournament,
+                    "dg_prob": dg_yes, "dg_yes": dg_yes, "dg_no": dg_no, "cost": yes_ask,
+                    "edge": dg_yes - yes_ask, "profit": 100 - yes_ask, "rr": (100 - yes_ask) / yes_ask})
+            if no_ask and 0 < no_ask < 100:
+                edges.append({"player": display_name, "market": MARKET_LABELS.get(m_type), "side": "NO", "event": tournament,
+                    "dg_prob": dg_no, "dg_yes": dg_yes, "dg_no": dg_no, "cost": no_ask,
+                    "edge": dg_no - no_ask, "profit": 100 - no_ask, "rr": (100 - no_ask) / no_ask})
+    return edges, matched, len(players), skipped
+
+def awkward(dg_data, kalshi_by_type, percent):
+    """A slate with percent or fraction probabilities, missing fields and asks the loop skipped."""
+    rnd = random.Random(3)
+    players = []
+    for p in dg_data["players"]:
+        p = {k: v * 100 if percent and k in DG_FIELDS.values() else v for k, v in p.items()}
+        if rnd.random() < 0.05: del p["top_10"]
+        players.append(p)
+    kalshi = {}
+    for m_type, markets in kalshi_by_type.items():
+        kalshi[m_type] = [dict(m, **rnd.choice([{}, {}, {}, {"yes_ask": None}, {"yes_ask": 0}, {"no_ask": 100}, {"no_ask": None},
+                                                 {"yes_sub_title": ""}, {"yes_sub_title": "Nobody Atall"}, {"event_ticker": ""}]))
+                          for m in markets]
+    return dict(dg_data, players=players), kalshi
+
+@pytest.mark.parametrize("percent", [False, True])
+def test_columnar_engine_equals_the_dict_loop(percent):
+    dg_data, kalshi = awkward(*fixtures.slate(1500), percent)
+    expected = dict_loop(dg_data, kalshi, PlayerCrosswalk())
+    edges, matched, field_size, skipped = calculate_all_edges(dg_data, kalshi, PlayerCrosswalk())
+    assert expected[0] and skipped and (matched, field_size, skipped) == expected[1:]
+    assert [dict(e.items()) for e in edges] == expected[0]
+    # Ask types survive: int cents stay ints
+    assert [type(e["cost"]) for e in edges] == [type(e["cost"]) for e in expected[0]]
+
+
+def random_edges(n, seed=7):
+    rnd = random.Random(seed)
+    edges = []
+    for i in range(n):
+        side, cost = rnd.choice(["YES", "NO"]), rnd.randint(1, 99)
+        # Few distinct edge values, so ties are common and scan order has to break them
+        edge = rnd.choice([-4.5, -1.0, 0.0, 0.5, 2.0, 2.0, 3.25, 7.0, 12.0])
+        edges.append(Edge(f"Player {i % 37}", rnd.choice(["Win", "Top 10", "Make Cut"]), side, "Masters", 50.0, cost, edge, (100 - cost) / cost))
+    return edges
+
+@pytest.mark.parametrize("as_dicts", [False, True])
+def test_edge_store_matches_filter_edges(as_dicts):
+    edges = random_edges(400)
+    if as_dicts: edges = [dict(e) for e in edges]
+    store = EdgeStore(edges)
+    for min_edge in (-10.0, -1.0, 0.0, 0.25, 2.0, 7.0, 20.0):
+        for side in ("All", "YES", "NO"):
+            for mkt in ("All", "Win", "Top 10", "Make Cut", "Top 5"):
+                for sort_by in SORT_KEYS:
+                    assert store.query(min_edge, side, mkt, sort_by) == filter_edges(edges, min_edge, side, mkt, sort_by), (min_edge, side, mkt, sort_by)
+                rows = filter_edges(edges, min_edge, side, mkt)
+                yes, no = sum(e["side"] == "YES" for e in rows), sum(e["side"] == "NO" for e in rows)
+                avg = sum(e["edge"] for e in rows) / len(rows) if rows else 0
+                assert store.stats(min_edge, side, mkt)[:2] == (yes, no) and store.stats(min_edge, side, mkt)[2] == pytest.approx(avg)
+
+def test_empty_edge_store():
+    store = EdgeStore([])
+    assert store.query(0.0) == [] and store.stats(0.0) == (0, 0, 0) and store.count(0.0) == (0, 0)
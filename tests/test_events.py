@@ -0,0 +1,11 @@
+"""Pairing Kalshi event labels with DG event names."""
+
+from edgefinder.events import named_event_code
+
+
+def test_generic_words_do_not_pair_events():
+    labels = {"USOP": "US Open", "MAST": "Masters"}
+    assert named_event_code({"USOP": "US Open"}, "Genesis Scottish Open") is None
+    assert named_event_code(labels, "Masters Tournament") == "MAST"
+    assert named_event_code({"SCOT": "Scottish Open", **labels}, "Genesis Scottish Open") == "SCOT"
+    assert named_event_code({"RSM": "RSM Classic"}, "Rocket Classic") is None
@@ -0,0 +1,69 @@
+"""The /edges feed served from a Refresher publishing stub scan results."""
+
+import csv
+import io
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from edgefinder.depth import DEPTH_COLUMNS
+from edgefinder.edges import EDGE_COLUMNS
+from edgefinder.feed import feed_handler
+from edgefinder.refresher import Refresher
+
+
+def row(player, edge, **extra):
+    return {"player": player, "market": "Top 10", "side": "YES", "event": "Masters", "dg_prob": 40 + edge, "dg_yes": 40 + edge,
+            "dg_no": 60 - edge, "cost": 40, "edge": edge, "profit": 60, "rr": 1.5, **extra}
+
+def result(edges, fill=None):
+    """scan()-shaped result on an unchanging snapshot; fill adds depth-priced copies of the rows, as depth_stake does."""
+    snapshot = {"event_code": "KXPGA-26MAST", "version": 3, "edges": edges}
+    out = {"event_name": "Masters", "source": "PRE-TOURNAMENT", "edges": edges, "matched": len(edges), "field_size": 90, "snapshot": snapshot}
+    if fill is not None:
+        out["edges"] = [{**e, "fill": fill, "fill_edge": e["dg_prob"] - fill, "filled": 1.0, "max_size": 10, "max_ev": 2.0} for e in edges]
+        out["depth"] = {"stake": 50, "books": 1, "priced": len(edges), "errors": {}}
+    return out
+
+@pytest.fixture
+def feed(http_server):
+    refreshers = []
+    def start(*results):
+        it = iter(results)
+        refresher = Refresher(lambda prev: next(it), cadence_s={"event": 60, "idle": 60, "live": 60}).start()
+        refreshers.append(refresher)
+        return refresher, http_server(feed_handler(refresher)).url + "/edges"
+    yield start
+    for refresher in refreshers: refresher.stop()
+
+def get(url, etag=None):
+    request = urllib.request.Request(url, headers={"If-None-Match": etag} if etag else {})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as r: return r.status, r.headers["ETag"], r.read()
+    except urllib.error.HTTPError as e: return e.code, e.headers["ETag"], b""
+
+
+def test_rows_carry_edge_columns_and_an_unchanged_table_is_a_304(feed):
+    edges = [row("Scottie Scheffler", 6.0), row("Rory McIlroy", 2.0)]
+    refresher, url = feed(result(edges), result(edges))
+    refresher.wait(5)
+    status, tag, body = get(url + "?min_edge=5")
+    data = json.loads(body)
+    assert status == 200 and data["count"] == 1 and list(data["edges"][0]) == EDGE_COLUMNS
+    refresher.refresh_now(); refresher.wait(5, after=1)
+    assert get(url + "?min_edge=5", tag)[0] == 304
+
+def test_depth_priced_scan_serves_fill_columns(feed):
+    edges = [row("Scottie Scheffler", 6.0), row("Rory McIlroy", 2.0)]
+    refresher, url = feed(result(edges, fill=42), result(edges, fill=44))
+    refresher.wait(5)
+    status, tag, body = get(url + "?format=csv")
+    rows = list(csv.DictReader(io.StringIO(body.decode())))
+    assert status == 200 and list(rows[0]) == EDGE_COLUMNS + DEPTH_COLUMNS
+    assert [r["fill"] for r in rows] == ["42", "42"]
+    # The next scan re-priced the books on the same snapshot version: the old tag no longer matches
+    refresher.refresh_now(); refresher.wait(5, after=1)
+    status, _, body = get(url + "?format=csv", tag)
+    assert status == 200 and [r["fill"] for r in csv.DictReader(io.StringIO(body.decode()))] == ["44", "44"]
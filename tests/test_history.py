@@ -0,0 +1,106 @@
+"""SnapshotHistory appends and reads against a store in a temporary directory."""
+
+import threading
+
+import numpy as np
+
+from edgefinder.history import HISTORY_COLUMNS, SnapshotHistory
+
+
+def snapshot(*quotes):
+    """rescan_edges-shaped snapshot from (ticker, player, market type, side, dg_prob, cost) quotes."""
+    rows, markets, players = {}, {}, {}
+    for ticker, player, m_type, side, dg_prob, cost in quotes:
+        rows.setdefault(ticker, []).append({"side": side, "dg_prob": dg_prob, "cost": cost, "edge": dg_prob - cost})
+        markets[ticker], players[ticker] = (m_type, "", ticker, cost, 100 - cost), player
+    return {"rows": rows, "markets": markets, "market_player": players}
+
+
+def stamps(frame):
+    return [int(t.timestamp()) for t in frame["ts"]]
+
+def test_torn_strings_tail_is_trimmed_before_the_next_append(tmp_path):
+    h = SnapshotHistory(str(tmp_path))
+    h.append(snapshot(("KXA-1", "Scottie Scheffler", "top_10", "YES", 40.0, 30)), ts=100)
+    # A writer died halfway through a new name: its rows never landed, only part of its string did
+    with open(tmp_path / "strings.txt", "ab") as f: f.write("Ludvig Åb".encode("utf-8"))
+    h = SnapshotHistory(str(tmp_path))
+    h.append(snapshot(("KXB-2", "Rory McIlroy", "win", "NO", 12.0, 80)), ts=200)
+    data = (tmp_path / "strings.txt").read_bytes()
+    assert b"Ludvig" not in data and data.endswith(b"\n")
+    frame = SnapshotHistory(str(tmp_path)).query()
+    assert list(frame["ticker"]) == ["KXA-1", "KXB-2"]
+    assert list(frame["player"]) == ["Scottie Scheffler", "Rory McIlroy"]
+    assert list(frame["market"]) == ["top_10", "win"]
+
+def test_round_trip_writes_only_moved_quotes(tmp_path):
+    h = SnapshotHistory(str(tmp_path))
+    a, b = ("KXA-1", "Scottie Scheffler", "top_10", "YES", 40.0, 30), ("KXB-2", 18417, "win", "NO", 88.5, 80)
+    assert h.append(snapshot(a, b), ts=100) == 2
+    assert h.append(snapshot(a, b), ts=110) == 0
+    assert h.append(snapshot(a, b[:4] + (89.0, 80)), ts=120) == 1
+    # A market that left the board closes its series with a NaN quote
+    assert h.append(snapshot(a), ts=130) == 1
+    frame = h.query()
+    assert list(frame["ticker"]) == ["KXA-1", "KXB-2", "KXB-2", "KXB-2"]
+    assert list(frame["player"]) == ["Scottie Scheffler", "18417", "18417", "18417"]
+    assert list(frame["side"]) == ["YES", "NO", "NO", "NO"]
+    assert stamps(frame) == [100, 100, 120, 130]
+    assert frame["ask"].tolist()[:3] == [30.0, 80.0, 80.0] and frame["dg_prob"].tolist()[2] == 89.0
+    assert frame["edge"].tolist()[0] == 10.0 and frame.iloc[3][["dg_prob", "ask", "edge"]].isna().all()
+    # A fresh reader sees the same rows
+    assert SnapshotHistory(str(tmp_path)).query().equals(frame)
+
+def test_time_range_and_key_filters(tmp_path):
+    h = SnapshotHistory(str(tmp_path))
+    for i, ts in enumerate((100, 200, 300, 400)):
+        h.append(snapshot(("KXA-1", "Scottie Scheffler", "top_10", "YES", 40.0 + i, 30),
+                          ("KXB-2", "Rory McIlroy", "win", "YES", 10.0 + i, 8)), ts=ts)
+    assert stamps(h.query(start=200, end=400)) == [200, 200, 300, 300]
+    assert stamps(h.query(start=250)) == [300, 300, 400, 400] and stamps(h.query(end=100)) == []
+    rory = h.query(player="Rory McIlroy")
+    assert set(rory["ticker"]) == {"KXB-2"} and rory["dg_prob"].tolist() == [10.0, 11.0, 12.0, 13.0]
+    assert stamps(h.query(start=200, end=300, ticker="KXA-1")) == [200]
+    assert len(h.query(market="win")) == 4 and len(h.query(player="Rory McIlroy", market="top_10")) == 0
+    assert len(h.query(player="Tiger Woods")) == 0
+
+def test_ts_stays_sorted_when_the_clock_steps_back(tmp_path):
+    h = SnapshotHistory(str(tmp_path))
+    h.append(snapshot(("KXA-1", "A", "win", "YES", 40.0, 30)), ts=500)
+    h.append(snapshot(("KXA-1", "A", "win", "YES", 41.0, 30)), ts=400)
+    assert stamps(h.query()) == [500, 500]
+
+def test_torn_column_rows_are_trimmed(tmp_path):
+    h = SnapshotHistory(str(tmp_path))
+    h.append(snapshot(("KXA-1", "A", "win", "YES", 40.0, 30)), ts=100)
+    with open(tmp_path / "ts", "ab") as f: f.write(b"\0" * 8)
+    with open(tmp_path / "ticker", "ab") as f: f.write(b"\0" * 2)
+    h.append(snapshot(("KXA-1", "A", "win", "YES", 41.0, 30)), ts=200)
+    assert (tmp_path / "ts").stat().st_size == 16 and (tmp_path / "ticker").stat().st_size == 8
+    assert h.query()["dg_prob"].tolist() == [40.0, 41.0]
+
+def test_concurrent_appends_lose_and_duplicate_nothing(tmp_path):
+    # Threads share one store (and its last-written quotes), interleaving different scans; a second store on the
+    # same directory stands in for another process. Each series must still be a step function: no repeated quote
+    shared, other = SnapshotHistory(str(tmp_path)), SnapshotHistory(str(tmp_path))
+    tickers = [f"KX-{i}" for i in range(2000)]
+    scans = [snapshot(*((t, f"Player {t}", "top_10", "YES", float(v + i % 3), 30) for i, t in enumerate(tickers))) for v in range(3)]
+    def writer(h, offset, side="YES"):
+        for r in range(12):
+            scan = scans[(offset + r) % 3]
+            if side == "NO": scan = {**scan, "rows": {k: [dict(e, side="NO") for e in rows] for k, rows in scan["rows"].items()}}
+            h.append(scan, ts=1000 + r)
+    threads = [threading.Thread(target=writer, args=(shared, j)) for j in range(6)] + [threading.Thread(target=writer, args=(other, 0, "NO"))]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    frame = SnapshotHistory(str(tmp_path)).query()
+    for _, series in frame.groupby(["ticker", "side"], observed=True):
+        assert not series["dg_prob"].diff().eq(0).any()
+    assert len(frame[frame["side"] == "NO"]) == 12 * len(tickers)
+    # Both stores share one dictionary: each string got a single code
+    lines = (tmp_path / "strings.txt").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == len(set(lines)) == 2 * len(tickers) + 1
+    assert set(frame["player"]) == {f"Player {t}" for t in tickers}
+    assert frame["ts"].is_monotonic_increasing
+    sizes = {c: (tmp_path / c).stat().st_size // np.dtype(t).itemsize for c, t in HISTORY_COLUMNS.items()}
+    assert set(sizes.values()) == {len(frame)}
@@ -0,0 +1,83 @@
+"""PlayerCrosswalk matching, per-event misses shared across threads, and the bound on remembered events."""
+
+import threading
+
+from edgefinder.names import PlayerCrosswalk, names_agree, normalize_name
+
+
+def field(*names):
+    return [{"dg_id": 100 + i, "player_name": n} for i, n in enumerate(names)]
+
+MASTERS = field("Scheffler, Scottie", "McIlroy, Rory", "Åberg, Ludvig", "Fitzpatrick, Matt")
+OPEN = [{"dg_id": 200 + i, "player_name": n} for i, n in enumerate(["Hovland, Viktor", "Thomas, Justin", "Im, Sungjae"])]
+
+
+def test_names_agree_on_surname_and_given_initial_or_nickname():
+    assert names_agree("matt fitzpatrick", "matthew fitzpatrick") and names_agree("j thomas", "justin thomas")
+    assert names_agree("ludvig aberg", "ludvig åberg") and names_agree("im sungjae", "sungjae im")
+    assert not names_agree("tom hovland", "tony hovland") and not names_agree("scottie", "scottie scheffler")
+    assert not names_agree("tom mcilroy", "tommy mcilroy") and not names_agree("rory mcilroy", "ro mcilroy")
+
+def test_suffixes_are_dropped_wherever_they_sit():
+    assert normalize_name("Højgaard, Rasmus Sr.") == normalize_name("Rasmus Højgaard") == "rasmus højgaard"
+    assert normalize_name("Davis Love III") == "davis love" and normalize_name("Young, Cameron Jr") == "cameron young"
+
+def test_exact_fuzzy_and_refused_matches():
+    cw = PlayerCrosswalk()
+    cw.sync_field("MAST", MASTERS)
+    assert cw.resolve("MAST", "Scottie Scheffler") == 100
+    assert cw.resolve("MAST", "Ludvig Aberg") == 102
+    # An agreeing fuzzy pick is applied, and listed for review until confirmed
+    assert cw.resolve("MAST", "Matthew Fitzpatrick") == 103
+    assert cw.resolve("MAST", "Rony McIlroy") is None
+    assert cw.misses("MAST") == {"Matthew Fitzpatrick": "fuzzy match: matt fitzpatrick (dg_id 103), not confirmed",
+                                 "Rony McIlroy": "no match in DG field (closest: rory mcilroy)"}
+    cw.sync_field("OPEN", OPEN)
+    assert cw.resolve("OPEN", "J Thomas") == 201 and "J Thomas" in cw.misses("OPEN")
+    cw.sync_field("OPEN", [{"dg_id": 210, "player_name": "Thomas, Jordan"}])
+    assert cw.resolve("OPEN", "J Thomas") is None and cw.misses("OPEN")["J Thomas"].startswith("ambiguous")
+
+def test_confirm_settles_a_fuzzy_pick_everywhere():
+    cw = PlayerCrosswalk()
+    cw.sync_field("MAST", MASTERS)
+    cw.resolve("MAST", "Matthew Fitzpatrick")
+    cw.confirm("Matthew Fitzpatrick", 103)
+    assert cw.version == 1 and cw.resolve("MAST", "Matthew Fitzpatrick") == 103 and cw.misses("MAST") == {}
+    cw.sync_field("OPEN", OPEN + [{"dg_id": 103, "player_name": "Fitzpatrick, Matt"}])
+    assert cw.resolve("OPEN", "Matthew Fitzpatrick") == 103 and cw.misses("OPEN") == {}
+    # Confirming another player replaces the pick
+    cw.confirm("Matthew Fitzpatrick", 101)
+    assert cw.resolve("MAST", "Matthew Fitzpatrick") == 101
+
+def test_withdrawn_player_is_not_priced_as_a_namesake():
+    cw = PlayerCrosswalk()
+    cw.sync_field("E", field("McIlroy, Tommy"))
+    assert cw.resolve("E", "Tom McIlroy") is None and "Tom McIlroy" in cw.misses("E")
+    # A fuzzy pick remembered by an older version gives way once the exact player is in the field
+    cw.events["E"] = {"Tom McIlroy": 100}
+    cw.sync_field("E", [{"dg_id": 200, "player_name": "McIlroy, Tom"}])
+    assert cw.resolve("E", "Tom McIlroy") == 200
+
+def test_parallel_events_keep_their_own_misses():
+    cw = PlayerCrosswalk()
+    def scan(event, players, titles):
+        for _ in range(50):
+            cw.sync_field(event, players)
+            for t in titles: cw.resolve(event, t)
+    threads = [threading.Thread(target=scan, args=("MAST", MASTERS, ["Scottie Scheffler", "Tiger Woods"])),
+               threading.Thread(target=scan, args=("OPEN", OPEN, ["Justin Thomas", "Jon Rahm", "Sungjae Im"]))]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert set(cw.misses("MAST")) == {"Tiger Woods"} and set(cw.misses("OPEN")) == {"Jon Rahm"}
+    assert not hasattr(cw, "last_event")
+
+def test_only_recent_events_stay_in_memory():
+    cw = PlayerCrosswalk(max_events=2)
+    for event in ("E1", "E2", "E3"):
+        cw.sync_field(event, MASTERS)
+        cw.resolve(event, "Scottie Scheffler"); cw.resolve(event, "Nobody Atall")
+    assert set(cw.pending) == set(cw.fields) == {"E2", "E3"} and cw.misses("E1") == {}
+    # Syncing keeps an event fresh, and an evicted event is rebuilt (resolved titles persist) on its next scan
+    cw.sync_field("E2", MASTERS); cw.sync_field("E1", MASTERS)
+    assert set(cw.fields) == {"E2", "E1"}
+    assert cw.resolve("E1", "Scottie Scheffler") == 100 and cw.resolve("E1", "Nobody Atall") is None
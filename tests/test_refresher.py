@@ -0,0 +1,42 @@
+"""Refresher publishing, and waiters woken by a failed scan instead of sleeping out their timeout."""
+
+import time
+
+from edgefinder.refresher import Refresher
+
+
+def scans(*steps, delay=0.1):
+    """scan(prev) that raises or returns each step in turn (after delay seconds), then repeats the last one."""
+    steps, calls = list(steps), []
+    def scan(prev):
+        calls.append(prev); time.sleep(delay)
+        step = steps[min(len(calls), len(steps)) - 1]
+        if isinstance(step, Exception): raise step
+        return {"snapshot": {"version": len(calls)}, "edges": [], "matched": 1, "source": "PRE-TOURNAMENT"}
+    return scan, calls
+
+def test_failed_scan_wakes_the_waiter_and_refresh_now_retries():
+    scan, calls = scans(ConnectionError("DG down"), "ok")
+    refresher = Refresher(scan, cadence_s={"live": 60, "event": 60, "idle": 60})
+    try:
+        start = time.monotonic()
+        refresher.start()
+        assert refresher.wait(timeout=5) is None
+        assert time.monotonic() - start < 2 and refresher.error == "ConnectionError: DG down"
+        # The retry runs now, not after the 60 s cadence
+        refresher.refresh_now()
+        view = refresher.wait(timeout=5)
+        assert view is not None and refresher.error is None and len(calls) == 2
+    finally:
+        refresher.stop()
+
+def test_wait_returns_a_publication_newer_than_after():
+    scan, _ = scans("ok")
+    refresher = Refresher(scan, cadence_s={"live": 60, "event": 60, "idle": 60}).start()
+    try:
+        first = refresher.wait(timeout=5)
+        assert first is not None and refresher.wait(timeout=0.1, after=1) is None
+        refresher.refresh_now()
+        assert refresher.wait(timeout=5, after=1) is not first
+    finally:
+        refresher.stop()
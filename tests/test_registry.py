@@ -0,0 +1,98 @@
+"""Matching Kalshi events to the DG schedule, and the event registry's merge and on-disk cache."""
+
+import json
+import time
+from datetime import date
+
+import pytest
+
+from benchmarks import fixtures
+from edgefinder import api
+from edgefinder.config import EVENT_REGISTRY_TTL
+from edgefinder.registry import EventRegistry, match_dg_event
+
+# Two events in overlapping weeks, and a third a week later
+SCHEDULE = [{"event_id": 1, "event_name": "The Genesis Invitational", "start_date": "2026-02-12"},
+            {"event_id": 2, "event_name": "Puerto Rico Open", "start_date": "2026-02-12"},
+            {"event_id": 3, "event_name": "Cognizant Classic", "start_date": "2026-02-19"}]
+KALSHI = fixtures.kalshi_markets(fixtures.field(5), events=2, series=["win"])
+
+
+def event(ticker, title, strike_date):
+    return {"event_ticker": ticker, "series_ticker": ticker.split("-")[0], "title": title, "strike_date": strike_date}
+
+
+def test_dates_pick_the_event_and_names_break_ties():
+    sunday = date(2026, 2, 15)
+    # Both February 12 events are in the window: the name decides
+    assert match_dg_event("Genesis Invitational winner", None, sunday, SCHEDULE)["event_id"] == 1
+    assert match_dg_event("Puerto Rico Open winner", None, sunday, SCHEDULE)["event_id"] == 2
+    # Nothing named and two in the window: unsure
+    assert match_dg_event("PGA Tour winner", None, sunday, SCHEDULE) is None
+    # One event in the window wins even when the title names nothing
+    assert match_dg_event("PGA Tour winner", None, date(2026, 2, 22), SCHEDULE)["event_id"] == 3
+    # A name outside the window loses to the only dated row
+    assert match_dg_event("Genesis Invitational winner", None, date(2026, 2, 26), SCHEDULE)["event_id"] == 3
+
+def test_names_alone_match_only_when_unambiguous():
+    assert match_dg_event("Cognizant winner", None, None, SCHEDULE)["event_id"] == 3
+    # The label counts as much as the title
+    assert match_dg_event("Golf winner", "Genesis", None, SCHEDULE)["event_id"] == 1
+    # Generic words never pair events, and two named rows are a tie nobody breaks
+    assert match_dg_event("Open Championship winner", None, None, SCHEDULE) is None
+    twins = SCHEDULE + [{"event_id": 4, "event_name": "Genesis Scottish Open", "start_date": "2026-07-09"}]
+    assert match_dg_event("Genesis winner", None, None, twins) is None
+    assert match_dg_event("Genesis winner", None, date(2026, 2, 15), twins)["event_id"] == 1
+
+def test_update_keeps_an_earlier_dg_match():
+    reg = EventRegistry(path=None).update([event("KXPGATOUR-GNINV26", "Genesis Invitational winner", "2026-02-15T23:00:00Z")], SCHEDULE)
+    assert reg.lookup("KXPGATOUR-GNINV26") == {"code": "GNINV26", "label": "Genesis", "start": "2026-02-12", "end": "2026-02-15",
+                                                "dg_event_id": 1, "dg_event_name": "The Genesis Invitational"}
+    # The event has left DG's schedule (or the schedule fetch had no key): the match stays, new Kalshi fields still land
+    reg.update([event("KXPGATOUR-GNINV26", "Genesis Invitational winner", "2026-02-16T23:00:00Z")], [])
+    info = reg.lookup("KXPGATOUR-GNINV26")
+    assert (info["dg_event_name"], info["dg_event_id"], info["start"], info["label"], info["end"]) == \
+           ("The Genesis Invitational", 1, "2026-02-12", "Genesis", "2026-02-16")
+    assert reg.current_code("The Genesis Invitational") == "GNINV26"
+    # A later schedule that does match replaces it
+    reg.update([event("KXPGATOUR-GNINV26", "Cognizant winner", "2026-02-22T23:00:00Z")], SCHEDULE)
+    assert reg.lookup("KXPGATOUR-GNINV26")["dg_event_id"] == 3
+    assert reg.current_code("The Genesis Invitational") is None and reg.current_code("Cognizant Classic") == "GNINV26"
+
+def test_unseen_tickers_fall_back_to_the_ticker():
+    reg = EventRegistry(path=None)
+    assert reg.lookup("KXPGATOUR-MAST26")["code"] == "MAST26" and reg.lookup("KXPGATOUR-MAST26")["label"] == "Masters"
+    assert reg.lookup("bogus") == {"code": "", "label": None, "start": None, "end": None, "dg_event_id": None, "dg_event_name": None}
+    reg.update([event("KXPGATOUR-MAST26", "Masters Tournament winner", None)], fixtures.schedule())
+    assert reg.lookup("KXPGATOUR-MAST26")["dg_event_name"] == "Masters Tournament" and "KXPGATOUR-MAST26" not in reg.parsed
+
+def test_the_cache_file_is_reloaded_within_its_ttl(tmp_path, monkeypatch):
+    path = str(tmp_path / "events.json")
+    EventRegistry(path).update(fixtures.kalshi_events(KALSHI), fixtures.schedule()).save()
+    def no_fetch(*args, **kwargs): raise AssertionError("refreshed a fresh registry")
+    monkeypatch.setattr(api, "fetch_kalshi_events", no_fetch)
+
+    reg = EventRegistry(path)
+    assert not reg.stale() and reg.refresh("key") is reg
+    assert reg.current_code("The Genesis Invitational") == "GNINV26" and reg.current_code("Masters Tournament") == "MAST26"
+    assert reg.lookup("KXPGATOUR-MAST26")["start"] == "2026-02-19"
+
+    # Past the TTL the file is still read, but the next refresh goes back to Kalshi
+    with open(path) as f: data = json.load(f)
+    data["fetched_at"] = time.time() - EVENT_REGISTRY_TTL - 1
+    with open(path, "w") as f: json.dump(data, f)
+    reg = EventRegistry(path)
+    assert reg.stale() and reg.current_code("The Genesis Invitational") == "GNINV26"
+    with pytest.raises(AssertionError, match="refreshed"): reg.refresh("key")
+
+def test_a_refresh_picks_up_file_another_process_wrote(tmp_path):
+    path = str(tmp_path / "events.json")
+    reg = EventRegistry(path)
+    assert reg.stale() and reg.events == {}
+    EventRegistry(path).update(fixtures.kalshi_events(KALSHI), fixtures.schedule()).save()
+    # refresh() re-reads the file first and finds it fresh, so nothing is fetched
+    assert reg.refresh() is reg and not reg.stale() and reg.current_code("Masters Tournament") == "MAST26"
+    # A missing or corrupt file leaves an empty registry rather than raising
+    (tmp_path / "bad.json").write_text("{")
+    assert EventRegistry(str(tmp_path / "bad.json")).events == {}
+    assert EventRegistry(str(tmp_path / "missing.json")).events == {}
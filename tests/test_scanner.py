@@ -0,0 +1,94 @@
+"""scan_events over every tour against the fixture feeds, assign_event_codes and merge_snapshots."""
+
+import pytest
+
+from benchmarks import fixtures
+from edgefinder import api, registry, scanner
+from edgefinder.client import HttpClient
+from edgefinder.events import assign_event_codes, partition_events
+from edgefinder.registry import EventRegistry
+from edgefinder.scanner import merge_snapshots, scan_events
+
+PLAYERS = fixtures.field(30)
+# Genesis, Masters and PGA Championship markets in two series
+KALSHI = fixtures.kalshi_markets(PLAYERS, events=3, series=["win", "top_10"])
+
+
+def dg(event_name, seed=0):
+    body = fixtures.pretournament(PLAYERS, event_name, seed)
+    return {"event_name": body["event_name"], "players": body["baseline_history_fit"]}
+
+@pytest.fixture(autouse=True)
+def event_registry(monkeypatch):
+    # Empty and stale, so the scan's "events" job fills it from the fixture /events and schedule
+    monkeypatch.setattr(registry, "_registry", EventRegistry(path=None))
+
+@pytest.fixture
+def feeds(monkeypatch):
+    # pga prices the Genesis, euro the PGA Championship; opp has a model but no Kalshi event; kft's feed fails
+    session = fixtures.FixtureSession(dg("The Genesis Invitational"), KALSHI,
+                                      tours={"euro": dg("PGA Championship", seed=1), "opp": dg("Puntacana Championship", seed=2), "kft": None})
+    monkeypatch.setattr(api, "_client", HttpClient(session, limits={}, retries=0))
+
+def run(**kwargs):
+    return scan_events("key", tours=("pga", "euro", "opp", "kft"), profile_dir=None, **kwargs)
+
+
+def test_assign_event_codes_pairs_tours_by_name_then_falls_back_for_the_first():
+    registry._registry.update(fixtures.kalshi_events(KALSHI), fixtures.schedule())
+    by_event = partition_events(KALSHI)
+    assert list(by_event) == ["GNINV26", "MAST26", "PGAC26"]
+    assert assign_event_codes({"pga": "The Genesis Invitational", "euro": "PGA Championship"}, by_event) == {"GNINV26": "pga", "PGAC26": "euro"}
+    # Order of the DG events does not change who claims which code
+    assert assign_event_codes({"euro": "PGA Championship", "pga": "The Genesis Invitational"}, by_event) == {"PGAC26": "euro", "GNINV26": "pga"}
+    # A first tour nobody names still gets the busiest non-major code; later tours get nothing
+    assert assign_event_codes({"pga": "Unknown Event", "opp": "Puntacana Championship"}, by_event) == {"GNINV26": "pga"}
+    assert assign_event_codes({}, by_event) == {}
+
+def test_scan_events_reports_every_event_and_tour(feeds):
+    result = run()
+    rows = {r["event_code"] or r["tour"]: r for r in result["events"]}
+    assert set(rows) == {"GNINV26", "MAST26", "PGAC26", "opp", "kft"}
+    genesis, masters, pgac = rows["GNINV26"], rows["MAST26"], rows["PGAC26"]
+    assert (genesis["status"], genesis["tour"], genesis["dg_event"], genesis["source"]) == ("ok", "pga", "The Genesis Invitational", "PRE-TOURNAMENT")
+    assert (pgac["status"], pgac["tour"], pgac["dg_event"]) == ("ok", "euro", "PGA Championship")
+    for row in (genesis, pgac):
+        assert row["markets"] == row["matched"] == 2 * len(PLAYERS) and row["unmatched"] == 0 and row["edges"] > 0
+    # Masters futures: markets but no DG model this week
+    assert (masters["status"], masters["tour"], masters["dg_event"], masters["markets"], masters["edges"]) == ("no_model", None, None, 2 * len(PLAYERS), 0)
+    assert rows["opp"] == {"event_code": None, "label": None, "tour": "opp", "dg_event": "Puntacana Championship", "source": "PRE-TOURNAMENT",
+                           "markets": 0, "matched": 0, "edges": 0, "unmatched": 0, "status": "no_markets", "error": None}
+    assert rows["kft"]["status"] == "error" and rows["kft"]["dg_event"] is None and "500" in rows["kft"]["error"]
+    assert "pretournament:kft" in result["errors"]
+    assert result["event_name"] == "The Genesis Invitational / PGA Championship"
+    assert result["skipped_other"] == masters["markets"]
+    assert result["matched"] == genesis["matched"] + pgac["matched"]
+
+def test_a_failing_event_gets_an_error_row_and_the_rest_still_scan(feeds, monkeypatch):
+    scan_event = scanner._scan_event
+    def flaky(code, *args):
+        if code == "PGAC26": raise ValueError("bad slate")
+        return scan_event(code, *args)
+    monkeypatch.setattr(scanner, "_scan_event", flaky)
+    result = run()
+    rows = {r["event_code"]: r for r in result["events"] if r["event_code"]}
+    assert (rows["PGAC26"]["status"], rows["PGAC26"]["error"], rows["PGAC26"]["edges"]) == ("error", "bad slate", 0)
+    assert rows["GNINV26"]["status"] == "ok"
+    assert {e["event"] for e in result["edges"]} == {"Genesis"}
+
+def test_merged_edges_rank_across_events(feeds):
+    result = run()
+    edges = result["edges"]
+    assert len(edges) == sum(r["edges"] for r in result["events"])
+    assert [e["edge"] for e in edges] == sorted((e["edge"] for e in edges), reverse=True)
+    assert {e["event"] for e in edges} == {"Genesis", "PGA Championship"}
+    assert result["snapshot"]["edges"] == edges and len(result["snapshot"]["matched"]) == result["matched"]
+
+def test_merge_snapshots_keeps_scan_order_on_ties():
+    def snap(name, *edges):
+        return {"event_name": name, "markets": {}, "players": {}, "market_player": {}, "rows": {}, "matched": {name}, "skipped": set(),
+                "field_size": 10, "edges": [{"id": f"{name}{i}", "edge": e} for i, e in enumerate(edges)]}
+    merged = merge_snapshots([snap("A", 5.0, 2.0), snap("B", 5.0, 7.0, 2.0)])
+    assert [e["id"] for e in merged["edges"]] == ["B1", "A0", "B0", "A1", "B2"]
+    assert (merged["event_name"], merged["field_size"], merged["matched"], merged["event_code"]) == ("A / B", 20, {"A", "B"}, None)
+    assert merge_snapshots([])["edges"] == []
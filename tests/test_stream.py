@@ -0,0 +1,159 @@
+"""KalshiPriceStream against a local WebSocket server standing in for Kalshi's ticker channel."""
+
+import json
+import time
+import asyncio
+import threading
+
+import pytest
+
+websockets = pytest.importorskip("websockets")
+pytest.importorskip("websocket")
+
+from edgefinder.stream import KalshiPriceStream
+
+
+def wait_for(cond, timeout=5):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if cond(): return True
+        time.sleep(0.01)
+    return False
+
+class FakeKalshi:
+    """Records every client message per connection and acks each subscribe with a new sid, as Kalshi does.
+
+    send() and drop() act on the newest connection; ack=False leaves subscribes unanswered.
+    """
+
+    def __init__(self):
+        self.received, self.conns, self.ack, self.sid = [], [], True, 0
+        self.loop, ready = asyncio.new_event_loop(), threading.Event()
+
+        async def handler(ws):
+            self.conns.append(ws); self.received.append([])
+            async for raw in ws:
+                msg = json.loads(raw)
+                self.received[-1].append(msg)
+                if msg["cmd"] == "subscribe" and self.ack:
+                    self.sid += 1
+                    await ws.send(json.dumps({"id": msg["id"], "type": "subscribed", "msg": {"channel": "ticker", "sid": self.sid}}))
+
+        async def main():
+            async with websockets.serve(handler, "127.0.0.1", 0) as server:
+                self.url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+                self.closed = self.loop.create_future()
+                ready.set()
+                await self.closed
+
+        threading.Thread(target=self.loop.run_until_complete, args=(main(),), daemon=True).start()
+        assert ready.wait(5)
+
+    def call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(5)
+
+    def send(self, **body):
+        self.call(self.conns[-1].send(json.dumps({"type": "ticker", "sid": 1, "msg": body})))
+
+    def drop(self):
+        self.call(self.conns[-1].close())
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.closed.set_result, None)
+
+    def subscribed(self, conn=-1):
+        return [m["params"]["market_tickers"] for m in self.received[conn] if m["cmd"] == "subscribe"]
+
+    def deleted(self, conn=-1):
+        return [(m["params"]["sids"], m["params"]["market_tickers"]) for m in self.received[conn]
+                if m["cmd"] == "update_subscription" and m["params"]["action"] == "delete_markets"]
+
+
+@pytest.fixture
+def server():
+    fake = FakeKalshi()
+    yield fake
+    fake.close()
+
+@pytest.fixture
+def stream(server):
+    s = KalshiPriceStream(url=server.url)
+    yield s
+    s.stop()
+
+def connected(server, stream, n=1):
+    assert wait_for(lambda: len(server.conns) >= n and stream.status == "live" and server.received[n - 1]), stream.status
+
+
+def test_watch_subscribes_new_tickers_and_drops_the_rest(server, stream):
+    stream.watch(["KXB-2", "KXA-1", "KXD-4"])
+    connected(server, stream)
+    assert wait_for(lambda: len(stream.sids) == 3)
+    server.send(market_ticker="KXB-2", yes_ask=10, yes_bid=8)
+    assert wait_for(lambda: "KXB-2" in stream.book)
+    stream.watch(["KXA-1", "KXC-3"])
+    assert wait_for(lambda: len(server.subscribed()) == 2 and server.deleted())
+    first, removed, added = server.received[0]
+    assert first["cmd"] == "subscribe" and first["params"]["channels"] == ["ticker"]
+    assert server.subscribed() == [["KXA-1", "KXB-2", "KXD-4"], ["KXC-3"]]
+    assert server.deleted() == [([1], ["KXB-2", "KXD-4"])]
+    assert first["id"] < removed["id"] < added["id"]
+    # A dropped ticker leaves the book and its late quotes are ignored
+    assert "KXB-2" not in stream.book
+    server.send(market_ticker="KXB-2", yes_ask=11, yes_bid=9)
+    server.send(market_ticker="KXC-3", yes_ask=50, yes_bid=48)
+    assert wait_for(lambda: "KXC-3" in stream.book) and "KXB-2" not in stream.book
+
+def test_tickers_dropped_before_their_ack_are_deleted_on_it(server, stream):
+    server.ack = False
+    stream.watch(["KXA-1", "KXB-2"])
+    connected(server, stream)
+    stream.watch(["KXA-1"])
+    assert server.deleted() == [] and stream.tickers == {"KXA-1"}
+    server.call(server.conns[-1].send(json.dumps({"id": server.received[0][0]["id"], "type": "subscribed", "msg": {"channel": "ticker", "sid": 7}})))
+    assert wait_for(lambda: server.deleted() == [([7], ["KXB-2"])])
+    assert stream.sids == {"KXA-1": 7}
+
+def test_book_updates_and_version(server, stream):
+    stream.watch(["KXA-1"])
+    connected(server, stream)
+    server.send(market_ticker="KXA-1", yes_ask=42, yes_bid=40)
+    assert wait_for(lambda: stream.version == 1)
+    assert {k: v for k, v in stream.book["KXA-1"].items() if k != "at"} == {"yes_ask": 42, "no_ask": 60}
+    # A partial update keeps the side it doesn't mention
+    server.send(market_ticker="KXA-1", yes_bid=45)
+    assert wait_for(lambda: stream.version == 2)
+    assert (stream.book["KXA-1"]["yes_ask"], stream.book["KXA-1"]["no_ask"]) == (42, 55)
+    # Unwatched tickers and other channels don't touch the book
+    server.send(market_ticker="KXZ-9", yes_ask=10, yes_bid=5)
+    server.call(server.conns[-1].send(json.dumps({"type": "subscribed", "msg": {"channel": "ticker"}})))
+    server.send(market_ticker="KXA-1", yes_ask=43)
+    assert wait_for(lambda: stream.version == 3)
+    assert set(stream.book) == {"KXA-1"} and stream.book["KXA-1"]["yes_ask"] == 43
+
+def test_apply_overlays_quotes_newer_than_since(server, stream):
+    listing = {"top_10": [{"ticker": "KXA-1", "yes_ask": 30, "no_ask": 75, "yes_sub_title": "A"}, {"ticker": "KXB-2", "yes_ask": 5, "no_ask": 96}]}
+    stream.watch(["KXA-1", "KXB-2"])
+    connected(server, stream)
+    assert stream.apply(listing) is listing
+    before = time.monotonic()
+    server.send(market_ticker="KXA-1", yes_ask=33, yes_bid=31)
+    assert wait_for(lambda: stream.version == 1)
+    after = time.monotonic()
+    merged = stream.apply(listing, since=before)
+    assert merged["top_10"][0] == {"ticker": "KXA-1", "yes_ask": 33, "no_ask": 69, "yes_sub_title": "A"}
+    assert merged["top_10"][1] is listing["top_10"][1]
+    assert listing["top_10"][0]["yes_ask"] == 30
+    assert stream.apply(listing, since=after) is listing
+
+def test_reconnects_and_resubscribes_after_drop(server, stream):
+    stream.watch(["KXA-1", "KXB-2"])
+    connected(server, stream)
+    server.drop()
+    assert wait_for(lambda: stream.status.startswith("reconnecting"), 2), stream.status
+    connected(server, stream, n=2)
+    assert server.subscribed(1) == [["KXA-1", "KXB-2"]]
+    assert wait_for(lambda: set(stream.sids.values()) == {2})
+    server.send(market_ticker="KXB-2", yes_ask=7, yes_bid=6)
+    assert wait_for(lambda: stream.version == 1)
+    assert stream.book["KXB-2"]["no_ask"] == 94